@@ -0,0 +1,30 @@
+"""
+csv_tools - Faster building blocks behind the python_csv.py examples
+
+***This is a local package (see modules_importing/) - python_csv.py imports it***
+
+python_csv.py teaches the csv module row by row. The modules in this package
+keep the same results but are built for very large files:
+
+- columnar : chunked NumPy column arrays + vectorized group-by sums
+- parallel : record-aligned byte ranges aggregated in a process pool
+- stats    : mergeable one-pass accumulators (Welford variance, t-digest)
+- mapped   : memory-mapped reader with lazy, zero-copy row views
+- dialect  : multi-region delimiter detection cached per (path, size, mtime)
+- validation : declarative column rules checked chunk by chunk
+- writer   : block-at-a-time CSV writer with vectorized column serializers
+- cache    : parsed columns saved as .npy files next to the CSV, memory-mapped on reuse
+- incremental : checkpointed totals for append-only files (reads only new bytes)
+- benchmark : seeded synthetic CSVs + timed reader/writer scenarios (python -m csv_tools)
+"""
+
+from .columnar import grouped_sum, iter_column_chunks, sales_totals
+from .parallel import category_stats, split_ranges
+from .stats import GroupedStats, RunningStats, TDigest
+from .mapped import MappedCSV, RowView
+from .dialect import DetectedDialect, detect_dialect, detect_directory
+from .validation import ColumnRule, ValidationReport, validate_csv
+from .writer import BulkCSVWriter, fixed, integer
+from .cache import load_columns
+from .incremental import incremental_grouped_sum, incremental_sales_totals
+from .benchmark import compare, generate_csv, run_benchmarks
@@ -0,0 +1,19 @@
+"""python -m csv_tools : run_benchmarks() from the command line (see benchmark.py)"""
+
+import argparse
+
+from .benchmark import compare, run_benchmarks
+
+parser = argparse.ArgumentParser(description="Benchmark the python_csv.py reader/writer patterns")
+parser.add_argument('--rows', type=int, default=200_000)
+parser.add_argument('--repeat', type=int, default=3)
+parser.add_argument('--seed', type=int, default=0)
+parser.add_argument('--scenario', action='append', help="run only this scenario (repeatable)")
+parser.add_argument('--output', help="save results as JSON")
+parser.add_argument('--compare', help="earlier JSON results to compare against")
+args = parser.parse_args()
+
+report = run_benchmarks(args.rows, args.scenario, args.repeat, args.seed, output=args.output)
+if args.compare:
+    print()
+    compare(args.compare, report)
@@ -0,0 +1,369 @@
+"""
+CSV Benchmark Suite
+===================
+
+Measures the reader/writer patterns from python_csv.py on synthetic data
+that is big enough to show real differences, and saves the numbers as JSON
+so two runs (before/after a change) can be compared.
+
+Synthetic data
+==============
+generate_csv() writes a deterministic file from a seed - the same seed,
+rows and shape always give byte-identical output:
+- tall : many rows, the 10 base columns (ID, Name, Score, Category, ...)
+- wide : the base columns plus `extra_columns` numeric metric columns
+- Notes contain commas, "quotes", embedded newlines and non-ASCII text at
+  configurable rates, so the slow (quoted) parser paths get exercised
+- delimiter=';' or '\\t' produces the same data in other dialects
+
+Scenarios
+=========
+Each scenario is named after the python_csv.py function whose approach it
+times (the functions themselves print and use fixed file names, so the
+scenarios repeat their core loop on the generated file):
+
+read_basic_csv           csv.reader loop
+read_dict_csv            csv.DictReader loop
+read_semicolon_csv       csv.reader with delimiter=';'
+analyze_sales            csv_tools.sales_totals (columnar)
+read_csv_with_validation csv_tools.validate_csv
+process_large_csv        DictReader + GroupedStats loop
+process_large_csv[parallel] csv_tools.category_stats (process pool)
+demonstrate_csv_sniffer  csv_tools.detect_dialect (uncached)
+read_mapped_csv          csv_tools.MappedCSV.column
+write_basic_csv          csv.writer.writerows
+write_dict_csv           csv.DictWriter.writerows
+write_bulk_csv           csv_tools.BulkCSVWriter (process_large_csv's generator)
+
+Every scenario runs in a fresh process, so "peak RSS" (largest resident
+memory, from resource.getrusage) belongs to that scenario alone. It
+includes the input a writer scenario holds in memory before timing starts.
+
+Usage
+=====
+    python -m csv_tools --rows 500000 --output after.json --compare before.json
+
+Memory Trick
+============
+generate = same seed, same file
+run      = one fresh process per scenario
+compare  = time now vs time before, per scenario
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from .columnar import sales_totals
+from .dialect import clear_cache, detect_dialect
+from .mapped import MappedCSV
+from .parallel import category_stats
+from .stats import GroupedStats
+from .validation import ColumnRule, validate_csv
+from .writer import BulkCSVWriter, fixed
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASE_COLUMNS = ['ID', 'Name', 'Score', 'Category', 'Date', 'Product', 'Quantity',
+                'Unit_Price', 'Total_Sales', 'Note']
+FIRST_NAMES = ['John', 'Jane', 'Bob', 'Alice', 'José', 'Zoë', 'Søren', 'Mia', '李', 'Ана']
+LAST_NAMES = ['Doe', 'Smith', 'Johnson', 'Brown', "O'Neil", 'Müller', 'García', 'Kowalski']
+PRODUCTS = np.array(['Laptop', 'Phone', 'Tablet', 'Monitor', 'Keyboard'])
+PRICES = np.array([1200, 800, 500, 300, 50])
+CHUNK_ROWS = 100_000
+
+
+def generate_csv(filename, rows, shape='tall', extra_columns=40, seed=0, delimiter=',',
+                 quote_rate=0.05, newline_rate=0.01, unicode_rate=0.05):
+    """
+    Write a deterministic synthetic CSV; returns the file size in bytes
+
+    shape='wide' adds `extra_columns` Metric_n columns after the base ones.
+    The rates are the fraction of Note fields with a quoted delimiter/quote,
+    an embedded newline, and non-ASCII text.
+    """
+    if shape not in ('tall', 'wide'):
+        raise ValueError("shape must be 'tall' or 'wide'")
+    rng = np.random.default_rng(seed)
+    metrics = [f"Metric_{n}" for n in range(1, extra_columns + 1)] if shape == 'wide' else []
+    notes = np.array(['ok', f'late{delimiter} call back', 'said "call me"', 'line one\nline two',
+                      'café ☕ naïve', ''])
+    special = quote_rate / 2
+    weights = np.array([1 - quote_rate - newline_rate - unicode_rate - 0.1, special, special,
+                        newline_rate, unicode_rate, 0.1])
+    if weights[0] < 0:
+        raise ValueError("quote_rate + newline_rate + unicode_rate must be at most 0.9")
+    serializers = {name: fixed(3) for name in metrics}
+
+    with BulkCSVWriter(filename, BASE_COLUMNS + metrics, delimiter=delimiter,
+                       serializers=serializers) as writer:
+        for start in range(0, rows, CHUNK_ROWS):
+            count = min(CHUNK_ROWS, rows - start)
+            ids = np.arange(start + 1, start + count + 1)
+            names = np.strings.add(np.strings.add(np.array(FIRST_NAMES)[rng.integers(0, 10, count)], ' '),
+                                   np.array(LAST_NAMES)[rng.integers(0, 8, count)])
+            product = rng.integers(0, len(PRODUCTS), count)
+            quantity = rng.integers(1, 21, count)
+            dates = (np.datetime64('2025-01-01') + rng.integers(0, 365, count)).astype(str)
+            columns = [ids, names, rng.integers(0, 101, count),
+                       np.array(['A', 'B', 'C'])[rng.integers(0, 3, count)], dates,
+                       PRODUCTS[product], quantity, PRICES[product], quantity * PRICES[product],
+                       notes[rng.choice(len(notes), count, p=weights / weights.sum())]]
+            columns += [rng.normal(100, 25, count) for _ in metrics]
+            writer.write_columns(columns)
+    return os.path.getsize(filename)
+
+
+# Scenarios: setup(path) runs untimed and returns the argument for run(),
+# run() returns the number of rows it processed (None: all rows of the dataset).
+
+def _read_basic_csv(path):
+    rows = 0
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        for _ in csv.reader(file):
+            rows += 1
+    return rows - 1
+
+
+def _read_dict_csv(path):
+    rows = 0
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            row['Name']
+            rows += 1
+    return rows
+
+
+def _read_semicolon_csv(path):
+    rows = 0
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        for _ in csv.reader(file, delimiter=';'):
+            rows += 1
+    return rows - 1
+
+
+def _analyze_sales(path):
+    sales_totals(path, cache=False)  # Times the parser, not the .npy cache
+    return None  # Row count not known to the columnar engine; use the dataset's
+
+
+def _read_csv_with_validation(path):
+    schema = {
+        'ID': ColumnRule(required=True, type=int, min=1),
+        'Name': ColumnRule(required=True),
+        'Score': ColumnRule(type=int, min=0, max=100),
+        'Date': ColumnRule(pattern=r'\d{4}-\d{2}-\d{2}'),
+    }
+    return validate_csv(path, schema).rows_checked
+
+
+def _process_large_csv(path):
+    stats = GroupedStats()
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            stats.update(row['Category'], int(row['Score']))
+    return sum(group.count for _, group in stats.items())
+
+
+def _process_large_csv_parallel(path):
+    stats = category_stats(path, 'Category', 'Score', workers=None)
+    return sum(group['count'] for group in stats.values())
+
+
+def _demonstrate_csv_sniffer(path):
+    clear_cache()
+    detect_dialect(path)
+    return 0
+
+
+def _read_mapped_csv(path):
+    with MappedCSV(path) as table:
+        return sum(1 for _ in table.column('Score'))
+
+
+def _load_rows(path):
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        return header, [[int(row[0]), row[1], int(row[2])] + row[3:] for row in reader]
+
+
+def _write_basic_csv(data):
+    header, rows, output = data
+    with open(output, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return len(rows)
+
+
+def _load_dicts(path):
+    header, rows = _load_rows(path)
+    return header, [dict(zip(header, row)) for row in rows]
+
+
+def _write_dict_csv(data):
+    header, rows, output = data
+    with open(output, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=header)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def _load_columns(path):
+    header, rows = _load_rows(path)
+    columns = [np.array(values) for values in zip(*rows)]
+    return header, columns
+
+
+def _write_bulk_csv(data):
+    header, columns, output = data
+    with BulkCSVWriter(output, header) as writer:
+        writer.write_columns(columns)
+    return len(columns[0])
+
+
+# name: (input dataset, setup, run, writes output)
+SCENARIOS = {
+    'read_basic_csv': ('tall', None, _read_basic_csv, False),
+    'read_dict_csv': ('tall', None, _read_dict_csv, False),
+    'read_semicolon_csv': ('semicolon', None, _read_semicolon_csv, False),
+    'analyze_sales': ('tall', None, _analyze_sales, False),
+    'read_csv_with_validation': ('tall', None, _read_csv_with_validation, False),
+    'process_large_csv': ('tall', None, _process_large_csv, False),
+    'process_large_csv[parallel]': ('tall', None, _process_large_csv_parallel, False),
+    'demonstrate_csv_sniffer': ('wide', None, _demonstrate_csv_sniffer, False),
+    'read_mapped_csv': ('tall', None, _read_mapped_csv, False),
+    'write_basic_csv': ('tall', _load_rows, _write_basic_csv, True),
+    'write_dict_csv': ('tall', _load_dicts, _write_dict_csv, True),
+    'write_bulk_csv': ('tall', _load_columns, _write_bulk_csv, True),
+}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_scenario(name, path, dataset_rows, output, repeat):
+    """Child process body: time one scenario, return its measurements"""
+    _, setup, run, writes = SCENARIOS[name]
+    argument = path
+    if setup is not None:
+        argument = (*setup(path), output)
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = run(argument)
+        rows = dataset_rows if rows is None else rows
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    size = os.path.getsize(output if writes else path)
+    return {
+        'seconds': best,
+        'rows': rows,
+        'rows_per_sec': rows / best if rows and best else None,
+        'mb_per_sec': size / (1024 * 1024) / best if best else None,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def run_benchmarks(rows=200_000, scenarios=None, repeat=3, seed=0, workdir=None, output=None):
+    """
+    Generate the datasets, run the scenarios and optionally save JSON results
+
+    Returns {'meta': {...}, 'results': {scenario: measurements}}.
+    """
+    scenarios = list(scenarios or SCENARIOS)
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise KeyError(f"Unknown scenarios: {unknown}")
+
+    with tempfile.TemporaryDirectory(dir=workdir) as directory:
+        # dataset: (rows, generate_csv keyword arguments)
+        datasets = {
+            'tall': (rows, {'shape': 'tall'}),
+            'wide': (max(rows // 20, 1), {'shape': 'wide'}),
+            'semicolon': (rows, {'shape': 'tall', 'delimiter': ';'}),
+        }
+        paths = {}
+        for dataset in sorted({SCENARIOS[name][0] for name in scenarios}):
+            paths[dataset] = os.path.join(directory, f"{dataset}.csv")
+            dataset_rows, options = datasets[dataset]
+            generate_csv(paths[dataset], dataset_rows, seed=seed, **options)
+
+        results = {}
+        # spawn: every scenario starts from a clean interpreter (fair peak RSS)
+        context = multiprocessing.get_context('spawn')
+        for name in scenarios:
+            dataset = SCENARIOS[name][0]
+            with context.Pool(1) as pool:
+                results[name] = pool.apply(_run_scenario, (name, paths[dataset], datasets[dataset][0],
+                                                           os.path.join(directory, 'output.csv'),
+                                                           repeat))
+            _print_result(name, results[name])
+
+    report = {
+        'meta': {
+            'rows': rows, 'seed': seed, 'repeat': repeat,
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=4)
+    return report
+
+
+def _print_result(name, result):
+    rows_per_sec = f"{result['rows_per_sec']:>12,.0f}" if result['rows_per_sec'] else f"{'-':>12}"
+    rss = f"{result['peak_rss_mb']:8.1f}" if result['peak_rss_mb'] is not None else f"{'-':>8}"
+    print(f"{name:<30} {result['seconds']:8.3f}s {rows_per_sec} rows/s "
+          f"{result['mb_per_sec']:8.1f} MB/s {rss} MB peak")
+
+
+def compare(before, after, threshold=0.10):
+    """
+    Compare two saved result files (paths or loaded dicts)
+
+    Returns {scenario: relative change in throughput} and prints regressions
+    larger than threshold (0.10 = 10% slower).
+    """
+    if isinstance(before, str):
+        with open(before, encoding='utf-8') as file:
+            before = json.load(file)
+    if isinstance(after, str):
+        with open(after, encoding='utf-8') as file:
+            after = json.load(file)
+
+    changes = {}
+    for name, new in after['results'].items():
+        old = before['results'].get(name)
+        if old is None:
+            continue
+        # Seconds rather than rows/s: the sniffer scenario processes 0 rows
+        change = old['seconds'] / new['seconds'] - 1
+        changes[name] = change
+        marker = '  REGRESSION' if change < -threshold else ''
+        print(f"{name:<30} {change:+8.1%}{marker}")
+    return changes
+
@@ -0,0 +1,336 @@
+"""
+Binary Columnar Cache Next to CSV Files
+=======================================
+
+Parsing CSV text is the expensive part of every analysis: find the
+delimiters, cut out the fields, convert "6000" to 6000 - for every row, on
+every run. When the same export is analysed again and again, that work is
+repeated although the file has not changed.
+
+load_columns() parses each requested column ONCE and stores it as a NumPy
+.npy file in a sidecar directory, appending block by block as the text is
+parsed (a column is never held in memory whole):
+
+    sales_data.csv
+    sales_data.csv.colcache/
+        manifest.json                 <- source size, mtime and hash + column list
+        Product.5f0c1a2e.bytes.npy    <- one binary file per (column, dtype)
+        Total_Sales.9b3e77d1.i8.npy
+
+Later calls check the manifest against the CSV and, if it still matches,
+memory-map the .npy files (np.load(mmap_mode='r')) - no parsing at all, and
+pages are only read from disk when the values are touched.
+
+When is the cache stale?
+========================
+The source's size and mtime are compared first, then a BLAKE2 hash of its
+first and last 64 KB. Any difference rebuilds the whole cache. The hash
+catches files that were rewritten with the same size in the same second;
+it does not read the entire file, so a change that only touches the middle
+of a large file without changing size or mtime is not detected.
+
+Memory Trick
+============
+First read  = parse text, save binary columns
+Next reads  = map binary columns, skip parsing
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from .columnar import DEFAULT_BLOCK_BYTES, iter_column_chunks
+
+MANIFEST = 'manifest.json'
+HASH_BYTES = 64 * 1024
+VERSION = 2  # 2: decode=False text columns are always stored as UTF-8 bytes
+
+
+def cache_dir(filename):
+    """Sidecar directory used for filename"""
+    return filename + '.colcache'
+
+
+def source_identity(filename):
+    """(size, mtime_ns, hash of head and tail) describing the current file contents"""
+    stat = os.stat(filename)
+    digest = hashlib.blake2b(str(stat.st_size).encode(), digest_size=16)
+    with open(filename, 'rb') as file:
+        digest.update(file.read(HASH_BYTES))
+        if stat.st_size > HASH_BYTES:
+            file.seek(max(HASH_BYTES, stat.st_size - HASH_BYTES))
+            digest.update(file.read(HASH_BYTES))
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest.hexdigest()}
+
+
+def _dtype_tag(dtype, decode):
+    """Cache key part for how a column was parsed"""
+    if dtype is not None:
+        return np.dtype(dtype).str.lstrip('<>|=')
+    return 'str' if decode else 'bytes'
+
+
+def _column_file(name, tag):
+    # Column names can contain anything; keep file names portable
+    safe = ''.join(char if char.isalnum() or char in '-_' else '_' for char in name)
+    suffix = hashlib.blake2b(name.encode(), digest_size=4).hexdigest()
+    return f"{safe}.{suffix}.{tag}.npy"
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _file_mode():
+    """Mode open() gives a new file (0o666 minus the umask); mkstemp() files start at 0o600"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _atomic_write(directory, name, write):
+    """Write a file via a temp file + os.replace so readers never see half a file"""
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            write(file)
+        os.chmod(temp_path, _file_mode())
+        os.replace(temp_path, os.path.join(directory, name))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _header(dtype, length):
+    """.npy (version 1.0) header for a 1-D array, padded to the same size for every length"""
+    def text(count):
+        return repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                     'shape': (count,)})
+    # Sized for the longest possible shape, so the final header fits in the space reserved up front
+    size = -(-(len(text(2 ** 63 - 1)) + 11) // 64) * 64
+    return np.lib.format.magic(1, 0) + struct.pack('<H', size - 10) + \
+        (text(length).ljust(size - 11) + '\n').encode('latin1')
+
+
+class _ColumnFile:
+    """
+    One column's .npy file, written chunk by chunk as the CSV is parsed
+
+    Chunks are appended behind a reserved header. Text chunks can come in
+    different widths ('S12', then 'S15'); then the file is only a spill file,
+    and finish() copies it into an open_memmap of the widest dtype one chunk
+    at a time. Memory never holds more than one chunk either way.
+    """
+
+    def __init__(self, directory, dtype):
+        descriptor, self.path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        self.file = os.fdopen(descriptor, 'w+b')
+        self.dtype = np.dtype(dtype)  # Used when no chunk arrives
+        self.chunks = []  # (dtype, length) in file order
+        self.offset = None
+
+    def append(self, values):
+        if self.offset is None:
+            self.file.write(_header(values.dtype, 0))
+            self.offset = self.file.tell()
+        self.chunks.append((values.dtype, len(values)))
+        self.file.write(np.ascontiguousarray(values).data)
+
+    def finish(self):
+        """Close the file and return its path, a complete .npy file"""
+        dtypes = {dtype for dtype, _ in self.chunks}
+        length = sum(count for _, count in self.chunks)
+        if len(dtypes) <= 1:
+            dtype = dtypes.pop() if dtypes else self.dtype
+            self.file.seek(0)
+            self.file.write(_header(dtype, length))
+            self.file.close()
+            os.chmod(self.path, _file_mode())
+            return self.path
+
+        self.file.close()
+        descriptor, path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        os.close(descriptor)
+        try:
+            output = np.lib.format.open_memmap(path, mode='w+', dtype=np.result_type(*dtypes),
+                                               shape=(length,))
+            position = 0
+            offset = self.offset
+            for dtype, count in self.chunks:
+                if count:
+                    output[position:position + count] = np.memmap(self.path, dtype=dtype, mode='r',
+                                                                  offset=offset, shape=(count,))
+                position += count
+                offset += count * dtype.itemsize
+            output.flush()
+            del output
+        except BaseException:
+            os.unlink(path)
+            raise
+        os.unlink(self.path)
+        self.path = path
+        os.chmod(path, _file_mode())
+        return path
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _chunks(filename, columns, dtypes, decode, block_bytes, fmtparams):
+    """
+    iter_column_chunks() with one kind of array per text column
+
+    With decode=False, blocks that needed csv.reader come back as str ('U')
+    between the raw bytes ('S') of the others; those are encoded to UTF-8
+    too, so all chunks of a column can be stored as one 'S' array.
+    """
+    for chunk in iter_column_chunks(filename, columns, dtypes, block_bytes, decode=decode,
+                                    **fmtparams):
+        if not decode:
+            for name in columns:
+                if chunk[name].dtype.kind == 'U' and dtypes.get(name) is None:
+                    chunk[name] = np.strings.encode(chunk[name], 'utf-8')
+        yield chunk
+
+
+def _parse_to_files(filename, columns, dtypes, decode, block_bytes, fmtparams, directory):
+    """Parse columns from the CSV text straight into .npy temp files in directory; {column: path}"""
+    files = {name: _ColumnFile(directory, dtypes.get(name) or (str if decode else bytes))
+             for name in columns}
+    try:
+        for chunk in _chunks(filename, columns, dtypes, decode, block_bytes, fmtparams):
+            for name in columns:
+                files[name].append(chunk[name])
+        return {name: column.finish() for name, column in files.items()}
+    except BaseException:
+        for column in files.values():
+            column.discard()
+        raise
+
+
+def _parse(filename, columns, dtypes, decode, block_bytes, fmtparams):
+    """Parse columns from the CSV text into whole arrays (when the cache cannot be written)"""
+    parts = {name: [] for name in columns}
+    for chunk in _chunks(filename, columns, dtypes, decode, block_bytes, fmtparams):
+        for name in columns:
+            parts[name].append(chunk[name])
+
+    arrays = {}
+    for name in columns:
+        if parts[name]:
+            arrays[name] = np.concatenate(parts[name])
+        else:
+            dtype = dtypes.get(name) or (str if decode else bytes)
+            arrays[name] = np.empty(0, dtype=dtype)
+    return arrays
+
+
+def load_columns(filename, columns, dtypes=None, decode=True, block_bytes=DEFAULT_BLOCK_BYTES,
+                 **fmtparams):
+    """
+    Return {column: ndarray} for the whole file, served from the sidecar cache when fresh
+
+    Arguments match iter_column_chunks(); with decode=False text columns
+    are always 'S' (UTF-8). Cached arrays are read-only memory maps. If the
+    sidecar directory cannot be written (read-only location), the parsed
+    arrays are returned without caching.
+    """
+    dtypes = dtypes or {}
+    directory = cache_dir(filename)
+    identity = source_identity(filename)
+    settings = {'delimiter': fmtparams.get('delimiter', ','),
+                'quotechar': fmtparams.get('quotechar', '"')}
+
+    manifest = _read_manifest(directory)
+    if (manifest is None or manifest.get('version') != VERSION
+            or manifest.get('source') != identity or manifest.get('settings') != settings):
+        # Missing or stale: start over so old column files cannot be mixed in
+        shutil.rmtree(directory, ignore_errors=True)
+        manifest = {'version': VERSION, 'source': identity, 'settings': settings, 'columns': {}}
+
+    result = {}
+    missing = []
+    for name in columns:
+        key = f"{name}:{_dtype_tag(dtypes.get(name), decode)}"
+        entry = manifest['columns'].get(key)
+        if entry is not None:
+            try:
+                result[name] = np.load(os.path.join(directory, entry), mmap_mode='r',
+                                       allow_pickle=False)
+                continue
+            except (OSError, ValueError):
+                pass  # Damaged file: parse the column again
+        missing.append(name)
+
+    if not missing:
+        return result
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Chunks go to disk as they are parsed, so a column never has to fit in memory twice
+        written = _parse_to_files(filename, missing, dtypes, decode, block_bytes, fmtparams,
+                                  directory)
+    except OSError:
+        # Cache is an optimisation only: read-only location, parse into memory
+        result.update(_parse(filename, missing, dtypes, decode, block_bytes, fmtparams))
+        return {name: result[name] for name in columns}
+
+    try:
+        for name, path in written.items():
+            tag = _dtype_tag(dtypes.get(name), decode)
+            entry = _column_file(name, tag)
+            os.replace(path, os.path.join(directory, entry))
+            manifest['columns'][f"{name}:{tag}"] = entry
+            result[name] = np.load(os.path.join(directory, entry), mmap_mode='r',
+                                   allow_pickle=False)
+        # The manifest goes last: it only ever lists column files that exist
+        _atomic_write(directory, MANIFEST,
+                      lambda file: file.write(json.dumps(manifest, indent=2).encode('utf-8')))
+    finally:
+        for path in written.values():
+            if os.path.exists(path):  # Not moved into place because of an error
+                os.unlink(path)
+    return {name: result[name] for name in columns}
+
+
+def _read_rows(values, start, count):
+    """values[start:start + count], read from the .npy file of a memory map instead of mapping it"""
+    if not isinstance(values, np.memmap) or values.filename is None:
+        return values[start:start + count]
+    with open(values.filename, 'rb') as file:
+        return np.fromfile(file, dtype=values.dtype, count=count,
+                           offset=values.offset + start * values.dtype.itemsize)
+
+
+def iter_cached_chunks(filename, columns, dtypes=None, decode=True,
+                       block_bytes=DEFAULT_BLOCK_BYTES, **fmtparams):
+    """
+    Yield {column: ndarray} blocks of about block_bytes, like iter_column_chunks(), from the cache
+
+    The blocks are read from the column files one after the other rather
+    than sliced out of the memory maps, whose pages would stay resident:
+    memory stays bounded by block_bytes however long the columns are.
+    """
+    arrays = load_columns(filename, columns, dtypes, decode, block_bytes, **fmtparams)
+    length = len(arrays[columns[0]]) if columns else 0
+    row_bytes = sum(values.dtype.itemsize for values in arrays.values())
+    step = max(1, block_bytes // max(1, row_bytes))
+    for start in range(0, length, step):
+        count = min(step, length - start)
+        yield {name: _read_rows(values, start, count) for name, values in arrays.items()}
+
+
+def clear_cache(filename):
+    """Delete the sidecar cache of filename"""
+    shutil.rmtree(cache_dir(filename), ignore_errors=True)
@@ -0,0 +1,178 @@
+"""
+Multi-Process Parallel CSV Scanner
+==================================
+
+process_large_csv() reads one row at a time on one CPU core. On multi-GB
+files the work can be split up instead:
+
+1. Cut the file body into N byte ranges of roughly equal size
+2. Move every cut forward to the next newline that is OUTSIDE quotes, so a
+   quoted field with an embedded newline is never split in half
+3. Let a process pool aggregate each range independently (GroupedStats
+   partial results from stats.py)
+4. Merge the partial results per category
+
+Finding the quote-safe cut points
+=================================
+A newline is a record boundary only when an even number of quote characters
+appears before it (a doubled "" inside a quoted field adds two, so the
+parity stays right). The pool first counts quotes in each raw range, the
+prefix sums of those counts give the parity at every raw cut, and a short
+forward scan from each cut finds the real boundary. Like the csv module's
+default dialect, this assumes quote characters only appear in quoted fields.
+
+Important (Windows/macOS)
+=========================
+Process pools start fresh interpreters that re-import the calling script.
+Call category_stats(..., workers > 1) from inside an
+    if __name__ == "__main__":
+block, exactly as python_zipfile.py does for its demo code.
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .columnar import (DEFAULT_BLOCK_BYTES, RangeReader, convert_column, iter_record_blocks,
+                       open_binary, split_block)
+from .stats import GroupedStats
+
+
+def _count_quotes(filename, start, end, quotechar):
+    """Number of quote bytes in [start, end) - phase 1 of range splitting"""
+    count = 0
+    with open(filename, 'rb') as file:
+        reader = RangeReader(file, start, end)
+        while True:
+            data = reader.read(DEFAULT_BLOCK_BYTES)
+            if not data:
+                return count
+            count += data.count(quotechar)
+
+
+def _next_boundary(file, offset, parity, quotechar, end):
+    """First record boundary at or after offset given the quote parity before it"""
+    file.seek(offset)
+    position = offset
+    while position < end:
+        data = file.read(64 * 1024)
+        if not data:
+            break
+        start = 0
+        while True:
+            newline = data.find(b'\n', start)
+            if newline == -1:
+                parity += data.count(quotechar, start)
+                break
+            parity += data.count(quotechar, start, newline)
+            if parity % 2 == 0:
+                return position + newline + 1
+            start = newline + 1
+        position += len(data)
+    return end
+
+
+def read_header(filename, delimiter=',', quotechar='"'):
+    """Return (header_fields, body_offset) for filename (a path or an open binary file)"""
+    with open_binary(filename) as file:
+        header_line = file.readline()
+        header = next(csv.reader([header_line.decode('utf-8-sig')],
+                                 delimiter=delimiter, quotechar=quotechar), [])
+        return header, file.tell()
+
+
+def split_ranges(filename, parts, quotechar='"', executor=None):
+    """
+    Split the body of filename into at most `parts` record-aligned byte ranges
+
+    Returns a list of (start, end) offsets covering the body exactly once.
+    """
+    _, body_start = read_header(filename, quotechar=quotechar)
+    size = os.path.getsize(filename)
+    if parts <= 1 or size - body_start < parts:
+        return [(body_start, size)]
+
+    step = (size - body_start) // parts
+    raw_cuts = [body_start + step * i for i in range(parts)] + [size]
+    raw_ranges = list(zip(raw_cuts[:-1], raw_cuts[1:]))
+    quote = quotechar.encode()
+
+    # Phase 1: quote counts per raw range (in parallel when a pool is given)
+    if executor is None:
+        counts = [_count_quotes(filename, start, end, quote) for start, end in raw_ranges]
+    else:
+        futures = [executor.submit(_count_quotes, filename, start, end, quote)
+                   for start, end in raw_ranges]
+        counts = [future.result() for future in futures]
+
+    # Phase 2: move each raw cut forward to a real record boundary
+    cuts = [body_start]
+    parity = 0
+    with open(filename, 'rb') as file:
+        for raw_cut, count in zip(raw_cuts[1:-1], counts[:-1]):
+            parity += count
+            cut = _next_boundary(file, raw_cut, parity, quote, size)
+            if cut > cuts[-1]:
+                cuts.append(cut)
+    if cuts[-1] < size:
+        cuts.append(size)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def scan_range(filename, start, end, ncols, group_index, value_index, dtype,
+               delimiter=',', quotechar='"'):
+    """
+    Aggregate one byte range into a GroupedStats partial result
+
+    Runs inside a worker process; the return value is small (one accumulator
+    per category) so shipping it back to the parent is cheap.
+    """
+    partial = GroupedStats()
+    with open(filename, 'rb') as file:
+        reader = RangeReader(file, start, end)
+        for block in iter_record_blocks(reader, DEFAULT_BLOCK_BYTES, quotechar.encode()):
+            keys, values = split_block(block, ncols, [group_index, value_index], delimiter, quotechar)
+            if len(keys):
+                partial.update_many(keys, convert_column(values, dtype))
+    return partial
+
+
+def category_stats(filename, group_column, value_column, workers=1, dtype=np.int64,
+                   delimiter=',', quotechar='"'):
+    """
+    Per-category count/sum/min/max/mean/variance/median of value_column
+
+    workers=1 scans in this process; workers>1 (or None for all CPU cores)
+    splits the file into record-aligned ranges and scans them in a process
+    pool. Both paths run the same scan_range() code and merge in file order,
+    so count/sum/min/max/mean are identical; variance and the t-digest median
+    may differ in the last digits because partial results merge differently.
+    """
+    header, _ = read_header(filename, delimiter, quotechar)
+    args = (len(header), header.index(group_column), header.index(value_column),
+            np.dtype(dtype), delimiter, quotechar)
+    workers = workers or os.cpu_count() or 1
+
+    merged = GroupedStats()
+    if workers == 1:
+        for start, end in split_ranges(filename, 1, quotechar):
+            merged.merge(scan_range(filename, start, end, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # A few ranges per worker keeps every core busy until the end
+            ranges = split_ranges(filename, workers * 4, quotechar, executor)
+            futures = [executor.submit(scan_range, filename, start, end, *args)
+                       for start, end in ranges]
+            for future in futures:
+                merged.merge(future.result())
+
+    return merged.as_dict()
+
+
+if __name__ == "__main__":
+    from .columnar import write_sample_sales
+
+    write_sample_sales('benchmark_sales.csv', 1_000_000)
+    print(category_stats('benchmark_sales.csv', 'Product', 'Quantity', workers=None))
@@ -0,0 +1,260 @@
+"""
+Streaming One-Pass Statistics
+=============================
+
+Keeping every value in a list just to compute an average at the end means
+memory grows with the file. These accumulators look at each value once and
+keep only a few numbers (plus a small sketch for quantiles), so memory is
+O(number of groups) instead of O(number of rows).
+
+What is tracked
+===============
+- count, sum, min, max   : exact
+- mean                   : sum / count (exact for integer data)
+- variance / stdev       : Welford's online algorithm (numerically stable)
+- quantiles (median...)  : t-digest sketch (approximate, a few hundred numbers)
+
+Mergeable
+=========
+Two accumulators built over different parts of a file can be merged into
+one that describes both parts (Chan et al. formula for the variance, centroid
+merge for the t-digest). This is what lets parallel workers each summarize
+their own byte range and send back tiny partial results.
+
+Memory Trick
+============
+update()      = one value      (plain Python, for row loops)
+update_many() = a NumPy array  (vectorized, for column chunks)
+merge()       = another accumulator (parallel partial results)
+"""
+
+import math
+
+import numpy as np
+
+from .columnar import factorize
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (t-digest with the arcsine scale function)
+
+    Values are grouped into weighted centroids; clusters are kept small near
+    the tails (q close to 0 or 1) and larger in the middle, which keeps
+    extreme quantiles accurate with a bounded number of centroids.
+    """
+
+    def __init__(self, compression=100, buffer_size=4096):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self._values = []
+        self._arrays = []
+        self._buffered = 0
+
+    def add(self, value):
+        """Add a single value"""
+        self._values.append(value)
+        self._buffered += 1
+        if self._buffered >= self.buffer_size:
+            self.compress()
+
+    def add_many(self, values):
+        """Add an array of values"""
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values):
+            self._arrays.append(values)
+            self._buffered += len(values)
+            if self._buffered >= self.buffer_size:
+                self.compress()
+
+    def merge(self, other):
+        """Fold another digest into this one"""
+        other.compress()
+        self.compress()
+        self._merge_centroids(np.concatenate([self.means, other.means]),
+                              np.concatenate([self.weights, other.weights]))
+        return self
+
+    def compress(self):
+        """Merge buffered values into the centroid list"""
+        if not self._buffered:
+            return
+        values = np.concatenate([np.asarray(self._values, dtype=float), *self._arrays])
+        self._values = []
+        self._arrays = []
+        self._buffered = 0
+        self._merge_centroids(np.concatenate([self.means, values]),
+                              np.concatenate([self.weights, np.ones(len(values))]))
+
+    def _merge_centroids(self, means, weights):
+        if len(means) == 0:
+            return
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        cumulative = np.cumsum(weights)
+        q_mid = (cumulative - weights / 2) / total
+        # k-scale: equal steps in k give small clusters at the tails
+        k = self.compression / math.pi * np.arcsin(np.clip(2 * q_mid - 1, -1, 1))
+        bucket = np.floor(k)
+
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q, low=None, high=None):
+        """Approximate q-quantile (0 <= q <= 1); low/high are the exact min/max"""
+        self.compress()
+        if len(self.means) == 0:
+            return math.nan
+        total = self.weights.sum()
+        centers = (np.cumsum(self.weights) - self.weights / 2) / total
+        low = self.means[0] if low is None else low
+        high = self.means[-1] if high is None else high
+        return float(np.interp(q, np.r_[0.0, centers, 1.0], np.r_[low, self.means, high]))
+
+
+class RunningStats:
+    """Count, sum, mean, variance, min, max and quantiles in one pass"""
+
+    def __init__(self, quantiles=True, compression=100):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.digest = TDigest(compression) if quantiles else None
+
+    def update(self, value):
+        """Add one value (Welford's update)"""
+        self.count += 1
+        self.total += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.digest is not None:
+            self.digest.add(value)
+        return self
+
+    def update_many(self, values):
+        """Add a NumPy array of values in one vectorized step"""
+        values = np.asarray(values)
+        if len(values) == 0:
+            return self
+        batch_mean = float(values.mean())
+        batch = RunningStats(quantiles=False)
+        batch.count = len(values)
+        batch.total = values.sum().item()
+        batch.min = values.min().item()
+        batch.max = values.max().item()
+        batch._mean = batch_mean
+        batch._m2 = float(((values - batch_mean) ** 2).sum())
+        self._merge_moments(batch)
+        if self.digest is not None:
+            self.digest.add_many(values)
+        return self
+
+    def merge(self, other):
+        """Fold another RunningStats (e.g. a worker's partial result) into this one"""
+        self._merge_moments(other)
+        if self.digest is not None and other.digest is not None:
+            self.digest.merge(other.digest)
+        return self
+
+    def _merge_moments(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.total = other.count, other.total
+            self.min, self.max = other.min, other.max
+            self._mean, self._m2 = other._mean, other._m2
+            return
+
+        # Chan et al. parallel variance formula
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self._mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def variance(self):
+        """Population variance"""
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        if self.digest is None:
+            raise ValueError("Quantiles were disabled for this accumulator")
+        return self.digest.quantile(q, self.min, self.max)
+
+    def as_dict(self):
+        result = {'count': self.count, 'sum': self.total, 'min': self.min, 'max': self.max,
+                  'mean': self.mean, 'variance': self.variance}
+        if self.digest is not None:
+            result['median'] = self.quantile(0.5)
+        return result
+
+    def __repr__(self):
+        return f"RunningStats(count={self.count}, mean={self.mean:.4g}, min={self.min}, max={self.max})"
+
+
+class GroupedStats:
+    """One RunningStats per group key, e.g. per CSV category"""
+
+    def __init__(self, quantiles=True, compression=100):
+        self.quantiles = quantiles
+        self.compression = compression
+        self.groups = {}
+
+    def _get(self, key):
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = RunningStats(self.quantiles, self.compression)
+        return stats
+
+    def update(self, key, value):
+        self._get(key).update(value)
+        return self
+
+    def update_many(self, keys, values):
+        """Vectorized update from a key column and a value column of one chunk"""
+        unique, inverse = factorize(keys)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+        sorted_values = values[order]
+        for index, key in enumerate(unique.tolist()):
+            if isinstance(key, bytes):
+                key = key.decode('utf-8')
+            self._get(key).update_many(sorted_values[bounds[index]:bounds[index + 1]])
+        return self
+
+    def merge(self, other):
+        for key, stats in other.groups.items():
+            self._get(key).merge(stats)
+        return self
+
+    def items(self):
+        return self.groups.items()
+
+    def as_dict(self):
+        return {key: stats.as_dict() for key, stats in self.groups.items()}
@@ -0,0 +1,29 @@
+"""
+json_tools - Faster building blocks behind the python_json.py examples
+
+***This is a local package (see modules_importing/) - python_json.py imports it***
+
+python_json.py teaches json.load/json.dump on small documents. The modules
+in this package are built for large files and hot paths:
+
+- stream   : incremental parser yielding array elements one at a time (bounded memory)
+- stream_encoder : dump_stream() writes batches from the C encoder in blocks (generators too); reformat()
+- ndjson   : buffered JSON Lines appender + chunked, process-parallel line decoder
+- config_cache : process-wide frozen parsed-config cache (stat/watcher invalidation, LRU bytes cap)
+- compiled_encoder : schema -> generated serializer (keys pre-escaped, no per-value type dispatch); python -m json_tools times it
+- lazy     : memory-mapped document with a numpy bracket index; subtrees decoded on access
+- batch    : parse many payloads, failures kept in a compact error table, latency/throughput stats
+- snapshot : binary, memory-mapped format for JSON-shaped data (string table, offset-indexed containers)
+- patch    : RFC 6902 diff/apply; equal branches skipped (identity, cached subtree hashes), copy-on-write apply
+"""
+
+from .stream import iter_items, parse_events
+from .stream_encoder import dump_stream, reformat
+from .ndjson import NDJSONWriter, read_ndjson
+from .config_cache import ConfigCache, config_cache, freeze, load_config, thaw
+from .compiled_encoder import CompiledEncoder, compile_encoder
+from .lazy import LazyArray, LazyDocument, LazyObject, load_lazy
+from .batch import BatchResult, parse_batch
+from .snapshot import (Snapshot, SnapshotArray, SnapshotObject, dump_snapshot, json_to_snapshot,
+                       load_snapshot, snapshot_to_json)
+from .patch import PatchError, SubtreeHashes, apply_patch, diff
@@ -0,0 +1,8 @@
+"""python -m json_tools : compiled_encoder.benchmark() as a table"""
+
+from .compiled_encoder import benchmark
+
+print(f"{'fields':>6} {'lists':>6} {'json.dumps':>11} {'compiled':>9} {'speed-up':>9} {'batch':>7}")
+for row in benchmark():
+    print(f"{row['fields']:>6} {'yes' if row['lists'] else 'no':>6} {row['dumps_seconds']:>10.3f}s "
+          f"{row['compiled_seconds']:>8.3f}s {row['speedup']:>8.2f}x {row['batch_speedup']:>6.2f}x")
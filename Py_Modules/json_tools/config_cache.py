@@ -0,0 +1,190 @@
+"""
+Parsed-JSON Cache for Configuration Files
+=========================================
+
+Configuration files are read far more often than they change, yet code like
+json_file_example() opens, reads and parses config.json on every call.
+
+load_config(path) parses a file once and keeps the result in a process-wide
+cache keyed by the absolute path:
+- A repeat call checks the file with one os.stat() - no read, no parse
+- The entry is reloaded when the file's size, mtime or inode change
+  (editors that save via "write temp file + rename" change the inode)
+- With a watcher running, even the stat() is skipped: a background thread
+  polls the cached files and drops changed entries, so a hot read is a
+  plain dictionary lookup
+
+Frozen values
+=============
+Every caller gets the SAME parsed object, so it must not be changed in
+place. Objects become read-only mappings (types.MappingProxyType) and arrays
+become tuples; thaw() returns an ordinary mutable copy when you need one.
+
+Memory limit
+============
+The cache counts the source size of every entry and evicts the least
+recently used files once max_bytes is exceeded.
+
+Memory Trick
+============
+json.load()   = open + read + parse, every time
+load_config() = stat (or nothing), then a dictionary lookup
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def freeze(value):
+    """Read-only version of a parsed JSON value (MappingProxyType / tuple)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Mutable deep copy of a frozen value (dict / list)"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _identity(stat):
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class ConfigCache:
+    """
+    Path -> frozen parsed JSON, invalidated on file change, LRU-bounded by bytes
+
+    check_interval: seconds a cached entry is trusted without a new stat()
+    (0 = stat on every call). While watch() is active no stat() is done on
+    reads at all.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, check_interval=0.0, encoding='utf-8'):
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self.encoding = encoding
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # path -> [identity, value, size, last_checked]
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def get(self, path):
+        """Frozen parsed content of path, loading it if missing or changed"""
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._watcher is not None or (
+                        self.check_interval and time.monotonic() - entry[3] < self.check_interval):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+
+        stat = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == _identity(stat):
+                entry[3] = time.monotonic()
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        return self._load(key, stat)
+
+    def _load(self, key, stat):
+        with open(key, 'r', encoding=self.encoding) as file:
+            value = freeze(json.load(file))
+        after = os.stat(key)
+        with self._lock:
+            self.misses += 1
+            self._drop(key)
+            if _identity(after) != _identity(stat):
+                return value  # Changed while we read it: use it, but do not cache it
+            if stat.st_size <= self.max_bytes:
+                self._entries[key] = [_identity(stat), value, stat.st_size, time.monotonic()]
+                self.total_bytes += stat.st_size
+                while self.total_bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))  # Least recently used first
+        return value
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def invalidate(self, path=None):
+        """Forget one path, or everything when path is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.total_bytes = 0
+            else:
+                self._drop(os.path.abspath(path))
+
+    def watch(self, interval=1.0):
+        """Start a daemon thread that polls cached files every `interval` seconds"""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._poll, args=(interval,),
+                                             name='ConfigCache-watcher', daemon=True)
+            self._watcher.start()
+
+    def stop_watching(self):
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._stop.set()
+            watcher.join()
+
+    def _poll(self, interval):
+        while not self._stop.wait(interval):
+            with self._lock:
+                snapshot = [(key, entry[0]) for key, entry in self._entries.items()]
+            for key, identity in snapshot:
+                try:
+                    changed = _identity(os.stat(key)) != identity
+                except OSError:
+                    changed = True  # Deleted or renamed away
+                if changed:
+                    with self._lock:
+                        entry = self._entries.get(key)
+                        if entry is not None and entry[0] == identity:
+                            self._drop(key)
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_cache = ConfigCache()
+
+
+def load_config(path):
+    """Frozen parsed JSON of path from the process-wide cache"""
+    return _default_cache.get(path)
+
+
+def config_cache():
+    """The process-wide ConfigCache used by load_config() (for watch(), stats, ...)"""
+    return _default_cache
@@ -0,0 +1,407 @@
+"""
+Lazy JSON Documents
+===================
+
+json_file_example() only needs loaded_data['settings']['theme'], but
+json.load() builds EVERY object, list and string of the file first - for a
+500 MB document that is seconds of work and several GB of Python objects
+for one short string.
+
+LazyDocument memory-maps the file and does one fast structural pass
+(numpy, 4 MB blocks at a time):
+1. Finds the quotes that are not escaped by a backslash
+2. Marks which bytes lie inside strings (quote parity)
+3. Keeps only the brackets {} [] outside strings and pairs every opening
+   bracket with its closing one (depth counting)
+
+After that, any object or array can be skipped in one jump. Accessing a key
+walks only the DIRECT children of that object (keys and scalars are read
+with small regular expressions, nested containers are jumped over), and a
+value is decoded only when you ask for it:
+
+    with LazyDocument('config.json') as document:
+        theme = document['settings']['theme']   # decodes one string
+
+Objects come back as LazyObject (a read-only Mapping), arrays as LazyArray
+(a read-only Sequence); .decode() turns either into ordinary dict/list with
+json.loads on just that part of the file.
+
+Validation is lazy too: brackets and strings are checked for the whole file,
+but a broken number in a part you never touch goes unnoticed.
+
+Memory Trick
+============
+json.load    = build the whole tree, then look up one leaf
+LazyDocument = map the file, index the brackets, build only the leaf
+"""
+
+import json
+import mmap
+import os
+import re
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+BLOCK_BYTES = 4 * 1024 * 1024
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SEPARATOR = re.compile(rb'[ \t\n\r]*,[ \t\n\r]*')
+_OPENING = frozenset(b'{[')
+_SCALAR = re.compile(rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null'
+                     rb'|NaN|-?Infinity')
+
+# +1 for an opening bracket, -1 for a closing one
+_BRACKETS = np.zeros(256, dtype=np.int8)
+_BRACKETS[[ord('{'), ord('[')]] = 1
+_BRACKETS[[ord('}'), ord(']')]] = -1
+
+
+def _error(message, pos):
+    """JSONDecodeError for a byte position (the document is never decoded as a whole)"""
+    error = json.JSONDecodeError(message, '', 0)
+    error.args = (f"{message}: byte {pos}",)
+    error.pos = pos
+    error.lineno = error.colno = None
+    return error
+
+
+def _unescape_quotes(quotes, block, carry):
+    """
+    Clear the quotes that are preceded by an odd run of backslashes
+
+    quotes is the block's `== '"'` mask (changed in place); carry is the
+    length of the backslash run the previous block ended with. Returns the
+    length of the run this block ends with.
+    """
+    backslashes = np.flatnonzero(block == ord('\\'))
+    if len(backslashes) == 0:
+        if carry % 2 and quotes[0]:
+            quotes[0] = False
+        return 0
+    # Runs of consecutive backslashes: their starts, ends and lengths
+    breaks = np.flatnonzero(np.diff(backslashes) != 1) + 1
+    starts = backslashes[np.concatenate(([0], breaks))]
+    ends = backslashes[np.concatenate((breaks - 1, [len(backslashes) - 1]))]
+    lengths = ends - starts + 1
+    if starts[0] == 0:
+        lengths[0] += carry  # The run continues from the previous block
+    elif carry % 2 and quotes[0]:
+        quotes[0] = False
+    after = ends[lengths % 2 == 1] + 1  # Bytes escaped by an odd run
+    after = after[after < len(block)]
+    quotes[after] = False
+    return int(lengths[-1]) if ends[-1] == len(block) - 1 else 0
+
+
+def build_index(data, block_bytes=BLOCK_BYTES):
+    """
+    (opening, closing, depth) of every bracket pair outside strings
+
+    All three arrays are sorted by opening position: closing[i] is the
+    position of the bracket that closes opening[i], depth[i] its nesting
+    level (1 = top level). Raises JSONDecodeError for unbalanced brackets or an
+    unterminated string.
+    """
+    positions = []
+    kinds = []
+    in_string = 0
+    carry = 0  # Backslashes at the end of the previous block
+    for offset in range(0, len(data), block_bytes):
+        block = np.frombuffer(data, dtype=np.uint8, count=min(block_bytes, len(data) - offset),
+                              offset=offset)
+        quotes = block == ord('"')
+        carry = _unescape_quotes(quotes, block, carry)
+        quotes = np.flatnonzero(quotes)
+        brackets = np.flatnonzero((block == ord('{')) | (block == ord('}'))
+                                  | (block == ord('[')) | (block == ord(']')))
+        # Quotes before a bracket (plus the parity carried in) tell if it is inside a string
+        outside = (np.searchsorted(quotes, brackets) + in_string) % 2 == 0
+        brackets = brackets[outside]
+        positions.append(brackets + offset)
+        kinds.append(block[brackets])
+        in_string = (in_string + len(quotes)) % 2
+        del block
+
+    if in_string:
+        raise _error("Unterminated string", len(data))
+    positions = np.concatenate(positions) if positions else np.zeros(0, dtype=np.intp)
+    kinds = np.concatenate(kinds) if kinds else np.zeros(0, dtype=np.uint8)
+
+    step = _BRACKETS[kinds]
+    depth = np.cumsum(step, dtype=np.int32)
+    if len(depth) and depth.min() < 0:
+        raise _error("Closing bracket without an opening one", int(positions[np.argmax(depth < 0)]))
+    if len(depth) and depth[-1] != 0:
+        raise _error("Unclosed bracket", len(data))
+
+    # A bracket pair sits on one nesting level, and on each level opening and
+    # closing brackets alternate: a stable sort by level lines them up in pairs
+    depth += step < 0
+    if len(depth) and depth.max() < 2 ** 15:
+        depth = depth.astype(np.int16)  # Lets numpy use its (linear time) radix sort
+    order = np.argsort(depth, kind='stable')
+    opening, closing = order[0::2], order[1::2]
+    mismatched = kinds[closing] != kinds[opening] + 2  # '{'+2 = '}', '['+2 = ']'
+    if mismatched.any():
+        raise _error("Mismatched closing bracket", int(positions[closing[np.argmax(mismatched)]]))
+    partner = np.empty(len(positions), dtype=np.int64)
+    partner[opening] = closing
+    del order, opening, closing
+    is_opening = step > 0
+    return positions[is_opening], positions[partner[is_opening]], depth[is_opening]
+
+
+class _Container:
+    """Shared parts of LazyObject and LazyArray: location and child table"""
+
+    def __init__(self, document, start, end):
+        self._document = document
+        self.span = (start, end)  # Byte range in the document, brackets included
+        self._table = None
+        self._cache = {}
+
+    def decode(self):
+        """Ordinary dict/list of this part of the document"""
+        start, end = self.span
+        return json.loads(self._document.data[start:end])
+
+    def _children(self):
+        """Yield (key or None, value start, value end) of the direct children"""
+        document = self._document
+        data = document.data
+        start, end = self.span
+        closing = b'}' if data[start] == ord('{') else b']'
+        is_object = closing == b'}'
+        # Nested containers are looked up in order in the bracket index
+        opening, closing_at = document.child_containers(start, end)
+        opening, closing_at = iter(opening.tolist()), iter(closing_at.tolist())
+        pos = _WHITESPACE.match(data, start + 1).end()
+        if data[pos:pos + 1] == closing:
+            return
+        while True:
+            key = None
+            if is_object:
+                match = _STRING.match(data, pos)
+                if match is None:
+                    raise _error("Expecting property name enclosed in double quotes", pos)
+                key = document.decode_key(match.group())
+                pos = _WHITESPACE.match(data, match.end()).end()
+                if data[pos:pos + 1] != b':':
+                    raise _error("Expecting ':' delimiter", pos)
+                pos = _WHITESPACE.match(data, pos + 1).end()
+
+            if data[pos] in _OPENING:
+                if next(opening) != pos:
+                    raise _error("Unexpected bracket", pos)
+                value_end = next(closing_at) + 1
+            else:
+                value_end = document.value_end(pos)
+            yield key, pos, value_end
+            pos = _WHITESPACE.match(data, value_end).end()
+            separator = data[pos:pos + 1]
+            if separator == closing:
+                return
+            if separator != b',':
+                raise _error(f"Expecting ',' or {closing.decode()!r}", pos)
+            pos = _WHITESPACE.match(data, pos + 1).end()
+
+    def _value(self, index, start, end):
+        if index not in self._cache:
+            self._cache[index] = self._document.value(start, end)
+        return self._cache[index]
+
+
+class LazyObject(_Container, Mapping):
+    """Read-only mapping over a JSON object; members are decoded on access"""
+
+    def _members(self):
+        if self._table is None:
+            table = {}
+            for key, start, end in self._children():
+                table[key] = (start, end)  # Duplicate keys: the last one wins, as in json.loads
+            self._table = table
+        return self._table
+
+    def __getitem__(self, key):
+        start, end = self._members()[key]
+        return self._value(key, start, end)
+
+    def __iter__(self):
+        return iter(self._members())
+
+    def __len__(self):
+        return len(self._members())
+
+    def __repr__(self):
+        return f"LazyObject(keys={list(self._members())!r})"
+
+
+class LazyArray(_Container, Sequence):
+    """Read-only sequence over a JSON array; elements are decoded on access"""
+
+    def _elements(self):
+        if self._table is None:
+            self._table = self._container_elements()
+        if self._table is None:
+            starts, ends = [], []
+            for _, start, end in self._children():
+                starts.append(start)
+                ends.append(end)
+            self._table = (np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64))
+        return self._table
+
+    def _container_elements(self):
+        """
+        (starts, ends) straight from the bracket index, or None
+
+        Arrays of objects/arrays written by json.dump have the same separator
+        between every two elements (',' or ',\\n    '). When that holds, the
+        elements are exactly the child containers and no element is visited.
+        """
+        data = self._document.data
+        start, end = self.span
+        opening, closing = self._document.child_containers(start, end)
+        if not len(opening):
+            return None
+        ends = closing + 1
+        head = _WHITESPACE.match(data, start + 1).end()
+        tail = _WHITESPACE.match(data, int(ends[-1])).end()
+        if head != opening[0] or tail != end - 1:
+            return None
+        if len(opening) > 1:
+            gaps = opening[1:] - ends[:-1]
+            width = int(gaps[0])
+            separator = data[int(ends[0]):int(opening[1])]
+            if (gaps != width).any() or _SEPARATOR.fullmatch(separator) is None:
+                return None
+            view = np.frombuffer(data, dtype=np.uint8)
+            try:
+                found = view[ends[:-1, None] + np.arange(width)]
+                if (found != np.frombuffer(separator, dtype=np.uint8)).any():
+                    return None
+            finally:
+                del view
+        return opening, ends
+
+    def __getitem__(self, index):
+        starts, ends = self._elements()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(starts)))]
+        if index < 0:
+            index += len(starts)
+        if not 0 <= index < len(starts):
+            raise IndexError("LazyArray index out of range")
+        return self._value(index, int(starts[index]), int(ends[index]))
+
+    def __len__(self):
+        return len(self._elements()[0])
+
+    def __repr__(self):
+        return f"LazyArray(length={len(self)})"
+
+
+class LazyDocument:
+    """
+    Memory-mapped JSON document with on-demand decoding
+
+    source: file path, or bytes/bytearray already in memory.
+    document.root is the top-level value (LazyObject / LazyArray / scalar);
+    document[key] is a shortcut for document.root[key].
+    """
+
+    def __init__(self, source, block_bytes=BLOCK_BYTES):
+        self._file = None
+        self._map = None
+        if isinstance(source, (str, os.PathLike)):
+            self.filename = source
+            self._file = open(source, 'rb')
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self.data = b''  # mmap cannot map an empty file
+            else:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = self._map
+        else:
+            self.filename = None
+            self.data = source
+
+        try:
+            self._opening, self._closing, self._depth = build_index(self.data, block_bytes)
+            start = 3 if self.data[:3] == b'\xef\xbb\xbf' else 0  # UTF-8 byte order mark
+            start = _WHITESPACE.match(self.data, start).end()
+            end = self.value_end(start)
+            if _WHITESPACE.match(self.data, end).end() != len(self.data):
+                raise _error("Extra data", end)
+            self.root = self.value(start, end)
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def containers(self):
+        """Number of objects and arrays in the document"""
+        return len(self._opening)
+
+    def value_end(self, pos):
+        """Byte position just after the JSON value starting at pos"""
+        data = self.data
+        first = data[pos:pos + 1]
+        if first in (b'{', b'['):
+            index = np.searchsorted(self._opening, pos)
+            return int(self._closing[index]) + 1
+        match = (_STRING if first == b'"' else _SCALAR).match(data, pos)
+        if match is None:
+            raise _error("Expecting value", pos)
+        return match.end()
+
+    def child_containers(self, start, end):
+        """(opening, closing) positions of the containers directly inside [start, end)"""
+        first = np.searchsorted(self._opening, start)
+        last = np.searchsorted(self._opening, end)
+        inside = slice(first + 1, last)
+        direct = self._depth[inside] == self._depth[first] + 1
+        return self._opening[inside][direct], self._closing[inside][direct]
+
+    def value(self, start, end):
+        """The value in [start, end): a lazy container, or a decoded scalar"""
+        first = self.data[start:start + 1]
+        if first == b'{':
+            return LazyObject(self, start, end)
+        if first == b'[':
+            return LazyArray(self, start, end)
+        return json.loads(self.data[start:end])
+
+    @staticmethod
+    def decode_key(raw):
+        """str of a quoted key; plain ASCII keys skip json.loads"""
+        if b'\\' not in raw and raw.isascii():
+            return raw[1:-1].decode('ascii')
+        return json.loads(raw)
+
+    def __getitem__(self, key):
+        return self.root[key]
+
+    def decode(self):
+        """The whole document as ordinary Python objects (json.loads)"""
+        return json.loads(self.data[:])
+
+    def close(self):
+        """Release the mapping (lazy values must not be used afterwards)"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def load_lazy(path, block_bytes=BLOCK_BYTES):
+    """LazyDocument for path (use it in a with-block to release the mapping)"""
+    return LazyDocument(path, block_bytes)
@@ -0,0 +1,202 @@
+"""
+JSON Lines (NDJSON) Reading and Writing
+=======================================
+
+A regular JSON file is ONE document: adding a record means reading,
+changing and rewriting the whole file, and nothing can be used before the
+closing bracket is parsed.
+
+JSON Lines (also called NDJSON, newline-delimited JSON) stores one complete
+JSON value per line:
+
+    {"event": "login", "user": "john"}
+    {"event": "logout", "user": "john"}
+
+- Appending = writing one more line at the end (no rewrite)
+- Every line can be decoded on its own, so a file can be cut at ANY
+  newline and the pieces decoded in parallel
+
+NDJSONWriter
+============
+Opens the file in append mode and buffers encoded lines in memory, writing
+them in large blocks (one write() per ~1 MB instead of one per record).
+
+read_ndjson()
+=============
+1. Cuts the file into line-aligned byte ranges (~4 MB each)
+2. A process pool decodes the ranges; `transform` (optional) runs in the
+   workers too, so only its results travel back to the parent
+3. Records are yielded in file order (ordered=True) or as soon as any range
+   is done (ordered=False); only a few ranges are in flight at a time, so
+   memory stays bounded on multi-GB files
+
+Shipping decoded objects back from a worker costs about as much as decoding
+them (pickling), so the speed-up grows with how much work `transform` saves:
+filtering or projecting records inside the workers pays off most.
+
+Important (Windows/macOS)
+=========================
+Process pools re-import the calling script; call read_ndjson(..., workers > 1)
+from inside an `if __name__ == "__main__":` block.
+
+Memory Trick
+============
+.json  = one big document (rewrite to append)
+.jsonl = one document per line (append a line, split anywhere)
+"""
+
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+CHUNK_BYTES = 4 * 1024 * 1024
+BUFFER_SIZE = 1024 * 1024
+
+
+class NDJSONWriter:
+    """
+    Buffered append-only JSON Lines writer
+
+    with NDJSONWriter('events.jsonl') as writer:
+        writer.write({"event": "login", "user": "john"})
+    """
+
+    def __init__(self, filename, buffer_size=BUFFER_SIZE, ensure_ascii=False, default=None):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self._encode = json.JSONEncoder(ensure_ascii=ensure_ascii, separators=(',', ':'),
+                                        default=default).encode
+        self._file = open(filename, 'ab')
+        self._pending = []
+        self._pending_bytes = 0
+        self.records_written = 0
+
+        # An interrupted earlier write may have left a last line without its
+        # newline; start on a fresh line so the new record stays separate
+        if self._file.tell() > 0:
+            with open(filename, 'rb') as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b'\n':
+                    self._pending.append('')
+
+    def write(self, record):
+        """Queue one record (any JSON-serializable value)"""
+        line = self._encode(record)
+        self._pending.append(line)
+        self._pending_bytes += len(line) + 1
+        self.records_written += 1
+        if self._pending_bytes >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write the queued lines in one block"""
+        if self._pending:
+            self._file.write(('\n'.join(self._pending) + '\n').encode('utf-8'))
+            self._pending = []
+            self._pending_bytes = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def split_lines(filename, chunk_bytes=CHUNK_BYTES):
+    """Cut filename into (start, end) byte ranges that begin and end on line boundaries"""
+    size = os.path.getsize(filename)
+    ranges = []
+    with open(filename, 'rb') as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_bytes, size))
+            file.readline()  # Move the cut to the end of the line it landed in
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def decode_range(filename, start, end, transform=None):
+    """
+    Decode the lines in [start, end) of filename; runs inside a worker process
+
+    transform(record) may return a new value, or None to drop the record.
+    """
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    lines = [line for line in data.split(b'\n') if line.strip()]
+    try:
+        records = list(map(json.loads, lines))
+    except json.JSONDecodeError:
+        # Slow path only to say which line is broken
+        offset = start
+        for line in data.split(b'\n'):
+            if line.strip():
+                try:
+                    json.loads(line)
+                except json.JSONDecodeError as error:
+                    error.add_note(f"in the line starting at byte {offset} of '{filename}'")
+                    raise
+            offset += len(line) + 1
+        raise
+
+    if transform is not None:
+        records = [result for result in map(transform, records) if result is not None]
+    return records
+
+
+def read_ndjson(filename, workers=1, ordered=True, transform=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Yield the records of a JSON Lines file
+
+    workers=1 decodes in this process; workers>1 (or None for all CPU cores)
+    decodes line-aligned chunks in a process pool. ordered=False yields each
+    chunk's records as soon as it is ready. transform must be a module-level
+    function when workers > 1 (it is pickled to the workers).
+    """
+    ranges = split_lines(filename, chunk_bytes)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for start, end in ranges:
+            yield from decode_range(filename, start, end, transform)
+        return
+
+    window = workers * 2  # Chunks in flight: keeps cores busy, bounds memory
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = iter(ranges)
+
+        def submit():
+            for start, end in pending:
+                return executor.submit(decode_range, filename, start, end, transform)
+            return None
+
+        if ordered:
+            futures = deque(filter(None, (submit() for _ in range(window))))
+            while futures:
+                records = futures.popleft().result()
+                future = submit()
+                if future is not None:
+                    futures.append(future)
+                yield from records
+        else:
+            futures = set(filter(None, (submit() for _ in range(window))))
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future_next = submit()
+                    if future_next is not None:
+                        futures.add(future_next)
+                    yield from future.result()
@@ -0,0 +1,387 @@
+"""
+JSON Patch (RFC 6902): Diff and Apply
+=====================================
+
+When config.json changes, rewriting and shipping the whole file costs the
+size of the FILE. A JSON Patch describes only the change:
+
+    [{"op": "replace", "path": "/settings/theme", "value": "light"},
+     {"op": "add", "path": "/users/1", "value": {"name": "Mia", "tasks": 0}}]
+
+diff(source, target) produces such a patch from two parsed documents;
+apply_patch(document, patch) replays it on the other side.
+
+Skipping what did not change
+============================
+diff() walks both documents together and stops at every pair of branches
+that are equal:
+1. `a is b` - the same object (O(1)). Documents produced by apply_patch()
+   share every untouched branch with their source, so diffing a patched
+   document against its source costs only the size of the change.
+2. With a SubtreeHashes cache, containers are compared by a content hash
+   (BLAKE2 over the children's hashes, a Merkle tree). Each container is
+   hashed once and remembered, so repeated diffs against the same
+   documents compare whole branches in O(1).
+3. Otherwise Python's == rejects different branches (C speed, stops at
+   the first difference). == treats True, 1 and 1.0 as equal, so a branch
+   it calls equal is confirmed by comparing its marshal bytes (also C
+   speed) - true -> 1 or 1.0 -> 1 is a change in JSON and gets a "replace".
+
+Arrays are matched by trimming the common start and end first, so one
+element inserted into a long list gives one "add", not a cascade of
+"replace" operations.
+
+apply_patch() copies only the containers on the changed paths (copy on
+write) and leaves the input untouched, so a failing patch changes nothing.
+Supported operations: add, remove, replace, move, copy, test.
+
+Memory Trick
+============
+diff        = walk both trees, skip equal branches, emit the differences
+apply_patch = copy the changed paths, share everything else
+"""
+
+import copy
+import marshal
+from hashlib import blake2b
+from itertools import compress, count, islice
+from operator import is_not, ne
+
+_DIGEST_SIZE = 16
+_CONTAINERS = (dict, list)
+_CONFIRM_WINDOW = 1024  # List items confirmed per marshal comparison
+
+
+class PatchError(ValueError):
+    """A patch operation that cannot be applied (missing path, failed test, ...)"""
+
+
+def escape_token(key):
+    """One JSON Pointer reference token: '~' -> '~0', '/' -> '~1'"""
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def parse_pointer(pointer):
+    """JSON Pointer string -> list of unescaped reference tokens"""
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f"JSON Pointer must start with '/': {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+class SubtreeHashes:
+    """
+    Content hashes of dicts/lists, computed once per container and remembered
+
+    The cache holds a reference to every container it hashed (so Python
+    cannot reuse its id); call clear() when those documents are retired.
+    A hashed container must not be changed in place afterwards (its cached
+    hash would be stale) - derive new versions with apply_patch().
+    """
+
+    def __init__(self):
+        self._cache = {}
+
+    def digest(self, value):
+        """16-byte content hash of a dict/list"""
+        entry = self._cache.get(id(value))
+        if entry is not None and entry[0] is value:
+            return entry[1]
+        # repr() keeps types apart (True / 1 / 1.0 / '1'); nested containers
+        # are replaced by their own (cached) digest, which repr shows as b'...'
+        digest = self.digest
+        if type(value) is dict:
+            parts = [(key, digest(item) if type(item) in _CONTAINERS else item)
+                     for key, item in sorted(value.items())]  # JSON objects are unordered
+        else:
+            parts = [digest(item) if type(item) in _CONTAINERS else item for item in value]
+        result = blake2b(repr((type(value).__name__, parts)).encode('utf-8', 'surrogatepass'),
+                         digest_size=_DIGEST_SIZE).digest()
+        self._cache[id(value)] = (value, result)
+        return result
+
+    def equal(self, a, b):
+        if a is b:
+            return True
+        kind = type(a)
+        if kind is not type(b):
+            return False
+        if kind in _CONTAINERS:
+            return self.digest(a) == self.digest(b)
+        return a == b
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+def _json_equal(a, b):
+    """Equality as RFC 6902 'test' defines it: 1 == 1.0, but true != 1"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict):
+        return (isinstance(b, dict) and a.keys() == b.keys()
+                and all(_json_equal(value, b[key]) for key, value in a.items()))
+    if isinstance(a, list):
+        return (isinstance(b, list) and len(a) == len(b)
+                and all(map(_json_equal, a, b)))
+    return a == b
+
+
+def _same_bytes(a, b):
+    """True if a and b marshal to the same bytes (which keep true, 1 and 1.0 apart)"""
+    try:
+        # Version 2: no back-references or interning flags, so the bytes
+        # depend only on values and types, not on which objects are shared
+        return marshal.dumps(a, 2) == marshal.dumps(b, 2)
+    except (TypeError, ValueError, RecursionError):
+        return False  # Not plain JSON data (or too deep): the caller walks it instead
+
+
+def _exact_equal(a, b):
+    """Equality that keeps JSON types apart: true != 1 != 1.0, also deep inside branches"""
+    if a is b:
+        return True
+    kind = type(a)
+    if kind is not type(b):
+        return False
+    if kind is dict:
+        # == rejects at C speed; equal-looking branches are confirmed by
+        # their marshal bytes, and walked only if those differ (key order)
+        return a == b and (_same_bytes(a, b) or all(
+            _exact_equal(value, b[key]) for key, value in a.items()))
+    if kind is list:
+        return a == b and (_same_bytes(a, b) or all(map(_exact_equal, a, b)))
+    return a == b
+
+
+def _exact_run(source, target, run, backwards):
+    """How many of the first (last) run pairs, all == already, are also exactly equal"""
+    for start in range(0, run, _CONFIRM_WINDOW):
+        stop = min(start + _CONFIRM_WINDOW, run)
+        if backwards:
+            a = source[len(source) - stop:len(source) - start][::-1]
+            b = target[len(target) - stop:len(target) - start][::-1]
+        else:
+            a, b = source[start:stop], target[start:stop]
+        changed = list(map(is_not, a, b))  # Identical items (shared by apply_patch) need no check
+        if not _same_bytes(list(compress(a, changed)), list(compress(b, changed))):
+            for offset, pair in enumerate(zip(a, b)):
+                if not _exact_equal(*pair):
+                    return start + offset
+    return run
+
+
+def _common_run(source, target, limit, equal, backwards=False):
+    """How many leading (or trailing) items of two lists are equal, at most limit"""
+    # C-level scan: map() compares, compress() + count() find the first pair
+    # that differs - no Python code runs per list item. Without a hash
+    # cache, == finds the first difference and the pairs before it are
+    # confirmed in windows by their marshal bytes (== alone says True == 1).
+    # With a hash cache, the scan skips identical items (shared by
+    # apply_patch) and equal() only checks the pairs where it stops.
+    items = reversed if backwards else iter
+    if equal is _exact_equal:
+        different = map(ne, items(source), items(target))
+        run = next(compress(count(), islice(different, limit)), limit)
+        return _exact_run(source, target, run, backwards)
+    different = map(is_not, items(source), items(target))
+    run = 0
+    while run < limit:
+        run += next(compress(count(), islice(different, limit - run)), limit - run)
+        if run == limit:
+            break
+        index = -1 - run if backwards else run
+        if not equal(source[index], target[index]):
+            break
+        run += 1
+    return run
+
+
+def _diff(source, target, path, operations, equal):
+    if equal(source, target):
+        return
+    kind = type(source)
+    if kind is not type(target) or (kind is not dict and kind is not list):
+        operations.append({'op': 'replace', 'path': path, 'value': target})
+        return
+
+    if kind is dict:
+        for key in source:
+            if key not in target:
+                operations.append({'op': 'remove', 'path': f"{path}/{escape_token(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{escape_token(key)}"
+            if key in source:
+                _diff(source[key], value, child, operations, equal)
+            else:
+                operations.append({'op': 'add', 'path': child, 'value': value})
+        return
+
+    # Lists: skip the common start and end, then pair up what is left
+    limit = min(len(source), len(target))
+    start = _common_run(source, target, limit, equal)
+    end = _common_run(source, target, limit - start, equal, backwards=True)
+    source_end, target_end = len(source) - end, len(target) - end
+
+    paired = min(source_end, target_end) - start
+    for index in range(start, start + paired):
+        _diff(source[index], target[index], f"{path}/{index}", operations, equal)
+    # Remove from the back so earlier indexes stay valid
+    for index in range(source_end - 1, start + paired - 1, -1):
+        operations.append({'op': 'remove', 'path': f"{path}/{index}"})
+    for index in range(start + paired, target_end):
+        operations.append({'op': 'add', 'path': f"{path}/{index}", 'value': target[index]})
+
+
+def diff(source, target, hashes=None):
+    """
+    RFC 6902 patch (list of operation dicts) turning source into target
+
+    hashes: optional SubtreeHashes, reused across calls, to compare
+    branches by cached content hash instead of walking them.
+    """
+    operations = []
+    _diff(source, target, '', operations, _exact_equal if hashes is None else hashes.equal)
+    return operations
+
+
+class _Patcher:
+    """Applies operations with copy-on-write along the touched paths"""
+
+    def __init__(self, document, in_place):
+        self.document = document
+        self.in_place = in_place
+        self.owned = {}  # id -> container copied during this apply (safe to mutate)
+
+    def own(self, container):
+        if self.in_place or id(container) in self.owned:
+            return container
+        if not isinstance(container, (dict, list)):
+            raise PatchError(f"Cannot descend into a {type(container).__name__}")
+        duplicate = container.copy()
+        self.owned[id(duplicate)] = duplicate
+        return duplicate
+
+    @staticmethod
+    def index(container, token, path, allow_end=False):
+        if allow_end and token == '-':
+            return len(container)
+        if not token.isdigit() or (token != '0' and token.startswith('0')):
+            raise PatchError(f"Invalid array index {token!r} in {path!r}")
+        index = int(token)
+        if index > len(container) or (index == len(container) and not allow_end):
+            raise PatchError(f"Array index {index} out of range in {path!r}")
+        return index
+
+    def get(self, path):
+        value = self.document
+        for token in parse_pointer(path):
+            try:
+                if isinstance(value, list):
+                    value = value[self.index(value, token, path)]
+                elif isinstance(value, dict):
+                    value = value[token]
+                else:
+                    raise PatchError(f"Path {path!r} goes through a {type(value).__name__}")
+            except KeyError:
+                raise PatchError(f"Path {path!r} does not exist") from None
+        return value
+
+    def parent(self, path):
+        """(writable parent container, last token) for path; copies the way down"""
+        tokens = parse_pointer(path)
+        if not tokens:
+            return None, None
+        self.document = node = self.own(self.document)
+        for token in tokens[:-1]:
+            if isinstance(node, list):
+                key = self.index(node, token, path)
+            elif token in node:
+                key = token
+            else:
+                raise PatchError(f"Path {path!r} does not exist")
+            node[key] = node = self.own(node[key])
+        if not isinstance(node, (dict, list)):
+            raise PatchError(f"Path {path!r} goes through a {type(node).__name__}")
+        return node, tokens[-1]
+
+    def add(self, path, value):
+        parent, token = self.parent(path)
+        if parent is None:
+            self.document = value
+        elif isinstance(parent, list):
+            parent.insert(self.index(parent, token, path, allow_end=True), value)
+        else:
+            parent[token] = value
+
+    def remove(self, path):
+        parent, token = self.parent(path)
+        if parent is None:
+            raise PatchError("Cannot remove the whole document")
+        if isinstance(parent, list):
+            return parent.pop(self.index(parent, token, path))
+        try:
+            return parent.pop(token)
+        except KeyError:
+            raise PatchError(f"Path {path!r} does not exist") from None
+
+    def replace(self, path, value):
+        parent, token = self.parent(path)
+        if parent is None:
+            self.document = value
+        elif isinstance(parent, list):
+            parent[self.index(parent, token, path)] = value
+        elif token in parent:
+            parent[token] = value
+        else:
+            raise PatchError(f"Path {path!r} does not exist")
+
+    def apply(self, operation):
+        try:
+            op, path = operation['op'], operation['path']
+        except (KeyError, TypeError):
+            raise PatchError(f"Malformed operation: {operation!r}") from None
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f"'{op}' operation without a value: {operation!r}")
+
+        if op == 'add':
+            self.add(path, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            self.remove(path)
+        elif op == 'replace':
+            self.replace(path, copy.deepcopy(operation['value']))
+        elif op in ('move', 'copy'):
+            source = operation.get('from')
+            if source is None:
+                raise PatchError(f"'{op}' operation without 'from': {operation!r}")
+            if op == 'move':
+                if path.startswith(source + '/'):
+                    raise PatchError(f"Cannot move {source!r} into its own child {path!r}")
+                if path != source:
+                    self.add(path, self.remove(source))
+            else:
+                self.add(path, copy.deepcopy(self.get(source)))
+        elif op == 'test':
+            actual = self.get(path)
+            if not _json_equal(actual, operation['value']):
+                raise PatchError(f"Test failed at {path!r}")
+        else:
+            raise PatchError(f"Unknown operation {op!r}")
+
+
+def apply_patch(document, patch, in_place=False):
+    """
+    Return document with the RFC 6902 patch applied
+
+    The input is not modified (unless in_place=True): only containers on
+    changed paths are copied, all other branches are shared with it. If an
+    operation fails, PatchError is raised and the input is unchanged.
+    """
+    patcher = _Patcher(document, in_place)
+    for operation in patch:
+        patcher.apply(operation)
+    return patcher.document
@@ -0,0 +1,418 @@
+"""
+Binary Snapshots of JSON-Shaped Data
+====================================
+
+json.dump(data, file, indent=4) is readable, but reloading it means parsing
+all of it again: a 1 GB file takes tens of seconds and several GB of memory
+before the first value can be used.
+
+A snapshot stores the same data model (dict/list/str/int/float/bool/None)
+in a binary layout that is USED in place instead of parsed:
+- Every value is one 8-byte reference: 4 bits of type, 60 bits of payload
+  (small ints, true/false/null inline; other types point to their data)
+- Arrays are a count followed by the references of their elements, so
+  element i is found by arithmetic, not by scanning
+- Objects store their keys as ids into one string table (every distinct
+  key/string is written ONCE, however many objects repeat it), sorted so
+  a key is found by binary search
+- The file is memory-mapped: opening it reads a 40-byte header, and only
+  the pages you touch are ever loaded (numpy views, no copies)
+
+    dump_snapshot(data, 'data.snap')
+    with load_snapshot('data.snap') as snapshot:
+        theme = snapshot['settings']['theme']
+
+Converters: json_to_snapshot() and snapshot_to_json() go from one format to
+the other; SnapshotObject/SnapshotArray.decode() return ordinary dict/list.
+
+File layout (little-endian)
+===========================
+header   : b'JSONSNAP', version u32, 0 u32, root ref u64,
+           string count u64, data offset u64
+strings  : (count + 1) u64 offsets, then the UTF-8 bytes (sorted by bytes)
+data     : array  = count u64, count refs
+           object = count u64, key ids (sorted), value refs, insertion ranks
+           float  = f64;  big int = length u64 + decimal digits
+
+Memory Trick
+============
+json.load     = parse the whole file into objects, every time
+load_snapshot = map the file, follow offsets to what you need
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+MAGIC = b'JSONSNAP'
+VERSION = 1
+_HEADER = struct.Struct('<8sIIQQQ')
+
+# Reference tags (low 4 bits)
+NULL, FALSE, TRUE, INT, FLOAT, STRING, ARRAY, OBJECT, BIG_INT = range(9)
+
+_INLINE_MIN = -(1 << 59)
+_INLINE_MAX = (1 << 59) - 1
+_DOUBLE = struct.Struct('<d')
+_U64 = struct.Struct('<Q')
+_SPAN = struct.Struct('<QQ')
+_BUFFER_SIZE = 1024 * 1024
+_REF = np.dtype('<u8')
+_SMALL_OBJECT = 64  # Up to this many keys, a tuple + bisect beats a numpy view
+_ID_CACHE = 4096
+
+
+def _pad(length):
+    return -length % 8
+
+
+class _Writer:
+    """Writes values children-first, so every container knows its children's offsets"""
+
+    def __init__(self, file, string_ids):
+        self.file = file
+        self.string_ids = string_ids
+        self.position = file.tell()
+        self.buffer = bytearray()
+
+    def write(self, data):
+        offset = self.position + len(self.buffer)
+        self.buffer += data
+        if len(self.buffer) >= _BUFFER_SIZE:
+            self.flush()
+        return offset
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.position += len(self.buffer)
+        self.buffer = bytearray()
+
+    def ref(self, value):
+        # Exact type checks first: much cheaper than isinstance() against
+        # the Mapping ABC, and they cover everything json.load produces
+        kind = type(value)
+        if kind is str:
+            return self.string_ids[value] << 4 | STRING
+        if kind is dict:
+            return self.object(value)
+        if kind is list:
+            return self.array(value)
+        if kind is int:
+            return self.integer(value)
+        if kind is float:
+            return self.write(_DOUBLE.pack(value)) << 4 | FLOAT
+        if value is None:
+            return NULL
+        if value is True:
+            return TRUE
+        if value is False:
+            return FALSE
+        # Subclasses (OrderedDict, IntEnum, MappingProxyType, tuple, ...)
+        if isinstance(value, str):
+            return self.string_ids[value] << 4 | STRING
+        if isinstance(value, int):
+            return self.integer(int(value))
+        if isinstance(value, float):
+            return self.write(_DOUBLE.pack(value)) << 4 | FLOAT
+        if isinstance(value, (list, tuple)):
+            return self.array(value)
+        if isinstance(value, Mapping):
+            return self.object(value)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def integer(self, value):
+        if _INLINE_MIN <= value <= _INLINE_MAX:
+            return (value & ((1 << 60) - 1)) << 4 | INT
+        digits = str(value).encode('ascii')
+        offset = self.write(_U64.pack(len(digits)) + digits + bytes(_pad(len(digits))))
+        return offset << 4 | BIG_INT
+
+    def array(self, value):
+        refs = array('Q', [len(value)])
+        refs.extend(map(self.ref, value))
+        return self.write(refs) << 4 | ARRAY
+
+    def object(self, value):
+        keys = list(map(self.string_ids.__getitem__, value))
+        children = list(map(self.ref, value.values()))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        ranks = [0] * len(keys)
+        for rank, position in enumerate(order):
+            ranks[position] = rank
+        body = array('Q', [len(keys)])
+        body.extend([keys[position] for position in order])
+        body.extend([children[position] for position in order])
+        body.extend(ranks)
+        return self.write(body) << 4 | OBJECT
+
+
+def _collect_strings(value, strings):
+    """Add every key and string value inside value to the set `strings`"""
+    stack = [value]
+    pop, push, add = stack.pop, stack.extend, strings.add
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is str:
+            add(value)
+        elif kind is dict or (kind is not list and isinstance(value, Mapping)):
+            for key in value:
+                if type(key) is not str and not isinstance(key, str):
+                    raise TypeError(f"Snapshot keys must be str, not {type(key).__name__}")
+            strings.update(value)
+            push(value.values())
+        elif kind is list or isinstance(value, (list, tuple)):
+            push(value)
+        elif isinstance(value, str):
+            add(str(value))
+
+
+def _file_mode():
+    """Mode open() gives a new file (0o666 minus the umask); mkstemp() files start at 0o600"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def dump_snapshot(data, filename):
+    """Write data (JSON-shaped Python objects) as a snapshot file"""
+    strings = set()
+    _collect_strings(data, strings)
+    encoded = sorted(text.encode('utf-8', 'surrogatepass') for text in strings)
+    string_ids = {text.decode('utf-8', 'surrogatepass'): index for index, text in enumerate(encoded)}
+
+    offsets = np.zeros(len(encoded) + 1, dtype=_REF)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    blob = b''.join(encoded)
+
+    # A unique temp file: two writers of the same snapshot never share one
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)),
+                                             suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(bytes(_HEADER.size))
+            file.write(offsets.tobytes())
+            file.write(blob + bytes(_pad(len(blob))))
+            data_offset = file.tell()
+            writer = _Writer(file, string_ids)
+            root = writer.ref(data)
+            writer.flush()
+            file.seek(0)
+            file.write(_HEADER.pack(MAGIC, VERSION, 0, root, len(encoded), data_offset))
+        os.chmod(temporary, _file_mode())
+        os.replace(temporary, filename)  # Readers never see a half-written snapshot
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class _Container:
+    def __init__(self, snapshot, offset):
+        self._snapshot = snapshot
+        self._offset = offset
+        self._count = _U64.unpack_from(snapshot.data, offset)[0]
+
+    def _refs(self, start, count):
+        """Zero-copy uint64 view of `count` refs starting `start` slots after the count"""
+        return np.frombuffer(self._snapshot.data, dtype=_REF, count=count,
+                             offset=self._offset + 8 + 8 * start)
+
+    def __len__(self):
+        return self._count
+
+
+class SnapshotArray(_Container, Sequence):
+    """Read-only sequence view of a snapshot array"""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("SnapshotArray index out of range")
+        ref = _U64.unpack_from(self._snapshot.data, self._offset + 8 + 8 * index)[0]
+        return self._snapshot.value(ref)
+
+    def __iter__(self):
+        value = self._snapshot.value
+        for ref in self._refs(0, self._count).tolist():
+            yield value(ref)
+
+    def decode(self):
+        """Ordinary list (with ordinary dicts/lists inside)"""
+        return [item.decode() if isinstance(item, _Container) else item for item in self]
+
+    def __repr__(self):
+        return f"SnapshotArray(length={self._count})"
+
+
+class SnapshotObject(_Container, Mapping):
+    """Read-only mapping view of a snapshot object; iterates in the original key order"""
+
+    def __getitem__(self, key):
+        string_id = self._snapshot.string_id(key)
+        if string_id is not None:
+            if self._count <= _SMALL_OBJECT:
+                keys = struct.unpack_from(f'<{self._count}Q', self._snapshot.data, self._offset + 8)
+                index = bisect.bisect_left(keys, string_id)
+            else:
+                keys = self._refs(0, self._count)
+                index = int(np.searchsorted(keys, string_id))
+            if index < self._count and keys[index] == string_id:
+                ref = _U64.unpack_from(self._snapshot.data,
+                                       self._offset + 8 + 8 * (self._count + index))[0]
+                return self._snapshot.value(ref)
+        raise KeyError(key)
+
+    def _sorted_positions(self):
+        """Indexes into the sorted key/value arrays, in insertion order"""
+        return self._refs(2 * self._count, self._count).tolist()
+
+    def __iter__(self):
+        keys = self._refs(0, self._count)
+        string = self._snapshot.string
+        for position in self._sorted_positions():
+            yield string(int(keys[position]))
+
+    def items(self):
+        keys = self._refs(0, self._count).tolist()
+        values = self._refs(self._count, self._count).tolist()
+        string, value = self._snapshot.string, self._snapshot.value
+        return [(string(keys[position]), value(values[position]))
+                for position in self._sorted_positions()]
+
+    def decode(self):
+        """Ordinary dict (with ordinary dicts/lists inside)"""
+        return {key: item.decode() if isinstance(item, _Container) else item
+                for key, item in self.items()}
+
+    def __repr__(self):
+        return f"SnapshotObject(keys={list(self)!r})"
+
+
+class Snapshot:
+    """
+    Memory-mapped snapshot file
+
+    snapshot.root is the top-level value; snapshot[key] is a shortcut for
+    snapshot.root[key]. Views must not be used after close().
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self.data = None
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, root, count, data_offset = _HEADER.unpack_from(self.data)
+        except (ValueError, struct.error):  # Empty or shorter than the header
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            if self.data is not None:
+                self.data.close()
+            self._file.close()
+            if magic == MAGIC:
+                raise ValueError(f"Unsupported snapshot version {version} in '{filename}'")
+            raise ValueError(f"'{filename}' is not a JSON snapshot")
+        self.string_count = count
+        self._blob = _HEADER.size + 8 * (count + 1)
+        self._root_ref = root
+        self._ids = {}  # Recently looked-up keys -> string id
+
+    @property
+    def root(self):
+        return self.value(self._root_ref)
+
+    def __getitem__(self, key):
+        return self.root[key]
+
+    def _raw_string(self, string_id):
+        start, end = _SPAN.unpack_from(self.data, _HEADER.size + 8 * string_id)
+        return self.data[self._blob + start:self._blob + end]
+
+    def string(self, string_id):
+        return self._raw_string(string_id).decode('utf-8', 'surrogatepass')
+
+    def string_id(self, text):
+        """Id of text in the string table (binary search), or None"""
+        string_id = self._ids.get(text, -1)
+        if string_id != -1 or not isinstance(text, str):
+            return None if string_id == -1 else string_id
+        target = text.encode('utf-8', 'surrogatepass')
+        index = bisect.bisect_left(range(self.string_count), target, key=self._raw_string)
+        string_id = index if index < self.string_count and self._raw_string(index) == target else None
+        if len(self._ids) >= _ID_CACHE:
+            self._ids.clear()
+        self._ids[text] = string_id
+        return string_id
+
+    def value(self, ref):
+        tag = ref & 15
+        payload = ref >> 4
+        if tag == INT:
+            return payload - (1 << 60) if payload > _INLINE_MAX else payload
+        if tag == STRING:
+            return self.string(payload)
+        if tag == OBJECT:
+            return SnapshotObject(self, payload)
+        if tag == ARRAY:
+            return SnapshotArray(self, payload)
+        if tag == FLOAT:
+            return _DOUBLE.unpack_from(self.data, payload)[0]
+        if tag == NULL:
+            return None
+        if tag == TRUE:
+            return True
+        if tag == FALSE:
+            return False
+        if tag == BIG_INT:
+            length = _U64.unpack_from(self.data, payload)[0]
+            return int(self.data[payload + 8:payload + 8 + length])
+        raise ValueError(f"Corrupt snapshot reference {ref:#x}")
+
+    def decode(self):
+        """The whole snapshot as ordinary Python objects"""
+        root = self.root
+        return root.decode() if isinstance(root, _Container) else root
+
+    def close(self):
+        """Release the mapping"""
+        try:
+            self.data.close()
+        except BufferError:
+            # A numpy view of the mapping is still alive; it closes when freed
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def load_snapshot(filename):
+    """Open a snapshot file (use it in a with-block to release the mapping)"""
+    return Snapshot(filename)
+
+
+def json_to_snapshot(json_filename, snapshot_filename, encoding='utf-8'):
+    """Convert a JSON file to a snapshot (parses the JSON once)"""
+    with open(json_filename, 'r', encoding=encoding) as file:
+        dump_snapshot(json.load(file), snapshot_filename)
+
+
+def snapshot_to_json(snapshot_filename, json_filename, indent=4, encoding='utf-8'):
+    """Write a snapshot back out as a JSON file"""
+    with load_snapshot(snapshot_filename) as snapshot:
+        data = snapshot.decode()
+    with open(json_filename, 'w', encoding=encoding) as file:
+        json.dump(data, file, indent=indent)
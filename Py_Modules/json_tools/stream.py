@@ -0,0 +1,327 @@
+"""
+Streaming JSON Parser for Large Arrays
+======================================
+
+json.load() reads the WHOLE document and builds every object before you
+get to see the first one. For a multi-GB top-level array (question banks,
+exported records) that means waiting for the full read and holding all of
+it in memory at once.
+
+iter_items() walks the document as a stream instead:
+1. Data is read in chunks (64 KB by default) from a file, socket or any
+   iterable of bytes/str chunks
+2. Only the containers ON THE PATH to the wanted elements are tokenized
+3. Each wanted element is decoded on its own with the C-accelerated
+   json decoder (JSONDecoder.raw_decode), then handed to you
+4. Consumed text is dropped from the buffer, so memory stays bounded by
+   the chunk size plus the largest single element
+
+Prefixes (JSONPath-like)
+========================
+Paths are dot-joined keys, with 'item' standing for "every array element":
+
+    [ {...}, {...} ]                    -> 'item'
+    {"users": [ {...}, {...} ]}         -> 'users.item'
+    {"data": {"rows": [[1, 2], ...]}}   -> 'data.rows.item'
+    [ {"tags": ["a", "b"]}, ... ]       -> 'item.tags.item'
+
+parse_events() yields every token as (prefix, event, value), like a SAX
+parser, for documents that do not fit a fixed prefix.
+
+Memory Trick
+============
+json.load  = read everything, build everything, then loop
+iter_items = loop while reading, one element in memory at a time
+"""
+
+import codecs
+import json
+import os
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+_NUMBER_START = frozenset('-0123456789')
+# Longest token that can be cut off at a chunk end and still look invalid
+# (partial 'false', '1e+', '\\u12', ...)
+_INCOMPLETE_MARGIN = 8
+
+
+def _chunk_reader(source, chunk_size):
+    """Return (read() -> str or '', close) for a path, file, socket or iterable of chunks"""
+    close = None
+    if isinstance(source, (str, bytes, os.PathLike)):
+        source = open(source, 'rb')
+        close = source.close
+
+    if hasattr(source, 'recv'):
+        def read_raw():
+            return source.recv(chunk_size)
+    elif hasattr(source, 'read'):
+        def read_raw():
+            return source.read(chunk_size)
+    else:
+        chunks = iter(source)
+
+        def read_raw():
+            return next(chunks, b'')
+
+    # Bytes are decoded incrementally: a UTF-8 character split across two
+    # chunks is completed by the next chunk. utf-8-sig drops a leading BOM.
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    def read():
+        while True:
+            data = read_raw()
+            if isinstance(data, str):
+                return data
+            if not data:
+                return decoder.decode(b'', final=True)
+            text = decoder.decode(data)
+            if text:
+                return text
+
+    return read, close
+
+
+class _Stream:
+    """Text buffer over a chunked source with a read position"""
+
+    def __init__(self, source, chunk_size):
+        self.read, self.close = _chunk_reader(source, chunk_size)
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0  # Characters dropped from the front of the buffer
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, minimum=0):
+        """Read at least one more chunk (and `minimum` characters); False at end of input"""
+        if self.eof:
+            return False
+        parts = []
+        added = 0
+        while added == 0 or added < minimum:
+            data = self.read()
+            if not data:
+                self.eof = True
+                break
+            parts.append(data)
+            added += len(data)
+        if not parts:
+            return False
+        if self.pos > self.chunk_size:
+            # Drop consumed text so the buffer does not grow with the document
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer = ''.join([self.buffer, *parts])
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of input), not consumed"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def error(self, message, pos=None):
+        """JSONDecodeError whose position counts from the start of the stream"""
+        pos = self.pos if pos is None else pos
+        error = json.JSONDecodeError(message, self.buffer, pos)
+        error.pos = self.offset + pos
+        error.add_note(f"at character {error.pos} of the stream")
+        return error
+
+    def expect(self, characters):
+        char = self.peek()
+        if char == '' or char not in characters:
+            found = repr(char) if char else 'end of input'
+            raise self.error(f"Expecting one of {characters!r}, found {found}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the complete JSON value at the current position"""
+        self.peek()
+        while True:
+            buffer, pos = self.buffer, self.pos
+            try:
+                value, end = self.decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as error:
+                incomplete = (len(buffer) - error.pos <= _INCOMPLETE_MARGIN
+                              or error.msg.startswith('Unterminated string'))
+                # The value may just be cut off by the chunk end: read more.
+                # Asking for as much again as the value has so far keeps a
+                # huge element from being re-decoded once per chunk.
+                if incomplete and self.fill(len(buffer) - pos):
+                    continue
+                raise self.error(error.msg, error.pos) from None
+            if (buffer[pos] in _NUMBER_START and len(buffer) - end < _INCOMPLETE_MARGIN
+                    and self.fill()):
+                continue  # '12' or '1.' at the chunk end may continue as '123' or '1.5'
+            self.pos = end
+            return value
+
+
+    def array_items(self):
+        """Yield the elements of the array whose '[' was just consumed"""
+        scan = self.decoder.scan_once
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            # Fast path: one C-level scan_once() + one regex per element, used
+            # while the element and its separator lie well inside the buffer
+            buffer, pos = self.buffer, self.pos
+            try:
+                value, end = scan(buffer, pos)
+                match = _SEPARATOR.match(buffer, end)
+            except (StopIteration, json.JSONDecodeError):
+                match = None
+            if match is not None and match.end() < len(buffer) - _INCOMPLETE_MARGIN:
+                self.pos = match.end()
+                yield value
+                if match.group(1) == ']':
+                    return
+                continue
+
+            # Near the chunk end (or malformed): read more / report the error
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+            self.peek()
+
+
+def _leads_to(path, target):
+    return target[:len(path)] == path
+
+
+def _walk(stream, path, target):
+    """Yield the values at `target` inside the value starting at the stream position"""
+    if path == target:
+        yield stream.value()
+        return
+
+    char = stream.peek()
+    if char == '[':
+        stream.pos += 1
+        child = path + ('item',)
+        if child == target:
+            yield from stream.array_items()
+            return
+        follow = _leads_to(child, target)
+        if stream.peek() == ']':
+            stream.pos += 1
+            return
+        while True:
+            if follow:
+                yield from _walk(stream, child, target)
+            else:
+                stream.value()
+            if stream.expect(',]') == ']':
+                return
+    elif char == '{':
+        stream.pos += 1
+        if stream.peek() == '}':
+            stream.pos += 1
+            return
+        while True:
+            if stream.peek() != '"':
+                stream.expect('"')
+            child = path + (stream.value(),)
+            stream.expect(':')
+            if _leads_to(child, target):
+                yield from _walk(stream, child, target)
+            else:
+                stream.value()  # Not on the way to target: decode and discard
+            if stream.expect(',}') == '}':
+                return
+    else:
+        stream.value()  # A scalar where a container was expected: nothing matches
+
+
+def iter_items(source, prefix='item', chunk_size=CHUNK_SIZE):
+    """
+    Yield the JSON values found at prefix, one at a time
+
+    source: file path, binary/text file object, socket, or iterable of
+    bytes/str chunks. The default prefix 'item' yields the elements of a
+    top-level array.
+    """
+    target = tuple(prefix.split('.')) if prefix else ()
+    stream = _Stream(source, chunk_size)
+    try:
+        yield from _walk(stream, (), target)
+        if stream.peek() != '':
+            raise stream.error("Extra data")
+    finally:
+        if stream.close is not None:
+            stream.close()
+
+
+_SCALAR_EVENTS = {str: 'string', bool: 'boolean', type(None): 'null'}
+
+
+def parse_events(source, chunk_size=CHUNK_SIZE):
+    """
+    Yield (prefix, event, value) for every token of the document
+
+    Events: start_map, map_key, end_map, start_array, end_array, string,
+    number, boolean, null. Container events have value None.
+    """
+    stream = _Stream(source, chunk_size)
+    # Each open container: [path, kind, first_entry_pending]
+    stack = []
+    try:
+        while True:
+            if stack:
+                path, kind, first = stack[-1]
+                closing = ']' if kind == 'array' else '}'
+                if first:
+                    stack[-1][2] = False
+                    if stream.peek() == closing:
+                        stream.pos += 1
+                        stack.pop()
+                        yield '.'.join(path), f"end_{'array' if kind == 'array' else 'map'}", None
+                        continue
+                elif stream.expect(',' + closing) == closing:
+                    stack.pop()
+                    yield '.'.join(path), f"end_{'array' if kind == 'array' else 'map'}", None
+                    continue
+
+                if kind == 'map':
+                    if stream.peek() != '"':
+                        stream.expect('"')
+                    key = stream.value()
+                    stream.expect(':')
+                    yield '.'.join(path), 'map_key', key
+                    value_path = path + (key,)
+                else:
+                    value_path = path + ('item',)
+            else:
+                if stream.peek() == '':
+                    return
+                value_path = ()
+
+            prefix = '.'.join(value_path)
+            char = stream.peek()
+            if char == '[':
+                stream.pos += 1
+                stack.append([value_path, 'array', True])
+                yield prefix, 'start_array', None
+            elif char == '{':
+                stream.pos += 1
+                stack.append([value_path, 'map', True])
+                yield prefix, 'start_map', None
+            else:
+                value = stream.value()
+                yield prefix, _SCALAR_EVENTS.get(type(value), 'number'), value
+    finally:
+        if stream.close is not None:
+            stream.close()
@@ -0,0 +1,326 @@
+"""
+Streaming JSON Encoder
+======================
+
+json.dumps() builds the WHOLE document as one string before you can write
+it: dumping a 1 GB list briefly needs the list AND its 1 GB of text in
+memory. json.dump() writes piece by piece instead, but (from CPython's own
+json module) it then runs the pure-Python encoder and calls write() once
+per token - millions of tiny writes.
+
+dump_stream() keeps the speed of the C encoder and the memory of a stream:
+1. Long lists, tuples and dicts (>= STREAM_LENGTH items) are walked here,
+   element by element
+2. Short elements are collected into batches of ~1000 and each batch is
+   encoded in ONE call to the C encoder
+3. Text is buffered and written in ~1 MB blocks, then dropped
+4. Generators and other iterators become JSON arrays, consumed lazily -
+   the data never has to exist as a list at all
+
+Peak memory = one batch of text + the write buffer, whatever the size of
+the list. (A long list nested deeper than STREAM_DEPTH levels inside short
+containers is not found and gets encoded in one piece.)
+
+Pretty-printing is a separate pass
+==================================
+indent=None (the default) writes compact JSON: no whitespace to produce,
+read or store, and every batch goes through the C encoder. indent=n has
+to use json's pure-Python indenting encoder (as json.dump(indent=n) does),
+so it is several times slower. Keep files compact and pretty-print them
+later, only when a human wants to read one:
+
+    dump_stream(data, file)                         # Fast path for production
+    reformat('data.json', 'pretty.json', indent=4)  # Separate formatting pass
+    dump_stream(data, file, indent=4)               # Both in one go (slower)
+
+reformat() re-spaces JSON text token by token as it streams past; the
+document is never parsed into objects.
+
+Output matches json.dumps(obj, separators=(',', ':')), or
+json.dumps(obj, indent=n) with indent.
+
+Memory Trick
+============
+json.dumps  = build it all, then write it all
+dump_stream = encode a batch, write a block, forget both
+"""
+
+import codecs
+import io
+import json
+import os
+import re
+from collections.abc import Iterator
+from itertools import islice
+from operator import itemgetter
+
+BATCH_ITEMS = 1000
+BUFFER_SIZE = 1024 * 1024
+STREAM_LENGTH = 1000  # Containers at least this long are walked instead of encoded whole
+STREAM_DEPTH = 2  # ... and so is every container in the top levels
+CHUNK_SIZE = 1024 * 1024
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+_CONTAINERS = frozenset((dict, list, tuple))
+
+# Compact or pretty JSON, one token per match. A lone '"' is a string cut
+# off at the end of a chunk: it and everything after it waits for more text.
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s"{}\[\],:]+|[{}\[\],:]|\s+|"')
+
+
+class _Formatter:
+    """Re-spaces JSON text like json.dumps(indent=...), fed chunk by chunk"""
+
+    def __init__(self, indent):
+        # indent=None: every token back to back (compact)
+        self.indent = ' ' * indent if isinstance(indent, int) else indent
+        self.colon = ':' if indent is None else ': '
+        self.depth = 0
+        self.pending = None  # Opening bracket waiting to see if its container is empty
+        self.carry = ''
+        self._newlines = ['\n']
+
+    def newline(self, depth):
+        """'\\n' plus the indentation of depth (cached per depth)"""
+        if self.indent is None:
+            return ''
+        newlines = self._newlines
+        while len(newlines) <= depth:
+            newlines.append('\n' + self.indent * len(newlines))
+        return newlines[depth]
+
+    def feed(self, text, final=False):
+        """Formatted text for the complete tokens seen so far"""
+        text = self.carry + text
+        self.carry = ''
+        out = []
+        append = out.append
+        end = len(text)
+        depth = self.depth
+        pending = self.pending
+        for match in _TOKEN.finditer(text):
+            token = match.group()
+            first = token[0]
+            if not final and (match.end() == end and first not in '{}[],:' or token == '"'):
+                self.carry = text[match.start():]  # Possibly cut off: finish it next time
+                break
+            if first in ' \t\n\r':
+                continue
+            if pending is not None:
+                if first in '}]':
+                    append(pending + token)  # Empty container stays '[]' / '{}'
+                    pending = None
+                    depth -= 1
+                    continue
+                append(pending + self.newline(depth))
+                pending = None
+            if first in '{[':
+                pending = token
+                depth += 1
+            elif first in '}]':
+                depth -= 1
+                append(self.newline(depth) + token)
+            elif first == ',':
+                append(',' + self.newline(depth))
+            elif first == ':':
+                append(self.colon)
+            else:
+                append(token)
+        if final and pending is not None:
+            append(pending)
+            pending = None
+        self.depth = depth
+        self.pending = pending
+        return ''.join(out)
+
+
+class _Writer:
+    """Buffers text and hands it to the file in large blocks"""
+
+    def __init__(self, fp, buffer_size, formatter=None):
+        self.binary = not isinstance(fp, io.TextIOBase)
+        self.fp = fp
+        self.buffer_size = buffer_size
+        self.formatter = formatter
+        self.parts = []
+        self.size = 0
+        self.bytes_written = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self, final=False):
+        text = ''.join(self.parts)
+        self.parts = []
+        self.size = 0
+        if self.formatter is not None:
+            text = self.formatter.feed(text, final)
+        if text:
+            data = text.encode('utf-8') if self.binary else text
+            self.fp.write(data)
+            self.bytes_written += len(data)
+
+
+class _StreamEncoder:
+    """Walks long containers and iterators, hands batches to the C encoder"""
+
+    def __init__(self, writer, indent, sort_keys, ensure_ascii, default,
+                 batch_items, stream_length, stream_depth):
+        self.writer = writer
+        self.sort_keys = sort_keys
+        self.user_default = default
+        self.batch_items = batch_items
+        self.stream_length = stream_length
+        self.stream_depth = stream_depth
+        separators = (',', ':') if indent is None else (',', ': ')
+        self.encode = json.JSONEncoder(ensure_ascii=ensure_ascii, separators=separators,
+                                       sort_keys=sort_keys, indent=indent,
+                                       default=self.default).encode
+        # Pieces encoded on their own are indented as if at the top level;
+        # newline(depth) shifts their lines to where they really are
+        self.newline = _Formatter(indent).newline
+        self.indented = indent is not None
+        self.markers = set()  # ids of the containers being walked (circular check)
+
+    def default(self, value):
+        """Iterators inside batched elements are materialized (they are short)"""
+        if isinstance(value, Iterator):
+            return list(value)
+        if self.user_default is not None:
+            return self.user_default(value)
+        raise TypeError(f'Object of type {value.__class__.__name__} is not JSON serializable')
+
+    def walks(self, value, depth):
+        """True if value is streamed here rather than encoded in one piece"""
+        kind = type(value)
+        if kind in _SCALARS:
+            return False
+        if kind in _CONTAINERS:
+            return depth < self.stream_depth or len(value) >= self.stream_length
+        return isinstance(value, Iterator)
+
+    def shifted(self, text, depth):
+        return text.replace('\n', self.newline(depth)) if self.indented and depth else text
+
+    def value(self, value, depth=0):
+        if not self.walks(value, depth):
+            self.writer.write(self.shifted(self.encode(value), depth))
+            return
+        marker = id(value)
+        if marker in self.markers:
+            raise ValueError("Circular reference detected")
+        self.markers.add(marker)
+        # Elements of a long container are many: only long ones are walked
+        # again. Elements of a short one near the top are walked too, which
+        # finds long lists inside small wrappers like {"users": [...]}.
+        is_long = type(value) not in _CONTAINERS or len(value) >= self.stream_length
+        child_depth = self.stream_depth if is_long else depth + 1
+        if type(value) is dict:
+            items = sorted(value.items(), key=itemgetter(0)) if self.sort_keys else value.items()
+            self.items('{', '}', iter(items), depth, child_depth)
+        else:
+            self.items('[', ']', iter(value), depth, child_depth)
+        self.markers.discard(marker)
+
+    def key(self, key):
+        """JSON text of a dict key, converted the way json.dumps converts it"""
+        if isinstance(key, str):
+            return self.encode(key)
+        if key is True or key is False or key is None or isinstance(key, (int, float)):
+            return '"' + self.encode(key) + '"'
+        raise TypeError(f'keys must be str, int, float, bool or None, not {key.__class__.__name__}')
+
+    def items(self, opening, closing, iterator, depth, child_depth):
+        """Write the elements of one walked container"""
+        write = self.writer.write
+        is_dict = opening == '{'
+        walks = self.walks
+        colon = ':' if not self.indented else ': '
+        item_start = self.newline(depth + 1)  # '' when compact
+        write(opening)
+        separator = ''
+        while True:
+            batch = list(islice(iterator, self.batch_items))
+            if not batch:
+                break
+            # Runs of short elements: one C encoder call for the whole run
+            start = 0
+            for index, item in enumerate(batch):
+                if walks(item[1] if is_dict else item, child_depth):
+                    if index > start:
+                        write(separator + self.run(batch[start:index], is_dict, depth))
+                        separator = ','
+                    write(separator + item_start)
+                    separator = ','
+                    if is_dict:
+                        write(self.key(item[0]) + colon)
+                        self.value(item[1], depth + 1)
+                    else:
+                        self.value(item, depth + 1)
+                    start = index + 1
+            if start < len(batch):
+                write(separator + self.run(batch[start:] if start else batch, is_dict, depth))
+                separator = ','
+        write(self.newline(depth) + closing if separator else closing)
+
+    def run(self, items, is_dict, depth):
+        """Elements (or key/value pairs) without the brackets around them"""
+        text = self.encode(dict(items) if is_dict else items)
+        if not self.indented:
+            return text[1:-1]
+        # '[\n    a,\n    b\n]' -> '\n    a,\n    b', moved to depth + 1
+        return self.shifted(text[1:-2], depth)
+
+
+def dump_stream(obj, fp, indent=None, sort_keys=False, ensure_ascii=True, default=None,
+                batch_items=BATCH_ITEMS, buffer_size=BUFFER_SIZE,
+                stream_length=STREAM_LENGTH, stream_depth=STREAM_DEPTH):
+    """
+    Write obj as JSON to fp (text or binary file, or a path), block by block
+
+    Containers with >= stream_length items, containers in the top
+    stream_depth levels, generators and other iterators are walked; all
+    other values are encoded in batches of batch_items. Returns the number
+    of characters (text file) or bytes written.
+    """
+    if isinstance(fp, (str, os.PathLike)):
+        with open(fp, 'w', encoding='utf-8') as file:
+            return dump_stream(obj, file, indent, sort_keys, ensure_ascii, default,
+                               batch_items, buffer_size, stream_length, stream_depth)
+    writer = _Writer(fp, buffer_size)
+    _StreamEncoder(writer, indent, sort_keys, ensure_ascii, default,
+                   batch_items, stream_length, stream_depth).value(obj)
+    writer.flush(final=True)
+    return writer.bytes_written
+
+
+def reformat(source, destination, indent=4, chunk_size=CHUNK_SIZE):
+    """
+    Stream JSON text from source to destination with new spacing (paths or files)
+
+    indent=None writes it compact; indent=n/'\\t' pretty-prints it. The
+    document is never parsed into objects, so any size works in ~chunk_size
+    of memory.
+    """
+    source_file = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    target = open(destination, 'w', encoding='utf-8') if isinstance(destination, (str, os.PathLike)) else destination
+    # Bytes are decoded incrementally, so a character split between two
+    # chunks is completed by the next one
+    decode = codecs.getincrementaldecoder('utf-8-sig')().decode
+    writer = _Writer(target, 0, _Formatter(indent))
+    try:
+        while True:
+            chunk = source_file.read(chunk_size)
+            final = not chunk
+            writer.write(chunk if isinstance(chunk, str) else decode(chunk, final))
+            writer.flush(final)
+            if final:
+                break
+    finally:
+        if source_file is not source:
+            source_file.close()
+        if target is not destination:
+            target.close()
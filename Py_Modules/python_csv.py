@@ -148,6 +148,7 @@ print()
 
 # Example 2: Working with Dictionary Reader/Writer
 import csv
+from csv_tools import grouped_sum  # Local package next to this file
 
 def write_dict_csv():
     """Demonstrate DictWriter usage"""
@@ -183,13 +184,24 @@ def read_dict_csv():
         for row in reader:
             print(f"Name: {row['name']}, Department: {row['department']}, Salary: ${row['salary']}")
 
+def department_payroll():
+    """Salary and years per department, summed from the binary column cache"""
+    # grouped_sum() parses the department/salary/years columns once into
+    # employees.csv.colcache/; later calls memory-map them instead
+    totals = grouped_sum('employees.csv', 'department', ['salary', 'years'])
+    print("\nPayroll by department:")
+    for department, salary in totals['salary'].items():
+        print(f"  {department}: ${salary:,} ({totals['years'][department]} years of service)")
+
 # Run dictionary example
 write_dict_csv()
 read_dict_csv()
+department_payroll()
 print()
 
 # Example 3: Data Analysis with CSV
 import csv
+from csv_tools import incremental_sales_totals, sales_totals  # Local package next to this file
 
 def create_sales_data():
     """Create sample sales data for analysis"""
@@ -212,29 +224,25 @@ def create_sales_data():
 
     print("Sales data CSV created: sales_data.csv")
 
-def analyze_sales():
-    """Perform basic analysis on sales data"""
-    total_revenue = 0
-    product_sales = {}
-    product_quantities = {}
-    
-    with open('sales_data.csv', 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            # Calculate totals
-            sales = int(row['Total_Sales'])
-            quantity = int(row['Quantity'])
-            product = row['Product']
-            
-            total_revenue += sales
-            
-            # Track by product
-            if product in product_sales:
-                product_sales[product] += sales
-                product_quantities[product] += quantity
-            else:
-                product_sales[product] = sales
-                product_quantities[product] = quantity
+def analyze_sales(filename='sales_data.csv', cache=True, incremental=False):
+    """Perform basic analysis on sales data
+
+    The parsed columns are kept in a binary sidecar directory
+    (sales_data.csv.colcache/), so repeat analyses of an unchanged export
+    skip parsing the text entirely; cache=False always parses the text.
+
+    incremental=True is for append-only exports: the totals and the byte
+    offset reached are saved in sales_data.csv.checkpoint.json, and the
+    next call only reads the rows appended since.
+    """
+    # sales_totals() reads the file in blocks of rows, turns each block into
+    # NumPy column arrays and sums them per product in one vectorized step.
+    # It gives the same totals as a DictReader loop calling int() per row,
+    # but stays fast and memory-bounded on exports with millions of rows.
+    if incremental:
+        total_revenue, product_sales, product_quantities = incremental_sales_totals(filename)
+    else:
+        total_revenue, product_sales, product_quantities = sales_totals(filename, cache=cache)
     
     print(f"\nSales Analysis:")
     print(f"Total Revenue: ${total_revenue:,}")
@@ -246,6 +254,8 @@ def analyze_sales():
     for product, quantity in product_quantities.items():
         print(f"  {product}: {quantity} units")
 
+    return total_revenue, product_sales, product_quantities
+
 # Run sales analysis
 create_sales_data()
 analyze_sales()
@@ -285,10 +295,19 @@ print()
 # Example 5: Error Handling and Validation
 import csv
 import os
+from csv_tools import ColumnRule, validate_csv  # Local package next to this file
 
 def safe_csv_operations():
     """Demonstrate error handling with CSV operations"""
     
+    # Declarative rules per column, checked by csv_tools.validate_csv()
+    schema = {
+        'id': ColumnRule(required=True, type=int, min=1),
+        'name': ColumnRule(required=True),
+        'email': ColumnRule(required=True, pattern=r'[^@\s]+@[^@\s]+\.[a-z]+'),
+        'age': ColumnRule(type=int, min=0, max=130),
+    }
+    
     def read_csv_with_validation(filename):
         """Read CSV file with comprehensive error handling"""
         try:
@@ -302,27 +321,21 @@ def safe_csv_operations():
                 print(f"Error: File '{filename}' is empty!")
                 return None
             
-            data = []
-            with open(filename, 'r') as file:
-                reader = csv.DictReader(file)
-                
-                # Check if file has headers
-                if reader.fieldnames is None:
-                    print(f"Error: File '{filename}' has no headers!")
-                    return None
-                
-                print(f"Successfully opened '{filename}'")
-                print(f"Headers: {reader.fieldnames}")
-                
-                for row_num, row in enumerate(reader, 1):
-                    # Validate row data
-                    if any(value.strip() == '' for value in row.values()):
-                        print(f"Warning: Row {row_num} has empty values")
-                    
-                    data.append(dict(row))
-                    print(f"Row {row_num}: {dict(row)}")
-                
-                return data
+            # One pass over the file: the header check and the validation
+            # of whole column chunks (instead of looping over rows). Problems
+            # are collected as (row, column, reason) codes and summarised,
+            # rather than printed one by one
+            report = validate_csv(filename, schema)
+            
+            # Check if file has headers
+            if not report.header:
+                print(f"Error: File '{filename}' has no headers!")
+                return None
+            
+            print(f"Successfully opened '{filename}'")
+            print(f"Headers: {report.header}")
+            report.print_summary()
+            return report
                 
         except FileNotFoundError:
             print(f"Error: Could not find file '{filename}'")
@@ -363,28 +376,50 @@ print()
 
 # Example 6: Working with Large CSV Files
 import csv
+import time
+import numpy as np
+from csv_tools import BulkCSVWriter, GroupedStats, category_stats, grouped_sum, integer  # Local package next to this file
+
+def process_large_csv(workers=1, rows=1000):
+    """Demonstrate memory-efficient processing of large CSV files
+
+    rows sets the size of the generated dataset (try 1_000_000; for
+    timings of every reader/writer here, run python -m csv_tools).
 
-def process_large_csv():
-    """Demonstrate memory-efficient processing of large CSV files"""
+    workers > 1 splits the file into byte ranges and aggregates them in a
+    process pool (call it from under `if __name__ == "__main__":` on
+    Windows/macOS, because pool workers re-import the calling script).
+    """
     
     # Create a larger sample dataset
     print("Creating large sample dataset...")
-    with open('large_data.csv', 'w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(['ID', 'Name', 'Score', 'Category'])
-        
-        # Generate 1000 rows of sample data
-        for i in range(1, 1001):
-            name = f"Person_{i}"
-            score = (i * 7) % 100  # Generate varied scores
-            category = ['A', 'B', 'C'][i % 3]
-            writer.writerow([i, name, score, category])
+    # Generate the sample rows as whole columns, not row by row:
+    # BulkCSVWriter formats each column in one vectorized step and writes the
+    # block with one write() (same file as writer.writerow() in a loop)
+    ids = np.arange(1, rows + 1)
+    scores = (ids * 7) % 100  # Generate varied scores
+    categories = np.array(['A', 'B', 'C'])[ids % 3]
+    with BulkCSVWriter('large_data.csv', ['ID', 'Name', 'Score', 'Category'],
+                       serializers={'Name': integer(prefix='Person_')}) as writer:
+        writer.write_columns([ids, ids, scores, categories])
     
     print("Large CSV file created: large_data.csv")
     
+    if workers != 1:
+        # Parallel mode: each worker returns a GroupedStats partial result,
+        # the partial results are merged in file order
+        print(f"\nProcessing large file in parallel ({workers or 'all'} workers):")
+        stats = category_stats('large_data.csv', 'Category', 'Score', workers=workers)
+        print(f"\nProcessed {sum(s['count'] for s in stats.values())} total rows")
+        for category, s in stats.items():
+            print(f"Category {category}: {s['count']} items, Average score: {s['mean']:.2f}")
+        return stats
+    
     # Process file efficiently
     print("\nProcessing large file efficiently:")
-    category_stats = {'A': [], 'B': [], 'C': []}
+    # GroupedStats keeps a few running numbers per category instead of a
+    # list of every score, so memory does not grow with the file size
+    stats = GroupedStats()
     row_count = 0
     
     with open('large_data.csv', 'r') as file:
@@ -392,19 +427,25 @@ def process_large_csv():
         
         for row in reader:
             row_count += 1
-            category = row['Category']
-            score = int(row['Score'])
-            category_stats[category].append(score)
+            stats.update(row['Category'], int(row['Score']))
             
-            # Process in batches to show progress
-            if row_count % 100 == 0:
+            # Process in batches to show progress (about 10 progress lines)
+            if row_count % max(100, rows // 10) == 0:
                 print(f"Processed {row_count} rows...")
     
     # Calculate statistics
     print(f"\nProcessed {row_count} total rows")
-    for category, scores in category_stats.items():
-        avg_score = sum(scores) / len(scores)
-        print(f"Category {category}: {len(scores)} items, Average score: {avg_score:.2f}")
+    for category, s in stats.items():
+        print(f"Category {category}: {s.count} items, Average score: {s.mean:.2f}, "
+              f"Std dev: {s.stdev:.2f}, Median: {s.quantile(0.5):.1f}")
+
+    # Analysing the same file again: grouped_sum() parses Category/Score once
+    # into large_data.csv.colcache/, the repeat call memory-maps the columns
+    for run in ('parse + cache', 'from cache'):
+        started = time.perf_counter()
+        sums = grouped_sum('large_data.csv', 'Category', ['Score'])['Score']
+        print(f"Score sums per category ({run}, {time.perf_counter() - started:.4f}s): {sums}")
+    return stats.as_dict()
 
 # Run large file example
 process_large_csv()
@@ -412,9 +453,10 @@ print()
 
 # Example 7: CSV Sniffer for Format Detection
 import csv
+from csv_tools import detect_dialect  # Local package next to this file
 
 def demonstrate_csv_sniffer():
-    """Show how to use csv.Sniffer to detect CSV format"""
+    """Show how to detect CSV format (a faster, cached alternative to csv.Sniffer)"""
     
     # Create CSV files with different formats
     formats = [
@@ -429,38 +471,55 @@ def demonstrate_csv_sniffer():
             writer = csv.writer(file, delimiter=delimiter)
             writer.writerows(data)
     
-    # Use Sniffer to detect format
-    sniffer = csv.Sniffer()
-    
+    # detect_dialect() samples several regions of each file, scores every
+    # candidate delimiter by how consistently it splits the lines, and caches
+    # the result by (path, size, mtime) - asking again is just an os.stat()
     for filename, expected_delimiter, _ in formats:
         print(f"\nAnalyzing {filename}:")
         
-        with open(filename, 'r') as file:
-            # Read a sample to detect format
-            sample = file.read(1024)
-            file.seek(0)  # Reset file pointer
+        # Detect delimiter
+        try:
+            dialect = detect_dialect(filename)
+            print(f"  Detected delimiter: '{dialect.delimiter}'")
+            print(f"  Expected delimiter: '{expected_delimiter}'")
+            print(f"  Match: {dialect.delimiter == expected_delimiter}")
             
-            # Detect delimiter
-            try:
-                dialect = sniffer.sniff(sample)
-                print(f"  Detected delimiter: '{dialect.delimiter}'")
-                print(f"  Expected delimiter: '{expected_delimiter}'")
-                print(f"  Match: {dialect.delimiter == expected_delimiter}")
-                
-                # Check if file has headers
-                has_header = sniffer.has_header(sample)
-                print(f"  Has headers: {has_header}")
-                
-                # Read file using detected format
+            # Check if file has headers
+            print(f"  Has headers: {dialect.has_header}")
+            
+            # Read file using detected format
+            with open(filename, 'r', newline='') as file:
                 reader = csv.reader(file, dialect)
                 for row in reader:
                     print(f"  Data: {row}")
-                    
-            except csv.Error as e:
-                print(f"  Could not detect format: {e}")
+                
+        except csv.Error as e:
+            print(f"  Could not detect format: {e}")
 
 # Run sniffer example
 demonstrate_csv_sniffer()
+print()
+
+# Example 8: Memory-Mapped Reading (only decode what you use)
+from csv_tools import MappedCSV  # Local package next to this file
+
+def read_mapped_csv():
+    """Scan one column of a CSV through a memory map instead of text-mode open()"""
+    print("Reading large_data.csv through a memory map:")
+    with MappedCSV('large_data.csv') as table:
+        print(f"  Headers: {table.header}")
+        
+        # Row views hold only byte offsets; fields are decoded when indexed
+        first_row = next(iter(table))
+        print(f"  First row name: {first_row['Name']}, score: {first_row['Score']}")
+        
+        # column() hops straight to one field per record - the other
+        # columns are never split or decoded
+        scores = [int(score) for score in table.column('Score')]
+        print(f"  Scanned {len(scores)} scores, highest: {max(scores)}")
+
+# Run memory-mapped example
+read_mapped_csv()
 
 # Clean up created files (optional)
 import os
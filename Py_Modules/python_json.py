@@ -127,6 +127,7 @@ Performance Tips
 
 # Example 1: Basic JSON String Operations
 import json
+from json_tools import compile_encoder  # Local package next to this file
 
 def basic_json_operations():
     """Core JSON string to Python and back"""[1]
@@ -140,10 +141,18 @@ def basic_json_operations():
     python_data = json.loads(json_string)
     print(f"Back to Python: {python_data['name']}")
 
+    # Same-shaped records on a hot path: describe the shape once and let
+    # compile_encoder() generate a serializer that only checks each value's
+    # type instead of dispatching on it - a wrong type raises TypeError
+    # (compact output, like json.dumps(person, separators=(',', ':')))
+    encode_person = compile_encoder({"name": str, "age": int, "skills": [str]})
+    print(f"Compiled: {encode_person(person)}")
+
 basic_json_operations()
 
 # Example 2: JSON File Operations
 import json
+from json_tools import LazyDocument, load_config  # Local package next to this file
 
 def json_file_example():
     """Essential file read/write operations"""[2]
@@ -158,16 +167,25 @@ def json_file_example():
         json.dump(data, file, indent=4)
     
     # Read from file  
-    with open('config.json', 'r') as file:
-        loaded_data = json.load(file)
+    # load_config() does json.load(file) the first time, then returns the
+    # cached (read-only) result until the file's size/mtime/inode change -
+    # configs are read far more often than written, and a repeat read costs
+    # one os.stat() instead of open + read + parse
+    loaded_data = load_config('config.json')
     
     print(f"App: {loaded_data['app_name']}")
     print(f"Theme: {loaded_data['settings']['theme']}")
+    
+    # One field from a HUGE file: LazyDocument maps the file, indexes its
+    # brackets in one numpy pass and decodes only the values you touch
+    with LazyDocument('config.json') as document:
+        print(f"Theme (lazy): {document['settings']['theme']}")
 
 json_file_example()
 
 # Example 3: Error Handling
 import json
+from json_tools import parse_batch  # Local package next to this file
 
 def safe_json_operations():
     """Proper error handling for JSON operations"""[3]
@@ -188,5 +206,105 @@ def safe_json_operations():
     invalid = '{name: "John", age: 30}'  # Missing quotes
     result = safe_parse(invalid)
     print(f"Invalid result: {result}")
+    
+    # Many payloads (e.g. queue messages): parse_batch() keeps going past
+    # bad ones and collects (index, offset, message) rows instead of
+    # printing each failure; one summary at the end
+    messages = [valid, invalid, '[1, 2, 3]', '{"unterminated": '] * 2500
+    batch = parse_batch(messages)
+    batch.print_summary(limit=3)
 
 safe_json_operations()
+
+# Example 4: Streaming Large JSON Arrays
+from json_tools import dump_stream, iter_items  # Local package next to this file
+
+def streaming_json_example():
+    """Write and read a big JSON array one element at a time"""
+    # A question bank like the quiz app's, but with many entries. A generator:
+    # the questions are made one by one while they are written
+    questions = ({"question": f"What is {i} + {i}?", "options": [str(i), str(2 * i), str(3 * i), "0"],
+                  "answer": 2} for i in range(1, 10001))
+    # dump_stream() writes compact JSON in ~1 MB blocks as it goes (no
+    # indent: a machine reads this file) instead of building one big string
+    with open('questions_bank.json', 'w', encoding='utf-8') as file:
+        dump_stream(questions, file)
+    
+    # iter_items() hands out each element as soon as it is parsed; only one
+    # question (plus a 64 KB read buffer) is in memory at any time
+    count = 0
+    for question in iter_items('questions_bank.json'):  # prefix 'item' = top-level array elements
+        count += 1
+    print(f"Streamed {count} questions, last: {question['question']}")
+    
+    # Prefixes reach into nested arrays: 'users.item' = each element of data["users"]
+    for user in iter_items('config.json', 'users.item'):
+        print(f"User from config.json: {user['name']} ({user['tasks']} tasks)")
+
+streaming_json_example()
+
+# Example 5: JSON Lines (one JSON document per line)
+from json_tools import NDJSONWriter, read_ndjson  # Local package next to this file
+
+def json_lines_example():
+    """Append records to a .jsonl file and read them back"""
+    # Append mode: each run adds lines, nothing is rewritten
+    with NDJSONWriter('events.jsonl') as writer:
+        for i in range(1000):
+            writer.write({"event": "login" if i % 2 == 0 else "logout", "user": f"user_{i % 10}"})
+    
+    # workers > 1 decodes chunks in a process pool (use it under
+    # `if __name__ == "__main__":` on Windows/macOS, like python_zipfile.py)
+    logins = sum(1 for record in read_ndjson('events.jsonl', workers=1) if record['event'] == 'login')
+    print(f"Logins recorded in events.jsonl: {logins}")
+
+json_lines_example()
+
+# Example 6: Binary Snapshots (reload without parsing)
+import json
+from json_tools import dump_snapshot, load_snapshot  # Local package next to this file
+
+def snapshot_example():
+    """Save JSON-shaped data once as a snapshot, reopen it instantly"""
+    with open('questions_bank.json', 'r', encoding='utf-8') as file:
+        questions = json.load(file)
+    dump_snapshot(questions, 'questions_bank.snap')
+    
+    # Opening maps the file and reads a small header - nothing is parsed;
+    # indexing follows stored offsets straight to the requested question
+    with load_snapshot('questions_bank.snap') as snapshot:
+        question = snapshot.root[4999]
+        print(f"Snapshot question: {question['question']} options={list(question['options'])}")
+
+snapshot_example()
+
+# Example 7: Sending Only the Changes (JSON Patch)
+import json
+from json_tools import apply_patch, diff  # Local package next to this file
+
+def config_patch_example():
+    """Describe a config change as a patch instead of resending the file"""
+    with open('config.json', 'r') as file:
+        old_config = json.load(file)
+    new_config = json.loads(json.dumps(old_config))  # An independent copy to edit
+    new_config["settings"]["theme"] = "light"
+    new_config["users"].append({"name": "Mia", "tasks": 0})
+    
+    # diff() skips every branch that did not change; the patch lists only
+    # the differences (RFC 6902 operations with JSON Pointer paths)
+    patch = diff(old_config, new_config)
+    print(f"Patch: {json.dumps(patch)}")
+    
+    # The other side replays it; old_config itself is left untouched
+    synced = apply_patch(old_config, patch)
+    print(f"Patched config matches: {synced == new_config}")
+    
+    # Python's == says True == 1 == 1.0; JSON does not, so these are changes too
+    type_changes = [({"x": {"a": 1}}, {"x": {"a": True}}), ([1], [True]), ({"a": 1.0}, {"a": 1}),
+                    ([{"a": 1}, 2.0], [{"a": True}, 2]), ([[True], 1], [[1], 1.0])]
+    for old, new in type_changes:
+        rebuilt = apply_patch(old, diff(old, new))
+        # json.dumps() writes true, 1 and 1.0 differently: compare the text
+        print(f"{json.dumps(old)} -> {json.dumps(new)} rebuilt: {json.dumps(rebuilt) == json.dumps(new)}")
+
+config_patch_example()
@@ -35,6 +35,9 @@ WHEN TO USE SHUTIL INSTEAD:
 
 import zipfile
 import os
+# Local package next to this file
+from zip_tools import (adaptive_directory_to_zip, incremental_zip, parallel_directory_to_zip,
+                       parallel_extract, stream_zip)
 
 # ZIPFILE METHODS AND CONSTANTS EXPLAINED
 # =======================================
@@ -68,6 +71,7 @@ KEY ZIPFILE METHODS:
 - extractall()      : Extracts all files from ZIP to directory
 - extract()         : Extracts single file from ZIP
 - namelist()        : Returns list of all file names in ZIP
+- infolist()        : Returns ZipInfo objects of all files (one pass, no getinfo() per name)
 - getinfo()         : Gets detailed info about specific file in ZIP
 - close()           : Closes ZIP file (auto-done with 'with' statement)
 """
@@ -89,10 +93,31 @@ def create_basic_zip():
     print()
 
 # ESSENTIAL EXAMPLE 2: Directory to ZIP (replaces shutil.make_archive)
-def directory_to_zip(directory_path, zip_filename):
+def directory_to_zip(directory_path, zip_filename, workers=1, incremental=False):
     """
     Archive entire directory with full control
+    workers > 1 (or None = all CPU cores) compresses files in parallel processes
+    incremental=True reuses unchanged members of the previous run (backups)
     """
+    if incremental:
+        # A manifest (size, mtime, content hash per file) remembers the last
+        # run; unchanged files are copied from the old archive still
+        # compressed, only new/changed files are compressed again
+        result = incremental_zip(directory_path, zip_filename, workers)
+        print(f"Directory archived: {zip_filename} ({result['compressed']} compressed, "
+              f"{result['copied']} copied, {result['removed']} removed)")
+        print()
+        return
+
+    if workers != 1:
+        # Each member is compressed on its own, so a process pool can deflate
+        # many files at once; one writer keeps them in sorted order. Call it
+        # under `if __name__ == "__main__":` (the pool re-imports this file)
+        parallel_directory_to_zip(directory_path, zip_filename, workers)
+        print(f"Directory archived: {zip_filename} (parallel)")
+        print()
+        return
+
     with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
         r"""
         os.walk() EXPLANATION:
@@ -158,12 +183,11 @@ def read_zip_info(zip_filename):
     # 'r' mode opens ZIP for reading only
     with zipfile.ZipFile(zip_filename, 'r') as zipf:
         print(f"Contents of {zip_filename}:")
-        # zipf.namelist() returns list of all file names in ZIP
-        for filename in zipf.namelist():
-            # zipf.getinfo() returns ZipInfo object with file details
-            file_info = zipf.getinfo(filename)
+        # zipf.infolist() returns a ZipInfo object (file details) per file,
+        # all from one pass over the central directory - no getinfo() per name
+        for file_info in zipf.infolist():
             # file_info.file_size = original uncompressed size
-            print(f"  {filename} - {file_info.file_size} bytes")
+            print(f"  {file_info.filename} - {file_info.file_size} bytes")
             print()
 
 # ESSENTIAL EXAMPLE 5: Compression Levels
@@ -186,11 +210,25 @@ def create_zip_with_compression_control():
     print()
 
 # ESSENTIAL EXAMPLE 6: Extracting ZIP Files
-def extract_zip(zip_filename, extract_path):
+def extract_zip(zip_filename, extract_path, pattern=None, workers=1):
     """
     Extract ZIP with basic control - completes the read/write cycle
     Essential for any compression application
+    pattern ('*.txt', list of globs or a function(ZipInfo)) extracts only matching files
+    workers > 1 (or None = all CPU cores) decompresses files in parallel processes
     """
+    if pattern is not None or workers != 1:
+        # The central directory says where every member starts, so each
+        # worker opens the archive itself and decompresses its own members.
+        # Names like '../../etc/passwd' are refused before anything is written
+        def show_progress(done, total, done_bytes, total_bytes):
+            print(f"Progress: {done}/{total} files, {done_bytes}/{total_bytes} bytes")
+
+        count = parallel_extract(zip_filename, extract_path, pattern, workers, show_progress)
+        print(f"Extracted {count} files from {zip_filename} to {extract_path}")
+        print()
+        return
+
     with zipfile.ZipFile(zip_filename, 'r') as zipf:
         # zipf.extractall() extracts all files to specified directory
         # Preserves directory structure from original ZIP
@@ -219,6 +257,54 @@ def demonstrate_compression_methods():
     with zipfile.ZipFile('lzma.zip', 'w', zipfile.ZIP_LZMA) as zipf:
         zipf.write('test_file.txt')
 
+# BONUS EXAMPLE: Choosing the Method Per File
+def demonstrate_adaptive_compression(directory_path):
+    """
+    One method for every member wastes CPU on files that are already
+    compressed (jpg, zip, mp4): adaptive mode samples each file first and
+    stores those, compressing only what actually shrinks
+    """
+    # goal: 'speed' (deflate 1), 'balanced' (deflate at compresslevel)
+    # or 'size' (also tries BZIP2 and LZMA on the sample)
+    report = adaptive_directory_to_zip(directory_path, 'adaptive_archive.zip',
+                                       goal='balanced', compresslevel=9)
+    # CPU time against bytes saved, per chosen method
+    report.print_summary()
+    print()
+
+# BONUS EXAMPLE: Streaming a ZIP Into a Socket (no file on disk)
+def stream_zip_over_socket(file_list):
+    """
+    zipfile needs a seekable file; stream_zip() writes headers, data and a
+    data descriptor strictly in order, so the archive can go into a pipe or
+    socket while it is being built
+    """
+    import io
+    import socket
+    import threading
+
+    # socketpair() = two connected sockets, like a client and a server
+    sender, receiver = socket.socketpair()
+
+    def send_archive():
+        with sender:
+            stream_zip([(path, os.path.basename(path)) for path in file_list], sender)
+
+    thread = threading.Thread(target=send_archive)
+    thread.start()
+    received = io.BytesIO()
+    with receiver:
+        while True:
+            data = receiver.recv(65536)
+            if not data:  # Sender closed: archive complete
+                break
+            received.write(data)
+    thread.join()
+
+    with zipfile.ZipFile(received) as zipf:
+        print(f"Received {received.tell()} bytes over a socket: {zipf.namelist()}")
+    print()
+
 # ZIPFILE vs SHUTIL COMPARISON
 # =============================
 
@@ -304,20 +390,35 @@ if __name__ == "__main__":
     
     # Directory archiving
     directory_to_zip('test_files', 'folder_archive.zip')
+    directory_to_zip('test_files', 'parallel_archive.zip', workers=None)
+    directory_to_zip('test_files', 'backup_archive.zip', incremental=True)  # Run twice: all copied
     
     # Progress tracking
     file_list = ['test_files/sample1.txt', 'test_files/sample2.txt']
     create_zip_with_progress(file_list, 'progress_example.zip')
     
+    # Method picked per file - in a folder of its own, so test_files stays
+    # exactly what the other examples archive and extract
+    os.makedirs('adaptive_files', exist_ok=True)
+    with open('adaptive_files/notes.txt', 'w') as f:
+        f.write('Plain text compresses well. ' * 2000)
+    with open('adaptive_files/photo.jpg', 'wb') as f:
+        f.write(os.urandom(100_000))  # Random bytes look like compressed data
+    demonstrate_adaptive_compression('adaptive_files')
+    
+    # Streaming straight into a socket
+    stream_zip_over_socket(file_list)
+    
     # Read ZIP contents
     read_zip_info('folder_archive.zip')
     
     # Extract ZIP files
     os.makedirs('extracted_folder', exist_ok=True)
     extract_zip('folder_archive.zip', 'extracted_folder')
+    extract_zip('parallel_archive.zip', 'extracted_text', pattern='*.txt', workers=None)
     
-    print("\nFiles created: my_archive.zip, folder_archive.zip, progress_example.zip")
-    print("Extraction completed to: extracted_folder/")
+    print("\nFiles created: my_archive.zip, folder_archive.zip, parallel_archive.zip, adaptive_archive.zip, backup_archive.zip, progress_example.zip")
+    print("Extraction completed to: extracted_folder/, extracted_text/")
 
 """
 SUMMARY FOR YOUR GUI COMPRESSOR:
@@ -0,0 +1,12 @@
+"""
+Tests for the local packages (csv_tools, json_tools, zip_tools) and question_bank.py
+
+Run from the repository root:  python -m pytest Py_Modules/tests
+The packages are imported the way the example scripts import them: as
+top-level modules from Py_Modules/.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+import csv
+
+import pytest
+
+from csv_tools import compare, generate_csv, run_benchmarks
+from csv_tools.benchmark import BASE_COLUMNS, SCENARIOS
+
+
+def read(path, delimiter=','):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file, delimiter=delimiter))
+
+
+def test_generate_csv_is_deterministic_and_parses(tmp_path):
+    first, second, other = (str(tmp_path / name) for name in ('a.csv', 'b.csv', 'c.csv'))
+    size = generate_csv(first, 1000, seed=3, quote_rate=0.2, newline_rate=0.2, unicode_rate=0.2)
+    generate_csv(second, 1000, seed=3, quote_rate=0.2, newline_rate=0.2, unicode_rate=0.2)
+    generate_csv(other, 1000, seed=4, quote_rate=0.2, newline_rate=0.2, unicode_rate=0.2)
+    with open(first, 'rb') as file:
+        data = file.read()
+    assert len(data) == size
+    with open(second, 'rb') as file:
+        assert file.read() == data
+    with open(other, 'rb') as file:
+        assert file.read() != data
+
+    rows = read(first)
+    assert rows[0] == BASE_COLUMNS and len(rows) == 1001
+    assert [row[0] for row in rows[1:]] == [str(index) for index in range(1, 1001)]
+    notes = {row[-1] for row in rows[1:]}
+    assert {'line one\nline two', 'said "call me"', 'late, call back', 'café ☕ naïve'} <= notes
+    assert all(int(row[8]) == int(row[6]) * int(row[7]) for row in rows[1:])
+
+
+def test_wide_and_semicolon_shapes(tmp_path):
+    wide = str(tmp_path / 'wide.csv')
+    generate_csv(wide, 10, shape='wide', extra_columns=5)
+    rows = read(wide)
+    assert rows[0][-5:] == [f"Metric_{n}" for n in range(1, 6)]
+    assert all(len(row) == 15 and len(row[-1].split('.')[1]) == 3 for row in rows[1:])
+
+    semicolon = str(tmp_path / 'semicolon.csv')
+    generate_csv(semicolon, 10, delimiter=';')
+    assert len(read(semicolon, ';')[0]) == len(BASE_COLUMNS)
+
+    with pytest.raises(ValueError):
+        generate_csv(wide, 10, shape='square')
+    with pytest.raises(ValueError):
+        generate_csv(wide, 10, quote_rate=0.5, newline_rate=0.5)
+
+
+def test_run_and_compare(tmp_path, capsys):
+    output = str(tmp_path / 'results.json')
+    report = run_benchmarks(rows=500, scenarios=['read_basic_csv', 'write_bulk_csv'], repeat=1,
+                            workdir=str(tmp_path), output=output)
+    assert set(report['results']) == {'read_basic_csv', 'write_bulk_csv'}
+    assert report['results']['read_basic_csv']['rows'] == 500
+    assert all(result['seconds'] > 0 for result in report['results'].values())
+
+    changes = compare(output, report)
+    assert changes == {'read_basic_csv': 0.0, 'write_bulk_csv': 0.0}
+    assert 'REGRESSION' not in capsys.readouterr().out
+
+    with pytest.raises(KeyError):
+        run_benchmarks(rows=10, scenarios=['no_such_scenario'])
+    assert 'analyze_sales' in SCENARIOS
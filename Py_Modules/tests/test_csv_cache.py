@@ -0,0 +1,64 @@
+import csv
+import os
+
+import numpy as np
+
+from csv_tools import grouped_sum, load_columns, sales_totals
+from csv_tools.cache import cache_dir, clear_cache, iter_cached_chunks
+from csv_tools.columnar import dictreader_sales_totals
+
+
+def write_sales(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Date', 'Product', 'Quantity', 'Unit_Price', 'Total_Sales'])
+        writer.writerows(['2025-01-01', product, quantity, 1, quantity] for product, quantity in rows)
+
+
+def test_mixed_raw_and_quoted_non_ascii_keys(tmp_path):
+    # Small blocks: the 'Café' blocks are split as raw bytes, the blocks with
+    # a quoted 'Tea, green' go through csv.reader and come back as str
+    path = str(tmp_path / 'sales.csv')
+    write_sales(path, [('Café', 2)] * 20 + [('Tea, green', 3)] * 20 + [('Café', 1)] * 5)
+    expected = dictreader_sales_totals(path)
+
+    assert sales_totals(path, block_bytes=64, cache=False) == expected
+    assert sales_totals(path, block_bytes=64, cache=True) == expected  # Builds the cache
+    assert sales_totals(path, block_bytes=64, cache=True) == expected  # Reads it
+    assert load_columns(path, ['Product'], decode=False)['Product'].dtype.kind == 'S'
+
+
+def test_cache_matches_parsing_and_is_rebuilt_when_stale(tmp_path):
+    path = str(tmp_path / 'sales.csv')
+    write_sales(path, [('Laptop', 5), ('Phone', 10)])
+    first = load_columns(path, ['Product', 'Quantity'], {'Quantity': np.int64})
+    assert first['Product'].tolist() == ['Laptop', 'Phone']
+    assert isinstance(first['Quantity'], np.memmap)
+
+    write_sales(path, [('Laptop', 5), ('Phone', 10), ('Tablet', 7)])
+    again = load_columns(path, ['Product', 'Quantity'], {'Quantity': np.int64})
+    assert again['Quantity'].tolist() == [5, 10, 7]
+    clear_cache(path)
+    assert not os.path.exists(cache_dir(path))
+
+
+def test_cached_chunks_are_bounded_blocks(tmp_path):
+    path = str(tmp_path / 'sales.csv')
+    write_sales(path, [(f'P{index % 7}', index) for index in range(1000)])
+    chunks = list(iter_cached_chunks(path, ['Product', 'Quantity'], {'Quantity': np.int64},
+                                     decode=False, block_bytes=256))
+    assert len(chunks) > 1
+    assert max(len(chunk['Quantity']) for chunk in chunks) <= 256
+    assert np.concatenate([chunk['Quantity'] for chunk in chunks]).tolist() == list(range(1000))
+    assert grouped_sum(path, 'Product', ['Quantity'], block_bytes=256) == \
+        grouped_sum(path, 'Product', ['Quantity'], block_bytes=256, cache=False)
+
+
+def test_cache_files_get_the_umask_mode(tmp_path):
+    path = str(tmp_path / 'sales.csv')
+    write_sales(path, [('Laptop', 5)])
+    load_columns(path, ['Product'])
+    umask = os.umask(0)
+    os.umask(umask)
+    for name in os.listdir(cache_dir(path)):
+        assert os.stat(os.path.join(cache_dir(path), name)).st_mode & 0o777 == 0o666 & ~umask
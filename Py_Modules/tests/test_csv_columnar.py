@@ -0,0 +1,43 @@
+import csv
+
+import numpy as np
+import pytest
+
+from csv_tools import grouped_sum, iter_column_chunks, sales_totals
+from csv_tools.columnar import convert_column, dictreader_sales_totals, write_sample_sales
+
+
+def test_sales_totals_match_dictreader(tmp_path):
+    path = str(tmp_path / 'sales.csv')
+    write_sample_sales(path, 5000)
+    expected = dictreader_sales_totals(path)
+    assert sales_totals(path, block_bytes=4096, cache=False) == expected
+    assert sales_totals(path, block_bytes=4096) == expected
+
+
+def test_quoted_blocks_and_ragged_rows_match_csv_reader(tmp_path):
+    path = str(tmp_path / 'quoted.csv')
+    rows = [['key', 'value', 'note']]
+    rows += [[f'k{i % 4}', str(i), 'line\nbreak, "quoted"' if i % 50 == 0 else 'plain'] for i in range(500)]
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows(rows)
+    chunks = list(iter_column_chunks(path, ['key', 'note'], block_bytes=256))
+    assert [note for chunk in chunks for note in chunk['note'].tolist()] == [row[2] for row in rows[1:]]
+
+    expected = {}
+    for key, value, _ in rows[1:]:
+        expected[key] = expected.get(key, 0) + int(value)
+    assert grouped_sum(path, 'key', ['value'], block_bytes=256, cache=False) == {'value': expected}
+
+
+def test_convert_column_is_exact_or_raises():
+    values = np.array([b'0', b'7', b'123456789012345678', b'42'])
+    assert convert_column(values, np.int64).tolist() == [0, 7, 123456789012345678, 42]
+    # 19 digits still fit int64 and must come out exact, not wrapped
+    assert convert_column(np.array([b'9223372036854775807', b'1']), np.int64).tolist() == \
+        [9223372036854775807, 1]
+    with pytest.raises(OverflowError):
+        convert_column(np.array([b'99999999999999999999', b'1']), np.int64)
+    with pytest.raises(OverflowError):
+        convert_column(np.array([b'300', b'1']), np.uint8)
+    assert convert_column(np.array([b'99', b'5']), np.uint8).tolist() == [99, 5]
@@ -0,0 +1,70 @@
+import csv
+import os
+import random
+
+import pytest
+
+from csv_tools import detect_dialect, detect_directory
+from csv_tools.dialect import _cache, clear_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def write_table(path, delimiter, quotechar, lineterminator='\r\n', rows=300, header=True):
+    rng = random.Random(1)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file, delimiter=delimiter, quotechar=quotechar, lineterminator=lineterminator)
+        if header:
+            writer.writerow(['id', 'name', 'city', 'score'])
+        for index in range(rows):
+            # Names hold the delimiter and other candidates, so they get quoted
+            writer.writerow([index, rng.choice([f'Smith{delimiter} J.', 'Doe; A', 'Lee, B']),
+                             rng.choice(['Paris', 'Rome: IT', 'Oslo']), round(rng.random() * 100, 2)])
+
+
+@pytest.mark.parametrize('delimiter, quotechar', [
+    (',', '"'), (';', '"'), ('\t', '"'), ('|', "'"), (':', '"'),
+])
+def test_detects_what_csv_writer_wrote(tmp_path, delimiter, quotechar):
+    path = str(tmp_path / 'data.csv')
+    write_table(path, delimiter, quotechar)
+    dialect = detect_dialect(path)
+    assert (dialect.delimiter, dialect.quotechar, dialect.has_header) == (delimiter, quotechar, True)
+    assert dialect.lineterminator == '\r\n'
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file, dialect))
+    assert {len(row) for row in rows} == {4}
+
+
+def test_header_and_line_terminator(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_table(path, ',', '"', lineterminator='\n', header=False)
+    dialect = detect_dialect(path)
+    assert dialect.has_header is False and dialect.lineterminator == '\n'
+
+
+def test_cache_is_keyed_by_size_and_mtime(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_table(path, ',', '"')
+    first = detect_dialect(path)
+    assert detect_dialect(path) is first and len(_cache) == 1
+
+    write_table(path, ';', '"', rows=301)
+    os.utime(path, ns=(1, 1))
+    assert detect_dialect(path).delimiter == ';'
+
+
+def test_undetectable_files(tmp_path):
+    empty = str(tmp_path / 'empty.csv')
+    open(empty, 'w').close()
+    with pytest.raises(csv.Error):
+        detect_dialect(empty)
+    write_table(str(tmp_path / 'good.csv'), ',', '"')
+    results = detect_directory(str(tmp_path))
+    assert results[empty] is None
+    assert results[str(tmp_path / 'good.csv')].delimiter == ','
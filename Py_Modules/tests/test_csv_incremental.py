@@ -0,0 +1,65 @@
+import csv
+import io
+import os
+
+from csv_tools import incremental_grouped_sum, incremental_sales_totals
+from csv_tools.columnar import dictreader_sales_totals
+
+HEADER = 'Date,Product,Quantity,Unit_Price,Total_Sales\r\n'
+
+
+def rows_text(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(['2025-01-01', product, quantity, 2, quantity * 2]
+                                 for product, quantity in rows)
+    return buffer.getvalue()
+
+
+def append(path, text):
+    with open(path, 'a', newline='', encoding='utf-8') as file:
+        file.write(text)
+
+
+def test_appends_are_read_once_and_partial_lines_wait(tmp_path):
+    path = str(tmp_path / 'sales.csv')
+    complete = str(tmp_path / 'complete.csv')  # What DictReader should see so far
+    first = HEADER + rows_text([('Laptop', 1), ('Desk, "oak"', 2), ('Café', 3)] * 50)
+    append(path, first)
+    append(complete, first)
+    assert incremental_sales_totals(path, block_bytes=128) == dictreader_sales_totals(complete)
+
+    more = rows_text([('Phone', 4), ('Lamp\nLED', 5)] * 20)
+    append(path, more)
+    append(complete, more)
+    totals, bytes_read = incremental_grouped_sum(path, 'Product', ['Total_Sales', 'Quantity'], block_bytes=128)
+    assert bytes_read == len(more.encode('utf-8'))
+    assert totals['Quantity'] == dictreader_sales_totals(complete)[2]
+
+    append(path, '2025-01-02,"Phone\nhalf')  # A writer is still in the middle of this record
+    assert incremental_sales_totals(path) == dictreader_sales_totals(complete)
+    append(path, ' done",6,2,12\r\n')
+    append(complete, '2025-01-02,"Phone\nhalf done",6,2,12\r\n')
+    assert incremental_sales_totals(path) == dictreader_sales_totals(complete)
+
+
+def test_rewritten_or_truncated_file_is_rescanned(tmp_path):
+    path = str(tmp_path / 'sales.csv')
+    append(path, HEADER + rows_text([('Laptop', 1)] * 10))
+    incremental_sales_totals(path)
+
+    with open(path, 'w', newline='', encoding='utf-8') as file:  # Same size, other content
+        file.write(HEADER + rows_text([('Tablet', 1)] * 10))
+    assert incremental_sales_totals(path) == dictreader_sales_totals(path)
+
+    with open(path, 'w', newline='', encoding='utf-8') as file:  # Shorter
+        file.write(HEADER + rows_text([('Tablet', 9)]))
+    assert incremental_sales_totals(path) == dictreader_sales_totals(path)
+
+
+def test_other_columns_use_their_own_state(tmp_path):
+    path = str(tmp_path / 'sales.csv')
+    append(path, HEADER + rows_text([('Laptop', 3), ('Phone', 4)]))
+    incremental_sales_totals(path)
+    totals, bytes_read = incremental_grouped_sum(path, 'Product', ['Quantity'])
+    assert totals == {'Quantity': {'Laptop': 3, 'Phone': 4}}
+    assert bytes_read == os.path.getsize(path) - len(HEADER)
@@ -0,0 +1,61 @@
+import csv
+
+import pytest
+
+from csv_tools import MappedCSV
+
+ROWS = [
+    ['1', 'Alice', '95.5', 'plain'],
+    ['2', 'Bob, Jr.', '88', 'said "hi"'],
+    ['3', 'Zoë', '', 'two\nlines'],
+    ['4', '', '70', ''],
+]
+
+
+@pytest.fixture(params=['\r\n', '\n'])
+def sample(tmp_path, request):
+    path = str(tmp_path / 'scores.csv')
+    with open(path, 'w', newline='', encoding='utf-8-sig') as file:  # With a BOM, like Excel
+        writer = csv.writer(file, lineterminator=request.param)
+        writer.writerow(['ID', 'Name', 'Score', 'Note'])
+        writer.writerows(ROWS)
+    return path
+
+
+def test_rows_match_csv_reader(sample):
+    with open(sample, newline='', encoding='utf-8-sig') as file:
+        expected = list(csv.reader(file))
+    with MappedCSV(sample) as table:
+        assert table.header == expected[0]
+        assert [row.tolist() for row in table] == expected[1:]
+        assert [row['Note'] for row in table] == [row[3] for row in expected[1:]]
+        assert [len(row) for row in table] == [4] * len(ROWS)
+
+
+def test_column_fast_and_quoted_paths(sample):
+    with MappedCSV(sample) as table:
+        assert list(table.column('Name')) == [row[1] for row in ROWS]
+        assert list(table.column(2)) == [row[2] for row in ROWS]
+        assert [bytes(raw) for raw in table.column('ID', decode=False)] == [b'1', b'2', b'3', b'4']
+        assert bytes(next(iter(table)).raw(1)) == b'Alice'
+
+
+def test_errors(sample):
+    with MappedCSV(sample) as table:
+        with pytest.raises(KeyError):
+            table.column_index('Missing')
+        with pytest.raises(IndexError):
+            next(iter(table))[9]
+
+
+def test_empty_file_and_no_header(tmp_path):
+    empty = str(tmp_path / 'empty.csv')
+    open(empty, 'wb').close()
+    with MappedCSV(empty) as table:
+        assert table.header == [] and list(table) == []
+
+    path = str(tmp_path / 'data.csv')
+    with open(path, 'wb') as file:
+        file.write(b'a,b\n\nc,d')  # Blank line skipped, no final newline
+    with MappedCSV(path, has_header=False) as table:
+        assert [row.tolist() for row in table] == [['a', 'b'], ['c', 'd']]
@@ -0,0 +1,59 @@
+import csv
+import random
+import statistics
+
+import pytest
+
+from csv_tools import category_stats, split_ranges
+
+
+def write_sales(path, count, seed=2):
+    rng = random.Random(seed)
+    products = ['Laptop', 'Phone', 'Desk, "oak"', 'Lamp\nLED', 'Café']
+    rows = [(rng.choice(products), rng.randint(-50, 500)) for _ in range(count)]
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Product', 'Quantity'])
+        writer.writerows(rows)
+    return rows
+
+
+def expected_stats(path):
+    groups = {}
+    with open(path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            groups.setdefault(row['Product'], []).append(int(row['Quantity']))
+    return groups
+
+
+@pytest.mark.parametrize('parts', [1, 2, 7, 50])
+def test_ranges_cover_the_body_on_record_boundaries(tmp_path, parts):
+    # Embedded quotes and newlines must never be cut in half
+    path = str(tmp_path / 'sales.csv')
+    rows = write_sales(path, 500)
+    with open(path, 'rb') as file:
+        data = file.read()
+    ranges = split_ranges(path, parts)
+    assert ranges[0][0] == data.index(b'\n') + 1 and ranges[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert len(ranges) <= parts
+    parsed = []
+    for start, end in ranges:
+        parsed += list(csv.reader(data[start:end].decode('utf-8').splitlines(keepends=True)))
+    assert parsed == [[product, str(quantity)] for product, quantity in rows]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_category_stats_match_dictreader(tmp_path, workers):
+    path = str(tmp_path / 'sales.csv')
+    write_sales(path, 3000)
+    result = category_stats(path, 'Product', 'Quantity', workers=workers)
+    groups = expected_stats(path)
+    assert set(result) == set(groups)
+    for product, values in groups.items():
+        stats = result[product]
+        assert (stats['count'], stats['sum'], stats['min'], stats['max']) == \
+            (len(values), sum(values), min(values), max(values))
+        assert stats['mean'] == pytest.approx(statistics.fmean(values))
+        assert stats['variance'] == pytest.approx(statistics.pvariance(values))
+        assert abs(stats['median'] - statistics.median(values)) <= 0.05 * (max(values) - min(values))
@@ -0,0 +1,81 @@
+import math
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+from csv_tools import GroupedStats, RunningStats, TDigest
+
+
+def values(count, seed=4):
+    rng = random.Random(seed)
+    return [rng.gauss(100, 15) for _ in range(count)]
+
+
+def check(stats, data):
+    assert stats.count == len(data)
+    assert stats.total == pytest.approx(math.fsum(data))
+    assert (stats.min, stats.max) == (min(data), max(data))
+    assert stats.mean == pytest.approx(statistics.fmean(data))
+    assert stats.variance == pytest.approx(statistics.pvariance(data))
+    assert stats.stdev == pytest.approx(statistics.pstdev(data))
+
+
+def test_update_update_many_and_merge_agree_with_statistics():
+    data = values(10_000)
+    one_by_one = RunningStats()
+    for value in data:
+        one_by_one.update(value)
+    check(one_by_one, data)
+
+    check(RunningStats().update_many(np.array(data)), data)
+
+    parts = [RunningStats().update_many(np.array(data[start:start + 1234]))
+             for start in range(0, len(data), 1234)]
+    merged = RunningStats()
+    for part in parts:
+        merged.merge(part)
+    check(merged, data)
+
+
+def test_integers_stay_exact():
+    data = [2 ** 53 + 1, 3, -7]
+    stats = RunningStats(quantiles=False).update_many(np.array(data, dtype=np.int64))
+    assert stats.total == sum(data) and isinstance(stats.total, int)
+    assert stats.as_dict().keys() == {'count', 'sum', 'min', 'max', 'mean', 'variance'}
+    with pytest.raises(ValueError):
+        stats.quantile(0.5)
+
+
+def test_empty_accumulator():
+    stats = RunningStats()
+    assert stats.count == 0 and math.isnan(stats.mean) and math.isnan(stats.variance)
+    assert math.isnan(stats.quantile(0.5))
+
+
+@pytest.mark.parametrize('q', [0.01, 0.1, 0.5, 0.9, 0.99])
+def test_tdigest_quantiles_are_close(q):
+    data = values(50_000, seed=9)
+    digest = TDigest()
+    digest.add_many(data[:20_000])
+    other = TDigest()
+    for value in data[20_000:]:
+        other.add(value)
+    digest.merge(other)
+    exact = float(np.quantile(data, q))
+    rank = np.searchsorted(np.sort(data), digest.quantile(q)) / len(data)
+    assert abs(rank - q) < 0.01, (exact, digest.quantile(q))
+    assert len(digest.means) < 500
+
+
+def test_grouped_stats_bytes_keys_and_merge():
+    keys = np.array([b'Caf\xc3\xa9', b'Tea', b'Caf\xc3\xa9', b'Tea', b'Tea'])
+    numbers = np.array([1, 2, 3, 4, 5])
+    grouped = GroupedStats().update_many(keys[:3], numbers[:3])
+    grouped.merge(GroupedStats().update_many(keys[3:], numbers[3:]))
+    grouped.update('Tea', 6)
+    result = grouped.as_dict()
+    assert set(result) == {'Café', 'Tea'}
+    assert (result['Café']['sum'], result['Tea']['sum']) == (4, 17)
+    assert result['Tea']['count'] == 4
@@ -0,0 +1,90 @@
+import csv
+import random
+import re
+
+import pytest
+
+from csv_tools import ColumnRule, validate_csv
+from csv_tools.validation import BAD_TYPE, MISSING, OUT_OF_RANGE, PATTERN_MISMATCH, REASONS
+
+SCHEMA = {
+    'id': ColumnRule(required=True, type=int),
+    'email': ColumnRule(required=True, pattern=r'[^@\s]+@[^@\s]+'),
+    'age': ColumnRule(type=int, min=0, max=130),
+    'score': ColumnRule(type=float, max=100),
+    'name': ColumnRule(pattern=r'[A-Z].*'),
+    'missing': ColumnRule(required=True),
+}
+
+
+def reference_errors(path, schema):
+    """The same rules, one row at a time with csv.DictReader"""
+    errors = []
+    with open(path, newline='', encoding='utf-8') as file:
+        for row_number, row in enumerate(csv.DictReader(file), 1):
+            for name, rule in schema.items():
+                if name not in row:
+                    continue
+                value = row[name].strip()
+                if not value:
+                    if rule.required:
+                        errors.append((row_number, name, REASONS[MISSING]))
+                    continue
+                if rule.type is not str:
+                    if rule.type is int and not re.fullmatch(r'[+-]?\d+', value):
+                        errors.append((row_number, name, REASONS[BAD_TYPE]))
+                        continue
+                    try:
+                        number = float(value)
+                    except ValueError:
+                        errors.append((row_number, name, REASONS[BAD_TYPE]))
+                        continue
+                    if ((rule.min is not None and number < rule.min)
+                            or (rule.max is not None and number > rule.max)):
+                        errors.append((row_number, name, REASONS[OUT_OF_RANGE]))
+                if rule.pattern is not None and not rule.pattern.fullmatch(row[name]):
+                    errors.append((row_number, name, REASONS[PATTERN_MISMATCH]))
+    return errors
+
+
+def write_people(path, count, seed=3):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'name', 'email', 'age', 'score'])
+        for index in range(count):
+            writer.writerow([
+                rng.choice([index, index, f' {index} ', '', 'x1', f'-{index}']),
+                rng.choice(['Alice', 'Émile', 'bob', 'Smith, J.', '']),
+                rng.choice(['a@b.c', 'zoë@x.org', 'no-at', '', 'two @x']),
+                rng.choice(['42', '-1', '131', '7.5', '', 'abc', '99999999999999999999']),
+                rng.choice(['99.5', '100.01', 'nan?', '1e2', '', '-3']),
+            ])
+
+
+@pytest.mark.parametrize('block_bytes', [64, 1 << 20])
+def test_report_matches_row_by_row_validation(tmp_path, block_bytes):
+    # Small blocks mix raw-bytes blocks with quoted blocks parsed by csv.reader
+    path = str(tmp_path / 'people.csv')
+    write_people(path, 400)
+    report = validate_csv(path, SCHEMA, block_bytes=block_bytes)
+    assert list(report.errors()) == reference_errors(path, SCHEMA)
+    assert report.rows_checked == 400
+    assert report.missing_columns == ['missing'] and not report.ok
+    assert report.header == ['id', 'name', 'email', 'age', 'score']
+    assert sum(report.summary().values()) == len(report)
+
+
+def test_clean_file_is_ok(tmp_path):
+    path = str(tmp_path / 'ok.csv')
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows([['id', 'age'], [1, 20], [2, 30]])
+    report = validate_csv(path, {'id': ColumnRule(required=True, type=int), 'age': ColumnRule(type=int)})
+    assert report.ok and len(report) == 0 and report.summary() == {}
+
+
+def test_bad_rules():
+    with pytest.raises(ValueError):
+        ColumnRule(type=bool)
+    with pytest.raises(ValueError):
+        ColumnRule(min=0)
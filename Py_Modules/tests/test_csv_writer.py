@@ -0,0 +1,80 @@
+import csv
+import gzip
+import io
+
+import numpy as np
+
+from csv_tools import BulkCSVWriter, fixed, integer
+
+
+def stdlib_csv(rows, header=None, **fmtparams):
+    out = io.StringIO()
+    writer = csv.writer(out, **fmtparams)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def read_back(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return file.read()
+
+
+def test_write_rows_keeps_python_types_like_csv_writer(tmp_path):
+    rows = [[1, 2.5, True, 'a', None, 10 ** 30],
+            [2, 3, 2, 'b,c', '', 5],
+            [3.0, 4, False, 'say "hi"', 1.5, 6]]
+    path = tmp_path / 'rows.csv'
+    with BulkCSVWriter(str(path)) as writer:
+        writer.write_rows(rows)
+    assert read_back(path) == stdlib_csv(rows)
+
+
+def test_lone_empty_field_is_quoted(tmp_path):
+    rows = [[''], [None], ['x'], ['']]
+    path = tmp_path / 'single.csv'
+    with BulkCSVWriter(str(path), ['value']) as writer:
+        writer.write_rows(rows)
+    assert read_back(path) == stdlib_csv(rows, ['value'])
+    with open(path, newline='') as file:
+        assert len(list(csv.reader(file))) == 5  # No row is lost as a blank line
+
+
+def test_columns_match_csv_writer(tmp_path):
+    count = 2000
+    ids = np.arange(-count // 2, count // 2)
+    scores = np.linspace(-5, 5, count) ** 3
+    names = np.array([f'name {i}, "{i % 3}"\n' if i % 97 == 0 else f'Café {i}' for i in range(count)])
+    path = tmp_path / 'columns.csv'
+    with BulkCSVWriter(str(path), ['ID', 'Score', 'Name', 'Flag']) as writer:
+        writer.write_columns([ids, scores, names, ids % 2 == 0])
+    expected = stdlib_csv(zip(ids.tolist(), scores.tolist(), names.tolist(), (ids % 2 == 0).tolist()),
+                          ['ID', 'Score', 'Name', 'Flag'])
+    assert read_back(path) == expected
+
+
+def test_fixed_matches_percent_format_with_special_values(tmp_path):
+    values = np.array([1.5, np.nan, 2.0, -0.0, 0.005, 1e17, -np.inf, 2.675, -3.14159, 0.125])
+    path = tmp_path / 'fixed.csv'
+    with BulkCSVWriter(str(path), serializers={0: fixed(2)}, lineterminator='\n') as writer:
+        writer.write_columns([values])
+    assert read_back(path).splitlines() == ['%.2f' % value for value in values.tolist()]
+
+    rng = np.random.default_rng(7)
+    values = rng.normal(0, 1000, 20000)
+    for decimals in (0, 3):
+        path = tmp_path / f'fixed{decimals}.csv'
+        with BulkCSVWriter(str(path), serializers={0: fixed(decimals)}, lineterminator='\n') as writer:
+            writer.write_columns([values])
+        assert read_back(path).splitlines() == ['%.*f' % (decimals, value) for value in values.tolist()]
+
+
+def test_integer_prefix_delimiter_and_gzip(tmp_path):
+    path = tmp_path / 'ids.csv.gz'
+    with BulkCSVWriter(str(path), ['Name', 'City'], delimiter=';', compression='gzip',
+                       serializers={'Name': integer(prefix='Person_')}) as writer:
+        writer.write_columns([np.array([1, 22, 333]), np.array(['Oslo', 'A;B', 'Rome'])])
+    with gzip.open(path, 'rt', newline='') as file:
+        assert file.read() == stdlib_csv([['Person_1', 'Oslo'], ['Person_22', 'A;B'],
+                                          ['Person_333', 'Rome']], ['Name', 'City'], delimiter=';')
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from json_tools import parse_batch
+
+GOOD = ['{"a": 1}', b'[1, 2, "x"]', '"zoë"', b'\xe2\x98\x83'.join([b'"', b'"']), '3.5', 'null']
+BAD = ['{"a": 1', b'\xff\xfe', '[1,]', '', 42, '[' * 100_000]
+
+
+def payloads(count):
+    """GOOD and BAD payloads interleaved: every fourth one fails"""
+    return [BAD[index // 4 % len(BAD)] if index % 4 == 3 else GOOD[index % len(GOOD)]
+            for index in range(count)]
+
+
+def expected(payloads):
+    """(values, [(index, offset, message)]) the way plain json.loads sees them"""
+    values, errors = [], []
+    for index, payload in enumerate(payloads):
+        try:
+            values.append(json.loads(payload))
+        except json.JSONDecodeError as error:
+            values.append(None)
+            errors.append((index, error.pos, error.msg))
+        except UnicodeDecodeError as error:
+            values.append(None)
+            errors.append((index, error.start, error.reason))
+        except (TypeError, RecursionError) as error:
+            values.append(None)
+            errors.append((index, -1, str(error)))
+    return values, errors
+
+
+@pytest.mark.parametrize('workers, executor', [(1, 'thread'), (3, 'thread'), (2, 'process')])
+def test_matches_json_loads(workers, executor):
+    data = payloads(250)
+    values, errors = expected(data)
+    result = parse_batch(iter(data), workers=workers, executor=executor, chunk_size=17)
+    assert result.values == values and result.count == 250
+    assert list(result.errors()) == errors
+    assert result.failed.tolist() == [index for index, _, _ in errors] and len(result) == len(errors)
+    assert not result.ok
+    counts = {}
+    for _, _, message in errors:
+        counts[message] = counts.get(message, 0) + 1
+    assert result.summary() == counts
+
+
+def test_stats():
+    data = payloads(40)
+    result = parse_batch(data, chunk_size=7)
+    assert result.total_bytes == sum(len(payload.encode('utf-8') if isinstance(payload, str) else payload)
+                                     for payload in data if not isinstance(payload, int))
+    assert result.seconds > 0 and result.bytes_per_second > 0
+    percentiles = result.latency_percentiles()
+    assert list(percentiles) == [50, 90, 99, 99.9]
+    assert all(value >= 0 for value in percentiles.values())
+    assert parse_batch(data, timing=False).latency_percentiles() == {}
+
+
+def test_all_good_and_empty_batches():
+    result = parse_batch(GOOD)
+    assert result.ok and result.summary() == {} and result.failed.tolist() == []
+    empty = parse_batch([])
+    assert empty.values == [] and empty.ok and empty.bytes_per_second >= 0
+
+
+def test_print_summary(capsys):
+    parse_batch(['[1]', '{', '{']).print_summary(limit=1)
+    out = capsys.readouterr().out
+    assert '1 ok, 2 failed' in out and 'x2' in out
+    assert out.count('Payload ') == 1
+
+
+def test_bad_executor():
+    with pytest.raises(ValueError):
+        parse_batch(GOOD, executor='fiber')
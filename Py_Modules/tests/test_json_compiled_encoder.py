@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from json_tools import compile_encoder
+from json_tools.compiled_encoder import _sample
+
+
+def compact(value, ensure_ascii=True):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=ensure_ascii)
+
+
+SCHEMA = {
+    'name': str, 'age': int, 'score': float, 'active': bool, 'nickname': (str, None),
+    'skills': [str], 'weights': [float], 'tags': [[str]], 'misc': object,
+    'prefs': {'theme': str, 'limits': {'max': (int, None)}},
+    'projects': [{'name': str, 'tasks': int, 'owner': {'id': int}}],
+    'k"e%yé': str,
+}
+RECORD = {
+    'name': 'Zoë "Z" \\ 100%', 'age': 28, 'score': 1.5, 'active': False, 'nickname': None,
+    'skills': ['Python', 'SQL\n'], 'weights': [0.1, float('nan'), float('-inf')], 'tags': [['a'], []],
+    'misc': {'any': [1, None]}, 'prefs': {'theme': 'dark', 'limits': {'max': None}},
+    'projects': [{'name': 'Todo', 'tasks': 5, 'owner': {'id': 1}}, {'name': 'x', 'tasks': 0, 'owner': {'id': 2}}],
+    'k"e%yé': '€', 'extra': 'ignored',
+}
+
+
+@pytest.mark.parametrize('ensure_ascii', [True, False])
+def test_output_matches_json_dumps(ensure_ascii):
+    encoder = compile_encoder(SCHEMA, ensure_ascii=ensure_ascii)
+    expected = dict(RECORD)
+    del expected['extra']
+    assert encoder(RECORD) == compact(expected, ensure_ascii)
+    assert encoder.encode_bytes(RECORD) == compact(expected, ensure_ascii).encode('utf-8')
+
+    buffer = bytearray(b'>')
+    assert encoder.encode_into(buffer, RECORD) == len(buffer) - 1
+    encoder.encode_many_into(buffer, [RECORD, RECORD], b'\n')
+    assert bytes(buffer) == b'>' + compact(expected, ensure_ascii).encode('utf-8') * 2 + b'\n' + \
+        compact(expected, ensure_ascii).encode('utf-8') + b'\n'
+
+
+@pytest.mark.parametrize('fields', [1, 10, 50])
+def test_benchmark_samples_match_compact_json_dumps(fields):
+    schema, record = _sample(fields)
+    assert compile_encoder(schema)(record) == compact(record)
+
+
+@pytest.mark.parametrize('schema, value', [
+    (int, 2.7), (int, True), (float, 1), (bool, 1), (str, 5), ((int, None), 'x'), ([str], [1]),
+])
+def test_values_not_matching_the_schema_raise(schema, value):
+    encoder = compile_encoder({'field': schema})
+    with pytest.raises(TypeError):
+        encoder({'field': value})
+    with pytest.raises(TypeError):
+        encoder.encode_bytes({'field': value})
+
+
+def test_missing_key_and_bad_schemas():
+    with pytest.raises(KeyError):
+        compile_encoder({'a': int, 'b': int})({'a': 1})
+    for schema in ([int], {'a': [int, str]}, {'a': (int, str)}, {1: int}, {'a': set}):
+        with pytest.raises(TypeError):
+            compile_encoder(schema)
+
+
+SMALL_BENCHMARK = """
+import runpy
+from json_tools import compiled_encoder
+full = compiled_encoder.benchmark
+compiled_encoder.benchmark = lambda: full(field_counts=(3,), records=10, repeat=1)
+runpy.run_module('json_tools', run_name='__main__')
+"""
+
+
+def test_benchmark_runs_as_package_main_without_warnings():
+    py_modules = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-W', 'error', '-c', SMALL_BENCHMARK],
+                            cwd=py_modules, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[0].split() == ['fields', 'lists', 'json.dumps', 'compiled',
+                                                     'speed-up', 'batch']
+    assert len(result.stdout.splitlines()) == 3
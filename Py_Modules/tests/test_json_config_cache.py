@@ -0,0 +1,107 @@
+import json
+import os
+import time
+
+import pytest
+
+from json_tools import ConfigCache, config_cache, freeze, load_config, thaw
+
+CONFIG = {'database': {'host': 'localhost', 'ports': [5432, 5433]}, 'debug': True, 'name': 'Zoë'}
+
+
+def write(path, value):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(value, file)
+
+
+def bump_mtime(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_freeze_and_thaw():
+    frozen = freeze(CONFIG)
+    assert thaw(frozen) == CONFIG
+    assert frozen['database']['ports'] == (5432, 5433)
+    with pytest.raises(TypeError):
+        frozen['debug'] = False
+    copy = thaw(frozen)
+    copy['database']['ports'].append(1)
+    assert frozen['database']['ports'] == (5432, 5433)
+
+
+def test_hits_and_reload_on_change(tmp_path):
+    path = str(tmp_path / 'config.json')
+    write(path, CONFIG)
+    cache = ConfigCache()
+    first = cache.get(path)
+    assert thaw(first) == CONFIG
+    assert cache.get(path) is first and (cache.hits, cache.misses) == (1, 1)
+
+    write(path, dict(CONFIG, debug=False))  # Same size: only the mtime tells
+    bump_mtime(path, 5)
+    assert cache.get(path)['debug'] is False and cache.misses == 2
+
+    replacement = str(tmp_path / 'new.json')
+    write(replacement, dict(CONFIG, name='Bob'))
+    os.replace(replacement, path)  # Editor-style save: new inode
+    assert cache.get(path)['name'] == 'Bob'
+
+    cache.invalidate(path)
+    assert path not in cache and len(cache) == 0
+
+
+def test_check_interval_trusts_recent_entries(tmp_path):
+    path = str(tmp_path / 'config.json')
+    write(path, {'a': 1})
+    cache = ConfigCache(check_interval=60)
+    cache.get(path)
+    write(path, {'a': 2})
+    bump_mtime(path, 5)
+    assert cache.get(path) == {'a': 1}  # Within the interval: not re-checked
+    cache.invalidate()
+    assert cache.get(path) == {'a': 2}
+
+
+def test_lru_eviction_by_bytes(tmp_path):
+    paths = []
+    for index in range(3):
+        paths.append(str(tmp_path / f'{index}.json'))
+        write(paths[-1], {'payload': 'x' * 100})
+    size = os.path.getsize(paths[0])
+    cache = ConfigCache(max_bytes=2 * size)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])  # 1 is now the least recently used
+    cache.get(paths[2])
+    assert paths[0] in cache and paths[1] not in cache and paths[2] in cache
+    assert cache.total_bytes == 2 * size
+
+    big = str(tmp_path / 'big.json')
+    write(big, {'payload': 'x' * 1000})
+    assert cache.get(big) == {'payload': 'x' * 1000}
+    assert big not in cache  # Larger than the whole cache: returned, not kept
+
+
+def test_watcher_drops_changed_entries(tmp_path):
+    path = str(tmp_path / 'config.json')
+    write(path, {'a': 1})
+    cache = ConfigCache()
+    cache.get(path)
+    cache.watch(interval=0.01)
+    try:
+        write(path, {'a': 22})
+        deadline = time.monotonic() + 5
+        while path in cache and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get(path) == {'a': 22}
+    finally:
+        cache.stop_watching()
+
+
+def test_process_wide_cache(tmp_path):
+    path = str(tmp_path / 'config.json')
+    write(path, CONFIG)
+    assert load_config(path) is load_config(path)
+    assert path in config_cache()
+    config_cache().invalidate(path)
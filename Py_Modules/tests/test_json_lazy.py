@@ -0,0 +1,66 @@
+import json
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+from json_tools import LazyArray, LazyDocument, LazyObject, load_lazy
+
+DOCUMENT = {
+    'settings': {'theme': 'dark', 'font': {'size': 12, 'family': 'Mono'}},
+    'tricky': ['{not a bracket}', '[', 'quote \\" inside', 'ends with backslash \\', '\\\\"', 'ünï☃'],
+    'matrix': [[1, 2, [3, [4]]], [], [{}], [{'a': [None, True, False]}]],
+    'numbers': [0, -1, 2.5e-10, 12345678901234567890, -0.0],
+    'esc\\"aped key': 'value',
+    'ключ': {'nested': []},
+    'empty': {},
+}
+
+
+def materialize(value):
+    """Lazy containers -> dict/list by walking them (not .decode())"""
+    if isinstance(value, Mapping):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        return [materialize(item) for item in value]
+    return value
+
+
+def count_containers(value):
+    if isinstance(value, (dict, list)):
+        children = value.values() if isinstance(value, dict) else value
+        return 1 + sum(map(count_containers, children))
+    return 0
+
+
+@pytest.mark.parametrize('block_bytes', [1, 3, 16, 1 << 20])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_walking_matches_json_loads(tmp_path, block_bytes, indent):
+    # Tiny blocks cut the quote/backslash scan between every pair of bytes
+    path = tmp_path / 'data.json'
+    path.write_text(json.dumps(DOCUMENT, indent=indent, ensure_ascii=False), encoding='utf-8')
+    with load_lazy(str(path), block_bytes) as document:
+        assert materialize(document.root) == DOCUMENT
+        assert document.decode() == DOCUMENT
+        assert document['settings']['font'].decode() == DOCUMENT['settings']['font']
+        assert isinstance(document['matrix'], LazyArray) and isinstance(document['empty'], LazyObject)
+        assert document['matrix'][0][2][1][0] == 4 and document['matrix'][-1][0]['a'][1] is True
+        assert len(document['tricky']) == 6 and list(document['ключ']) == ['nested']
+        assert document['esc\\"aped key'] == 'value'
+        assert document.containers == count_containers(DOCUMENT)
+
+
+def test_in_memory_sources_and_scalars():
+    assert LazyDocument(b'\xef\xbb\xbf [1, "x"] ').root[1] == 'x'
+    assert LazyDocument(bytearray(b'42')).root == 42
+    assert LazyDocument(b'"text"').root == 'text'
+    document = LazyDocument(b'{"a": 1}')
+    with pytest.raises(KeyError):
+        document['b']
+    with pytest.raises(IndexError):
+        LazyDocument(b'[1]').root[1]
+
+
+@pytest.mark.parametrize('data', [b'{"a": [1, 2}', b'[1, 2', b'"open', b'[1] [2]', b'', b'{"a": 1]'])
+def test_broken_structure_raises(data):
+    with pytest.raises(json.JSONDecodeError):
+        LazyDocument(data)
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from json_tools import NDJSONWriter, read_ndjson
+from json_tools.ndjson import split_lines
+
+RECORDS = [{'event': 'login', 'user': 'zoë', 'id': index, 'note': 'line\nbreak sep' if index % 7 else None}
+           for index in range(500)] + [[1, 2], 'text', 3.5, None, {}]
+
+
+def only_logins(record):
+    """Module-level transform: picklable for the worker processes"""
+    return record['id'] if isinstance(record, dict) and record.get('id', 1) % 2 == 0 else None
+
+
+def write_records(path, records, buffer_size=64):
+    with NDJSONWriter(path, buffer_size=buffer_size) as writer:
+        writer.write_many(records)
+    return writer
+
+
+def test_writer_output_is_one_json_dumps_per_line(tmp_path):
+    path = str(tmp_path / 'events.jsonl')
+    writer = write_records(path, RECORDS)
+    assert writer.records_written == len(RECORDS)
+    with open(path, encoding='utf-8') as file:
+        lines = file.read().split('\n')
+    assert lines[-1] == ''
+    assert [json.loads(line) for line in lines[:-1]] == RECORDS
+    assert lines[1] == json.dumps(RECORDS[1], separators=(',', ':'), ensure_ascii=False)
+
+
+def test_appending_after_a_cut_off_last_line(tmp_path):
+    path = str(tmp_path / 'events.jsonl')
+    with open(path, 'wb') as file:
+        file.write(b'{"a": 1}\n{"b": 2}')  # No final newline
+    write_records(path, [{'c': 3}])
+    assert list(read_ndjson(path)) == [{'a': 1}, {'b': 2}, {'c': 3}]
+
+
+@pytest.mark.parametrize('workers, ordered', [(1, True), (2, True), (2, False)])
+def test_read_matches_json_loads(tmp_path, workers, ordered):
+    path = str(tmp_path / 'events.jsonl')
+    write_records(path, RECORDS)
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('\n   \n')  # Blank lines are skipped
+    records = list(read_ndjson(path, workers=workers, ordered=ordered, chunk_bytes=500))
+    if ordered:
+        assert records == RECORDS
+    else:
+        assert sorted(map(json.dumps, records)) == sorted(map(json.dumps, RECORDS))
+    expected = [record for record in map(only_logins, RECORDS) if record is not None]
+    assert list(read_ndjson(path, workers=workers, transform=only_logins, chunk_bytes=500)) == expected
+
+
+def test_ranges_are_line_aligned(tmp_path):
+    path = str(tmp_path / 'events.jsonl')
+    write_records(path, RECORDS)
+    with open(path, 'rb') as file:
+        data = file.read()
+    ranges = split_lines(path, chunk_bytes=333)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(data[end - 1:end] == b'\n' for _, end in ranges)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+
+def test_broken_line_names_its_offset(tmp_path):
+    path = str(tmp_path / 'events.jsonl')
+    with open(path, 'wb') as file:
+        file.write(b'{"a": 1}\n{"b": \n{"c": 3}\n')
+    with pytest.raises(json.JSONDecodeError) as error:
+        list(read_ndjson(path))
+    assert 'byte 9' in ''.join(error.value.__notes__)
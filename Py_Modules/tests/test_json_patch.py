@@ -0,0 +1,145 @@
+import copy
+import json
+import random
+
+import pytest
+
+from json_tools import PatchError, SubtreeHashes, apply_patch, diff
+
+# (document, patch, expected) from RFC 6902 Appendix A
+RFC_EXAMPLES = [
+    ({'foo': 'bar'}, [{'op': 'add', 'path': '/baz', 'value': 'qux'}], {'baz': 'qux', 'foo': 'bar'}),
+    ({'foo': ['bar', 'baz']}, [{'op': 'add', 'path': '/foo/1', 'value': 'qux'}],
+     {'foo': ['bar', 'qux', 'baz']}),
+    ({'baz': 'qux', 'foo': 'bar'}, [{'op': 'remove', 'path': '/baz'}], {'foo': 'bar'}),
+    ({'foo': ['bar', 'qux', 'baz']}, [{'op': 'remove', 'path': '/foo/1'}], {'foo': ['bar', 'baz']}),
+    ({'baz': 'qux', 'foo': 'bar'}, [{'op': 'replace', 'path': '/baz', 'value': 'boo'}],
+     {'baz': 'boo', 'foo': 'bar'}),
+    ({'foo': {'bar': 'baz', 'waldo': 'fred'}, 'qux': {'corge': 'grault'}},
+     [{'op': 'move', 'from': '/foo/waldo', 'path': '/qux/thud'}],
+     {'foo': {'bar': 'baz'}, 'qux': {'corge': 'grault', 'thud': 'fred'}}),
+    ({'foo': ['all', 'grass', 'cows', 'eat']}, [{'op': 'move', 'from': '/foo/1', 'path': '/foo/3'}],
+     {'foo': ['all', 'cows', 'eat', 'grass']}),
+    ({'baz': 'qux', 'foo': ['a', 2, 'c']},
+     [{'op': 'test', 'path': '/baz', 'value': 'qux'}, {'op': 'test', 'path': '/foo/1', 'value': 2}],
+     {'baz': 'qux', 'foo': ['a', 2, 'c']}),
+    ({'foo': 'bar'}, [{'op': 'add', 'path': '/child', 'value': {'grandchild': {}}}],
+     {'foo': 'bar', 'child': {'grandchild': {}}}),
+    ({'foo': ['bar']}, [{'op': 'add', 'path': '/foo/-', 'value': ['abc', 'def']}],
+     {'foo': ['bar', ['abc', 'def']]}),
+    ({'/': 9, '~1': 10}, [{'op': 'test', 'path': '/~01', 'value': 10}], {'/': 9, '~1': 10}),
+    ({'a': 1}, [{'op': 'copy', 'from': '/a', 'path': '/b'}], {'a': 1, 'b': 1}),
+    ({'a': 1}, [{'op': 'replace', 'path': '', 'value': [1]}], [1]),
+]
+
+RFC_ERRORS = [
+    ({'foo': 'bar'}, [{'op': 'add', 'path': '/baz/bat', 'value': 'qux'}]),
+    ({'baz': 'qux'}, [{'op': 'test', 'path': '/baz', 'value': 'bar'}]),
+    ({'/': 9, '~1': 10}, [{'op': 'test', 'path': '/~01', 'value': '10'}]),
+    ({'foo': 'bar'}, [{'op': 'remove', 'path': '/missing'}]),
+    ({'a': [1]}, [{'op': 'add', 'path': '/a/2', 'value': 0}]),
+    ({'a': [1]}, [{'op': 'replace', 'path': '/a/01', 'value': 0}]),
+    ({'a': {'b': 1}}, [{'op': 'move', 'from': '/a', 'path': '/a/b/c'}]),
+    ({'a': 1}, [{'op': 'test', 'path': '/a', 'value': True}]),  # true != 1 in JSON
+    ({'a': 1}, [{'op': 'frobnicate', 'path': '/a'}]),
+    ({'a': 1}, [{'op': 'add', 'path': 'a', 'value': 1}]),
+    ({'a': 1}, [{'op': 'add', 'path': '/b'}]),
+    ({'a': 1}, [{'path': '/a'}]),
+]
+
+
+def exact(value):
+    """Text that tells true, 1 and 1.0 apart, as JSON does"""
+    return json.dumps(value, sort_keys=True)
+
+
+def random_document(rng, depth=0):
+    kind = rng.randrange(6 if depth < 4 else 3)
+    if kind == 0:
+        return rng.choice([0, 1, 1.0, True, False, None, -2.5])
+    if kind == 1:
+        return rng.choice(['', 'a', 'a/b', 'x~y', 'zoë'])
+    if kind == 2:
+        return rng.randrange(100)
+    if kind in (3, 4):
+        return {rng.choice(['a', 'b', 'c/d', 'e~f', '']): random_document(rng, depth + 1)
+                for _ in range(rng.randrange(5))}
+    return [random_document(rng, depth + 1) for _ in range(rng.randrange(6))]
+
+
+def mutate(rng, value, depth=0):
+    if isinstance(value, dict) and value and rng.random() < 0.8:
+        key = rng.choice(sorted(value))
+        return {**value, key: mutate(rng, value[key], depth + 1)}
+    if isinstance(value, list) and value and rng.random() < 0.8:
+        index = rng.randrange(len(value))
+        change = rng.randrange(3)
+        if change == 0:
+            return value[:index] + value[index + 1:]
+        if change == 1:
+            return value[:index] + [random_document(rng, depth)] + value[index:]
+        return value[:index] + [mutate(rng, value[index], depth + 1)] + value[index + 1:]
+    return random_document(rng, depth)
+
+
+@pytest.mark.parametrize('document, patch, expected', RFC_EXAMPLES)
+def test_rfc_examples(document, patch, expected):
+    before = copy.deepcopy(document)
+    assert exact(apply_patch(document, patch)) == exact(expected)
+    assert exact(document) == exact(before)
+
+
+@pytest.mark.parametrize('document, patch', RFC_ERRORS)
+def test_rfc_errors_leave_the_input_unchanged(document, patch):
+    before = copy.deepcopy(document)
+    with pytest.raises(PatchError):
+        apply_patch(document, [{'op': 'add', 'path': '/first', 'value': 0}] + patch)
+    assert exact(document) == exact(before)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_diff_round_trips(seed):
+    rng = random.Random(seed)
+    source = random_document(rng)
+    target = source
+    for _ in range(rng.randrange(1, 4)):
+        target = mutate(rng, target)
+    hashes = SubtreeHashes()
+    for patch in (diff(source, target), diff(source, target, hashes), diff(source, target, hashes)):
+        # Through JSON text, as a patch travels
+        assert exact(apply_patch(source, json.loads(json.dumps(patch)))) == exact(target)
+    assert diff(source, source) == [] and diff(source, copy.deepcopy(source), hashes) == []
+
+
+@pytest.mark.parametrize('source, target', [
+    ({'a': True}, {'a': 1}), ({'a': 1}, {'a': 1.0}), ([0], [False]), ({'a': [1, True]}, {'a': [1, 1]}),
+    (list(range(3000)), list(range(2999)) + [2999.0]),
+])
+def test_equal_in_python_but_not_in_json(source, target):
+    for hashes in (None, SubtreeHashes()):
+        patch = diff(source, target, hashes)
+        assert patch and exact(apply_patch(source, patch)) == exact(target)
+
+
+def test_list_insert_is_one_add():
+    source = {'users': [{'id': index} for index in range(1000)]}
+    target = {'users': source['users'][:500] + [{'id': -1}] + source['users'][500:]}
+    assert diff(source, target) == [{'op': 'add', 'path': '/users/500', 'value': {'id': -1}}]
+
+
+def test_apply_shares_untouched_branches():
+    document = {'big': list(range(100)), 'settings': {'theme': 'dark'}}
+    patched = apply_patch(document, [{'op': 'replace', 'path': '/settings/theme', 'value': 'light'}])
+    assert patched['big'] is document['big'] and document['settings']['theme'] == 'dark'
+    in_place = apply_patch(document, [{'op': 'remove', 'path': '/big/0'}], in_place=True)
+    assert in_place is document and document['big'][0] == 1
+
+
+def test_subtree_hashes():
+    hashes = SubtreeHashes()
+    a = {'x': [1, 2, {'y': None}], 'z': 'text'}
+    assert hashes.equal(a, {'z': 'text', 'x': [1, 2, {'y': None}]})  # Key order does not matter
+    assert not hashes.equal([1], [True]) and not hashes.equal([1], [1.0]) and not hashes.equal([1], ['1'])
+    assert hashes.digest(a) == hashes.digest(a) and len(hashes) > 0
+    hashes.clear()
+    assert len(hashes) == 0
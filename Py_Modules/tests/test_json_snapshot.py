@@ -0,0 +1,57 @@
+import json
+import os
+import stat
+
+import pytest
+
+from json_tools import dump_snapshot, json_to_snapshot, load_snapshot, snapshot_to_json
+
+DATA = {
+    'name': 'Alice', 'age': 28, 'score': -1.25, 'active': True, 'deleted': False, 'parent': None,
+    'big': 2 ** 70, 'negative_big': -(2 ** 65), 'small': -7, 'unicode': 'Zoë €', 'empty': '',
+    'skills': ['Python', 'SQL', 'Python'], 'nested': {'b': [1, {'c': []}], 'a': {}},
+    'zebra': 1, 'apple': 2,  # Insertion order is kept, not the sorted key order
+}
+
+
+def test_round_trip_matches_json(tmp_path):
+    path = str(tmp_path / 'data.snap')
+    dump_snapshot(DATA, path)
+    with load_snapshot(path) as snapshot:
+        assert snapshot['nested']['b'][1]['c'].decode() == []
+        assert snapshot['skills'][-1] == 'Python'
+        assert list(snapshot.root) == list(DATA)
+        decoded = snapshot.decode()
+    assert decoded == DATA
+    assert json.dumps(decoded) == json.dumps(DATA)
+
+
+def test_missing_key_and_index(tmp_path):
+    path = str(tmp_path / 'data.snap')
+    dump_snapshot(DATA, path)
+    with load_snapshot(path) as snapshot:
+        with pytest.raises(KeyError):
+            snapshot['missing']
+        with pytest.raises(IndexError):
+            snapshot['skills'][3]
+
+
+def test_json_converters(tmp_path):
+    source = str(tmp_path / 'data.json')
+    with open(source, 'w', encoding='utf-8') as file:
+        json.dump(DATA, file)
+    json_to_snapshot(source, str(tmp_path / 'data.snap'))
+    snapshot_to_json(str(tmp_path / 'data.snap'), str(tmp_path / 'back.json'))
+    with open(str(tmp_path / 'back.json'), encoding='utf-8') as file:
+        assert json.load(file) == DATA
+
+
+def test_snapshot_gets_the_umask_mode(tmp_path):
+    path = str(tmp_path / 'data.snap')
+    umask = os.umask(0o022)
+    try:
+        dump_snapshot(DATA, path)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert os.listdir(str(tmp_path)) == ['data.snap']  # No temp file left behind
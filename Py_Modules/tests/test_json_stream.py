@@ -0,0 +1,89 @@
+import io
+import json
+
+import pytest
+
+from json_tools import iter_items, parse_events
+
+DOCUMENT = {
+    'users': [
+        {'name': 'Zoë', 'age': 28, 'tags': ['a', 'b"c'], 'score': -1.5e-3, 'active': True},
+        {'name': 'Bob \\ ☃ 😀', 'age': 12345678901234567890, 'tags': [], 'score': 0,
+         'active': False, 'parent': None},
+        [], {}, 'text', 1.0, False, None,
+    ],
+    'meta': {'count': 2, 'nested': {'rows': [[1, 2], [3, [4, 5]], []]}},
+    'empty': '',
+}
+TEXT = json.dumps(DOCUMENT, indent=2, ensure_ascii=False)
+DATA = TEXT.encode('utf-8')
+
+
+def chunks(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 100_000])
+@pytest.mark.parametrize('prefix, expected', [
+    ('users.item', DOCUMENT['users']),
+    ('users.item.tags.item', ['a', 'b"c']),
+    ('meta.nested.rows.item', DOCUMENT['meta']['nested']['rows']),
+    ('meta.nested.rows.item.item', [1, 2, 3, [4, 5]]),
+    ('meta.count', [2]),
+    ('', [DOCUMENT]),
+    ('missing.item', []),
+])
+def test_items_match_json_loads_for_every_chunk_size(size, prefix, expected):
+    # size 1 and 2 split UTF-8 characters and every token across chunks
+    assert list(iter_items(chunks(DATA, size), prefix)) == expected
+    assert list(iter_items(chunks(TEXT, size), prefix)) == expected
+
+
+def test_sources(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_bytes(b'\xef\xbb\xbf' + json.dumps(list(range(1000))).encode())  # With a BOM
+    assert list(iter_items(str(path), chunk_size=16)) == list(range(1000))
+    assert list(iter_items(path)) == list(range(1000))
+    with open(path, 'rb') as file:
+        assert list(iter_items(file, chunk_size=5)) == list(range(1000))
+    assert list(iter_items(io.StringIO('[1, 2.5, "x"]'))) == [1, 2.5, 'x']
+
+
+def rebuild(events):
+    """json.loads-equivalent value rebuilt from parse_events() output"""
+    stack, key, result = [], None, None
+    for _, event, value in events:
+        if event == 'map_key':
+            key = value
+            continue
+        if event in ('start_map', 'start_array'):
+            value = {} if event == 'start_map' else []
+        if event in ('end_map', 'end_array'):
+            result = stack.pop()
+            continue
+        if stack:
+            container = stack[-1]
+            if isinstance(container, dict):
+                container[key] = value
+            else:
+                container.append(value)
+        else:
+            result = value
+        if event in ('start_map', 'start_array'):
+            stack.append(value)
+    return result
+
+
+@pytest.mark.parametrize('size', [1, 5, 100_000])
+def test_events_rebuild_the_document(size):
+    events = list(parse_events(chunks(DATA, size)))
+    assert rebuild(events) == DOCUMENT
+    assert events[0] == ('', 'start_map', None) and events[-1] == ('', 'end_map', None)
+    assert ('users.item.age', 'number', 28) in events
+    assert ('meta.nested.rows.item', 'start_array', None) in events
+
+
+@pytest.mark.parametrize('text', ['[1, 2', '[1 2]', '{"a" 1}', '[1,]', '[1] x', '[tru]', '{"a": [}'])
+def test_malformed_documents_raise(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_items([text.encode()], 'item'))
@@ -0,0 +1,82 @@
+import io
+import json
+from datetime import date
+
+import pytest
+
+from json_tools import dump_stream, reformat
+
+DOCUMENT = {
+    'users': [{'name': f'user {index}', 'tags': ['a', 'b'] * (index % 3), 'score': index / 7,
+               'active': index % 2 == 0, 'parent': None} for index in range(60)],
+    'nested': {'rows': [[index, [index] * 3, {}] for index in range(40)], 'empty': [], 'none': {}},
+    'text': 'zoë ☃ "quoted" \\ back\nslash 😀',
+    3: 'int key', 1.5: 'float key', True: 'bool key', None: 'null key',
+    'tuple': (1, 2, (3,)),
+    'scalar': 12345678901234567890,
+}
+SETTINGS = [
+    dict(),
+    dict(batch_items=3, stream_length=5, stream_depth=0),
+    dict(batch_items=1, stream_length=1, stream_depth=10, buffer_size=1),
+]
+
+
+def dumps(obj, indent=None, **kwargs):
+    separators = (',', ':') if indent is None else None
+    return json.dumps(obj, indent=indent, separators=separators, **kwargs)
+
+
+@pytest.mark.parametrize('settings', SETTINGS)
+@pytest.mark.parametrize('indent', [None, 2, '\t'])
+@pytest.mark.parametrize('sort_keys, ensure_ascii', [(False, True), (False, False), (True, False)])
+def test_matches_json_dumps(settings, indent, sort_keys, ensure_ascii):
+    document = DOCUMENT if not sort_keys else {str(key): value for key, value in DOCUMENT.items()}
+    text = io.StringIO()
+    written = dump_stream(document, text, indent, sort_keys, ensure_ascii, **settings)
+    expected = dumps(document, indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii)
+    assert text.getvalue() == expected and written == len(expected)
+
+
+@pytest.mark.parametrize('settings', SETTINGS)
+def test_iterators_become_arrays(tmp_path, settings):
+    path = tmp_path / 'out.json'
+    document = {'numbers': (index for index in range(2500)), 'pairs': iter([[1, 2], map(str, range(3))])}
+    dump_stream(document, path, **settings)
+    assert json.loads(path.read_text(encoding='utf-8')) == {
+        'numbers': list(range(2500)), 'pairs': [[1, 2], ['0', '1', '2']]}
+
+
+def test_binary_file_and_default():
+    data = io.BytesIO()
+    written = dump_stream([date(2024, 1, 2), 'ü'], data, ensure_ascii=False, default=date.isoformat)
+    assert data.getvalue() == '["2024-01-02","ü"]'.encode('utf-8') and written == len(data.getvalue())
+    with pytest.raises(TypeError):
+        dump_stream([object()], io.StringIO())
+    with pytest.raises(TypeError):
+        dump_stream({(1, 2): 'tuple key'}, io.StringIO(), stream_depth=1)
+
+
+def test_circular_reference():
+    loop = list(range(2000))
+    loop.append(loop)
+    with pytest.raises(ValueError):
+        dump_stream(loop, io.StringIO())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 1 << 20])
+@pytest.mark.parametrize('indent', [None, 0, 4, '\t'])
+def test_reformat_matches_json_dumps(tmp_path, chunk_size, indent):
+    source = tmp_path / 'in.json'
+    document = {str(key): value for key, value in DOCUMENT.items()}
+    # A BOM and odd spacing; strings with brackets, commas and escaped quotes
+    source.write_bytes(b'\xef\xbb\xbf' + json.dumps(document, indent=3, ensure_ascii=False).encode('utf-8'))
+    target = tmp_path / 'out.json'
+    reformat(str(source), str(target), indent=indent, chunk_size=chunk_size)
+    assert target.read_text(encoding='utf-8') == dumps(document, indent, ensure_ascii=False)
+
+
+def test_reformat_file_objects():
+    output = io.StringIO()
+    reformat(io.StringIO('{ "a" : [ ] , "b" : { } , "c" : [1 , "x,]"] }'), output, indent=None, chunk_size=3)
+    assert output.getvalue() == '{"a":[],"b":{},"c":[1,"x,]"]}'
@@ -0,0 +1,82 @@
+import importlib.util
+import json
+import os
+import random
+
+import pytest
+
+PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'QUESTIONS', 'Basic_Quiz_Program', 'question_bank.py')
+spec = importlib.util.spec_from_file_location('question_bank', PATH)
+question_bank = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(question_bank)
+QuestionBank = question_bank.QuestionBank
+
+QUESTIONS = [{'question': f'Question {index} – ünïcode?', 'answer': str(index),
+              'topic': ['git', 'python', None][index % 3], 'difficulty': ['easy', 'hard'][index % 2]}
+             for index in range(300)] + [{'question': 'No group keys', 'answer': ''}]
+
+
+def write(path, questions):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(questions, file, ensure_ascii=False)
+
+
+@pytest.fixture
+def bank_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(question_bank, 'BATCH_ROWS', 7)
+    path = str(tmp_path / 'bank.json')
+    write(path, QUESTIONS)
+    return path
+
+
+def test_get_matches_the_json_list(bank_path):
+    with QuestionBank(bank_path) as bank:
+        assert len(bank) == len(QUESTIONS)
+        for question_id, question in enumerate(QUESTIONS, 1):
+            assert bank.get(question_id) == dict(question, id=question_id)
+        with pytest.raises(KeyError):
+            bank.get(len(QUESTIONS) + 1)
+        assert bank.topics() == {'git': 100, 'python': 100, '': 101}
+        assert bank.difficulties() == {'easy': 150, 'hard': 150, '': 1}
+        assert bank.count('git', 'easy') == 50 and bank.count() == len(QUESTIONS)
+    assert os.path.exists(os.path.splitext(bank_path)[0] + '.db')
+
+
+@pytest.mark.parametrize('topic, difficulty', [(None, None), ('git', None), (None, 'hard'),
+                                               ('python', 'easy'), ('', None), ('rust', None)])
+def test_sample_respects_the_filter(bank_path, topic, difficulty):
+    random.seed(1)
+    expected = [dict(question, id=question_id) for question_id, question in enumerate(QUESTIONS, 1)
+                if (topic is None or (question.get('topic') or '') == topic)
+                and (difficulty is None or (question.get('difficulty') or '') == difficulty)]
+    with QuestionBank(bank_path) as bank:
+        sample = bank.sample(20, topic, difficulty)
+        assert len(sample) == min(20, len(expected))
+        assert len({question['id'] for question in sample}) == len(sample)
+        assert all(question in expected for question in sample)
+        everything = bank.sample(len(QUESTIONS) * 2, topic, difficulty)
+        assert sorted(everything, key=lambda question: question['id']) == expected
+
+
+def test_rebuilt_when_the_json_changes(bank_path):
+    db_path = os.path.splitext(bank_path)[0] + '.db'
+    QuestionBank(bank_path).close()
+    built = os.stat(db_path).st_mtime_ns
+    QuestionBank(bank_path).close()
+    assert os.stat(db_path).st_mtime_ns == built  # Unchanged JSON: reused
+
+    write(bank_path, QUESTIONS[:5])
+    with QuestionBank(bank_path) as bank:
+        assert len(bank) == 5 and bank.get(5) == dict(QUESTIONS[4], id=5)
+
+    with open(db_path, 'wb') as file:
+        file.write(b'not a database')
+    with QuestionBank(bank_path) as bank:
+        assert len(bank) == 5
+
+
+def test_empty_bank(tmp_path):
+    path = str(tmp_path / 'empty.json')
+    write(path, [])
+    with QuestionBank(path, str(tmp_path / 'other.db')) as bank:
+        assert len(bank) == 0 and bank.sample(3) == [] and bank.sample(3, topic='git') == []
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import tracemalloc
+import zipfile
+
+import pytest
+
+from zip_tools import adaptive, adaptive_zip, choose_method
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    # 4 KB pieces and batches: the large-file paths run on small files (workers=1 reads the globals;
+    # zip_tools.parallel_zip the module is shadowed by the function of that name in the package)
+    monkeypatch.setattr(adaptive, 'BATCH_BYTES', 4096)
+    monkeypatch.setattr(sys.modules['zip_tools.parallel_zip'], 'BATCH_BYTES', 4096)
+
+
+def make_files(directory):
+    rng = random.Random(7)
+    contents = {
+        'text.txt': b''.join(b'line %d of a text file\n' % i for i in range(2000)),
+        'random.bin': rng.randbytes(20000),
+        'small.txt': b'hello ' * 100,
+        'tiny.txt': b'hi',
+        'empty.txt': b'',
+    }
+    files = []
+    for name, data in contents.items():
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        files.append((path, name, len(data)))
+    return files, contents
+
+
+def check_archive(zip_path, contents):
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == sorted(contents)
+        for name, data in contents.items():
+            assert archive.read(name) == data
+        return {info.filename: info.compress_type for info in archive.infolist()}
+
+
+def test_choose_method_stores_random_and_deflates_text():
+    assert choose_method(random.Random(1).randbytes(65536)) == (zipfile.ZIP_STORED, None)
+    assert choose_method(b'abc ' * 10000) == (zipfile.ZIP_DEFLATED, 6)
+    assert choose_method(b'abc ' * 10000, 'speed') == (zipfile.ZIP_DEFLATED, 1)
+    assert choose_method(b'') == (zipfile.ZIP_STORED, None)
+
+
+@pytest.mark.parametrize('goal', ['speed', 'balanced', 'size'])
+def test_large_files_are_split_or_streamed(tmp_path, small_batches, goal):
+    files, contents = make_files(str(tmp_path))
+    zip_path = str(tmp_path / 'out.zip')
+    report = adaptive_zip(files, zip_path, goal=goal)
+    methods = check_archive(zip_path, contents)
+    assert methods['random.bin'] == zipfile.ZIP_STORED
+    assert len(report.rows) == len(contents)
+    assert report.file_size == sum(map(len, contents.values()))
+
+
+def test_large_member_is_not_held_in_memory(tmp_path, small_batches):
+    data = random.Random(3).randbytes(4 * 1024 * 1024)
+    path = str(tmp_path / 'video.mp4')
+    with open(path, 'wb') as file:
+        file.write(data)
+    zip_path = str(tmp_path / 'out.zip')
+    tracemalloc.start()
+    try:
+        adaptive_zip([(path, 'video.mp4', len(data))], zip_path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < len(data) // 2  # The 1 MB write buffer and a few 4 KB pieces
+    check_archive(zip_path, {'video.mp4': data})
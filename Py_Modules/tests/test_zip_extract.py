@@ -0,0 +1,159 @@
+import os
+import random
+import struct
+import tracemalloc
+import zipfile
+
+import pytest
+
+from zip_tools import parallel_extract, select_members
+
+METHODS = [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA]
+CONTENTS = {
+    'docs/readme.md': b'# Title\n' * 1000,
+    'docs/notes.txt': b'notes',
+    'src/app.py': b'print("hi")\n' * 5000,
+    'src/data/random.bin': random.Random(4).randbytes(300_000),
+    'empty.txt': b'',
+    'zoë.txt': 'ünïcode'.encode(),
+}
+
+
+def make_zip(path, method=zipfile.ZIP_DEFLATED, contents=CONTENTS):
+    with zipfile.ZipFile(path, 'w', method) as archive:
+        archive.writestr(zipfile.ZipInfo('docs/'), b'')
+        for name, data in contents.items():
+            archive.writestr(zipfile.ZipInfo(name), data, method)
+    return path
+
+
+def read_tree(root):
+    found = {}
+    for folder, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            with open(path, 'rb') as file:
+                found[os.path.relpath(path, root).replace(os.sep, '/')] = file.read()
+    return found
+
+
+def patch_directory(zip_path, name, **fields):
+    """Overwrite fields of name's central directory entry (what readers trust)"""
+    offsets = {'flags': (8, '<H'), 'crc': (16, '<L'), 'file_size': (24, '<L')}
+    with zipfile.ZipFile(zip_path) as archive:
+        header_offset = archive.getinfo(name).header_offset
+    with open(zip_path, 'r+b') as file:
+        data = file.read()
+        start = data.index(b'PK\x01\x02')
+        while struct.unpack('<L', data[start + 42:start + 46])[0] != header_offset:
+            start = data.index(b'PK\x01\x02', start + 1)
+        for field, value in fields.items():
+            offset, layout = offsets[field]
+            file.seek(start + offset)
+            file.write(struct.pack(layout, value))
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('workers', [1, 2])
+def test_matches_extractall(tmp_path, method, workers):
+    zip_path = make_zip(str(tmp_path / 'in.zip'), method)
+    with zipfile.ZipFile(zip_path) as archive:
+        archive.extractall(str(tmp_path / 'expected'))
+    calls = []
+    count = parallel_extract(zip_path, str(tmp_path / 'out'), workers=workers,
+                             progress=lambda *args: calls.append(args))
+    assert count == len(CONTENTS)
+    assert read_tree(str(tmp_path / 'out')) == read_tree(str(tmp_path / 'expected')) == CONTENTS
+    assert calls[-1] == (len(CONTENTS), len(CONTENTS), sum(map(len, CONTENTS.values())),
+                         sum(map(len, CONTENTS.values())))
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('*.txt', ['docs/notes.txt', 'empty.txt', 'zoë.txt']),
+    (['docs/*', 'src/*.py'], ['docs/', 'docs/readme.md', 'docs/notes.txt', 'src/app.py']),
+    (lambda info: info.file_size > 100_000, ['src/data/random.bin']),
+])
+def test_selection(tmp_path, pattern, expected):
+    zip_path = make_zip(str(tmp_path / 'in.zip'))
+    with zipfile.ZipFile(zip_path) as archive:
+        assert [info.filename for info in select_members(archive.infolist(), pattern)] == expected
+    parallel_extract(zip_path, str(tmp_path / 'out'), pattern, workers=1)
+    assert sorted(read_tree(str(tmp_path / 'out'))) == sorted(name for name in expected if name[-1] != '/')
+
+
+@pytest.mark.parametrize('name', ['../evil.txt', 'docs/../../evil.txt', '/tmp/evil.txt',
+                                  '..\\evil.txt', 'C:/evil.txt', 'C:evil.txt', '\\evil.txt'])
+def test_path_traversal_is_refused_before_anything_is_written(tmp_path, name):
+    zip_path = str(tmp_path / 'in.zip')
+    with zipfile.ZipFile(zip_path, 'w') as archive:
+        archive.writestr('good.txt', b'written first?')
+        archive.writestr(zipfile.ZipInfo(name), b'evil')
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.namelist()[1] == name  # The name reaches the extractor unchanged
+    target = tmp_path / 'a' / 'b'
+    with pytest.raises(ValueError):
+        parallel_extract(zip_path, str(target), workers=1)
+    assert not target.exists()
+    assert not (tmp_path / 'a' / 'evil.txt').exists() and not (tmp_path / 'evil.txt').exists()
+
+
+def test_symlinks_are_not_followed_out(tmp_path):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    (outside / 'victim.txt').write_bytes(b'keep me')
+    root = tmp_path / 'root'
+    root.mkdir()
+    (root / 'link').symlink_to(outside, target_is_directory=True)
+    (root / 'victim.txt').symlink_to(outside / 'victim.txt')
+
+    folder_zip = str(tmp_path / 'folder.zip')
+    with zipfile.ZipFile(folder_zip, 'w') as archive:
+        archive.writestr('link/victim.txt', b'overwritten')
+    with pytest.raises(ValueError):
+        parallel_extract(folder_zip, str(root), workers=1)
+
+    file_zip = str(tmp_path / 'file.zip')
+    with zipfile.ZipFile(file_zip, 'w') as archive:
+        archive.writestr('victim.txt', b'overwritten')
+    with pytest.raises(OSError):
+        parallel_extract(file_zip, str(root), workers=1)
+    assert (outside / 'victim.txt').read_bytes() == b'keep me'
+
+
+@pytest.mark.parametrize('method', [zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA])
+def test_zip_bomb_stops_at_the_recorded_size(tmp_path, method):
+    # 64 MB of zeros compress to a few KB; the directory claims 1000 bytes
+    zip_path = make_zip(str(tmp_path / 'bomb.zip'), method, {'bomb.bin': bytes(64 * 1024 * 1024)})
+    patch_directory(zip_path, 'bomb.bin', file_size=1000)
+    tracemalloc.start()
+    try:
+        with pytest.raises(zipfile.BadZipFile):
+            parallel_extract(zip_path, str(tmp_path / 'out'), workers=1)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # Inflated at most about one block, not 64 MB (plus LZMA's own 8 MB dictionary, fixed per member)
+    dictionary = 8 * 1024 * 1024 if method == zipfile.ZIP_LZMA else 0
+    assert peak < 4 * 1024 * 1024 + dictionary
+    assert not (tmp_path / 'out' / 'bomb.bin').exists()
+
+
+def test_bad_crc_and_short_output_are_removed(tmp_path):
+    zip_path = make_zip(str(tmp_path / 'crc.zip'), contents={'a.txt': b'a' * 5000})
+    patch_directory(zip_path, 'a.txt', crc=0)
+    with pytest.raises(zipfile.BadZipFile):
+        parallel_extract(zip_path, str(tmp_path / 'out'), workers=1)
+    assert not (tmp_path / 'out' / 'a.txt').exists()
+
+    zip_path = make_zip(str(tmp_path / 'short.zip'), contents={'a.txt': b'a' * 5000})
+    patch_directory(zip_path, 'a.txt', file_size=6000)
+    with pytest.raises(zipfile.BadZipFile):
+        parallel_extract(zip_path, str(tmp_path / 'out'), workers=1)
+    assert not (tmp_path / 'out' / 'a.txt').exists()
+
+
+def test_encrypted_members_are_refused(tmp_path):
+    zip_path = make_zip(str(tmp_path / 'locked.zip'), contents={'a.txt': b'secret'})
+    patch_directory(zip_path, 'a.txt', flags=0x01)
+    with pytest.raises(NotImplementedError):
+        parallel_extract(zip_path, str(tmp_path / 'out'), workers=1)
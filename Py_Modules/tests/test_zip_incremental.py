@@ -0,0 +1,88 @@
+import hashlib
+import os
+import random
+import sys
+import zipfile
+
+import pytest
+
+from zip_tools import incremental, incremental_zip
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    # 4 KB pieces and batches: the large-file paths run on small files (workers=1 reads the globals)
+    monkeypatch.setattr(incremental, 'BATCH_BYTES', 4096)
+    monkeypatch.setattr(sys.modules['zip_tools.parallel_zip'], 'BATCH_BYTES', 4096)
+
+
+def write(path, data):
+    with open(path, 'wb') as file:
+        file.write(data)
+
+
+def read_all(zip_path):
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def make_tree(directory):
+    contents = {
+        'a.txt': b'alpha\n' * 100,
+        'sub/b.txt': b'bravo\n' * 3000,
+        'big.bin': random.Random(5).randbytes(10000),
+        'empty.txt': b'',
+    }
+    for name, data in contents.items():
+        os.makedirs(os.path.dirname(os.path.join(directory, name)), exist_ok=True)
+        write(os.path.join(directory, name), data)
+    return contents
+
+
+@pytest.mark.parametrize('method', [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED, zipfile.ZIP_BZIP2])
+def test_runs_copy_unchanged_and_recompress_changed(tmp_path, small_batches, method):
+    source = str(tmp_path / 'src')
+    zip_path = str(tmp_path / 'backup.zip')
+    contents = make_tree(source)
+
+    first = incremental_zip(source, zip_path, method=method)
+    assert first['compressed'] == len(contents) and first['copied'] == 0
+    assert read_all(zip_path) == contents
+
+    again = incremental_zip(source, zip_path, method=method)
+    assert again['compressed'] == 0 and again['copied'] == len(contents)
+    assert read_all(zip_path) == contents
+
+    contents['sub/b.txt'] = b'changed\n' * 2000  # Larger than a piece
+    write(os.path.join(source, 'sub/b.txt'), contents['sub/b.txt'])
+    os.utime(os.path.join(source, 'a.txt'), ns=(0, 0))  # Touched only
+    os.remove(os.path.join(source, 'empty.txt'))
+    del contents['empty.txt']
+    third = incremental_zip(source, zip_path, method=method)
+    assert (third['compressed'], third['copied'], third['removed']) == (1, 2, 1)
+    assert read_all(zip_path) == contents
+
+
+def test_content_hash_is_the_same_for_pieces_and_whole_files(tmp_path, small_batches):
+    for size in (0, 100, 4096, 8192, 10000):
+        data = random.Random(size).randbytes(size)
+        path = str(tmp_path / f'{size}.bin')
+        write(path, data)
+        whole = incremental.ContentHash()
+        whole.update(data)
+        pieces = incremental.ContentHash()
+        pieces.pieces = [hashlib.blake2b(data[start:start + 4096]).digest()
+                         for start in range(0, size, 4096)] or [hashlib.blake2b(b'').digest()]
+        assert incremental.file_hash(path) == whole.hexdigest() == pieces.hexdigest()
+
+
+def test_manifest_of_another_method_means_full_rebuild(tmp_path):
+    source = str(tmp_path / 'src')
+    zip_path = str(tmp_path / 'backup.zip')
+    contents = make_tree(source)
+    incremental_zip(source, zip_path)
+    stored = incremental_zip(source, zip_path, method=zipfile.ZIP_STORED)
+    assert stored['compressed'] == len(contents)
+    with zipfile.ZipFile(zip_path) as archive:
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
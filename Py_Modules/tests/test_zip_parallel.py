@@ -0,0 +1,128 @@
+import os
+import random
+import sys
+import zipfile
+import zlib
+
+import pytest
+
+from zip_tools import parallel_directory_to_zip, parallel_zip, walk_files
+from zip_tools._format import ZIP64_LIMIT
+
+# zip_tools.parallel_zip is the function; the module behind it:
+parallel = sys.modules['zip_tools.parallel_zip']
+METHODS = [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA]
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    # 4 KB pieces/batches and 1 KB blocks: a 20 KB file takes the large-file paths
+    monkeypatch.setattr(parallel, 'BATCH_BYTES', 4096)
+    monkeypatch.setattr(parallel, 'BLOCK_SIZE', 1024)
+
+
+def make_tree(directory):
+    rng = random.Random(11)
+    contents = {
+        'a.txt': b''.join(b'row %d, some repeated text\n' % index for index in range(3000)),
+        'sub/random.bin': rng.randbytes(20000),
+        'sub/deeper/exact.bin': b'x' * 8192,  # Exactly two pieces
+        'sub/empty.txt': b'',
+        'z/zoë.txt': 'ünïcode name'.encode(),
+    }
+    for name, data in contents.items():
+        path = os.path.join(directory, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(data)
+    return contents
+
+
+def test_crc32_combine_matches_zlib():
+    rng = random.Random(5)
+    for _ in range(200):
+        data = rng.randbytes(rng.randrange(0, 3000))
+        cut = rng.randrange(0, len(data) + 1)
+        first, second = data[:cut], data[cut:]
+        assert parallel.crc32_combine(zlib.crc32(first), zlib.crc32(second), len(second)) == zlib.crc32(data)
+
+
+def test_walk_files(tmp_path):
+    contents = make_tree(str(tmp_path))
+    files = walk_files(str(tmp_path))
+    # os.walk order: a directory's own files, then its sorted subdirectories
+    assert [name for _, name, _ in files] == ['a.txt', 'sub/empty.txt', 'sub/random.bin',
+                                              'sub/deeper/exact.bin', 'z/zoë.txt']
+    assert all(size == len(contents[name]) for _, name, size in files)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_matches_zipfile(tmp_path, small_batches, method):
+    source = tmp_path / 'tree'
+    contents = make_tree(str(source))
+    archives = []
+    for workers in (1, 2):
+        archives.append(str(tmp_path / f'out{workers}.zip'))
+        assert parallel_directory_to_zip(str(source), archives[-1], workers, method) == len(contents)
+    with open(archives[0], 'rb') as first, open(archives[1], 'rb') as second:
+        assert first.read() == second.read()  # Independent of the worker count
+
+    reference = str(tmp_path / 'reference.zip')
+    with zipfile.ZipFile(reference, 'w', method) as archive:
+        for path, name, _ in walk_files(str(source)):
+            archive.write(path, name)
+    with zipfile.ZipFile(archives[0]) as ours, zipfile.ZipFile(reference) as theirs:
+        assert ours.testzip() is None
+        assert ours.namelist() == theirs.namelist()
+        for mine, expected in zip(ours.infolist(), theirs.infolist()):
+            assert (mine.date_time, mine.CRC, mine.file_size, mine.compress_type, mine.external_attr) == (
+                expected.date_time, expected.CRC, expected.file_size, expected.compress_type,
+                expected.external_attr)
+            assert ours.read(mine) == contents[mine.filename]
+
+
+def test_pieces_join_into_one_deflate_stream(tmp_path):
+    data = b''.join(b'%d ' % index for index in range(50000))
+    path = str(tmp_path / 'data.txt')
+    with open(path, 'wb') as file:
+        file.write(data)
+    step = 10000
+    stream = b''
+    for start in range(0, len(data), step):
+        crc, length, piece, _, _ = parallel.compress_piece(
+            path, start, min(step, len(data) - start), len(data), zipfile.ZIP_DEFLATED, 6)
+        assert crc == zlib.crc32(data[start:start + length])
+        stream += piece
+    engine = zlib.decompressobj(-15)
+    assert engine.decompress(stream) == data and engine.eof
+
+
+def test_many_members_use_zip64_end_records(tmp_path, monkeypatch):
+    # Readers must take the member count from the ZIP64 end record
+    monkeypatch.setattr(sys.modules['zip_tools._format'], 'ZIP64_COUNT_LIMIT', 3)
+    files = []
+    for index in range(5):
+        path = str(tmp_path / f'{index}.txt')
+        with open(path, 'w') as file:
+            file.write(str(index))
+        files.append((path, f'{index}.txt', 1))
+    zip_path = str(tmp_path / 'out.zip')
+    parallel_zip(files, zip_path, workers=1)
+    with open(zip_path, 'rb') as file:
+        assert b'PK\x06\x06' in file.read()
+    with zipfile.ZipFile(zip_path) as archive:
+        assert [archive.read(f'{index}.txt') for index in range(5)] == [b'0', b'1', b'2', b'3', b'4']
+
+
+def test_zip64_local_header(tmp_path):
+    # A member expected to pass 4 GB gets its sizes in a ZIP64 extra field
+    zip_path = str(tmp_path / 'out.zip')
+    with open(zip_path, 'wb') as file:
+        assembler = parallel.ZipAssembler(file)
+        member = assembler.open_member('big.bin', zipfile.ZIP_STORED, ZIP64_LIMIT, 0, 0o100644)
+        file.write(b'data')
+        assembler.close_member(member, zlib.crc32(b'data'), 4, 4)
+        assembler.finish()
+    assert member.zip64
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.read('big.bin') == b'data' and archive.testzip() is None
@@ -0,0 +1,105 @@
+import io
+import os
+import random
+import socket
+import threading
+import zipfile
+
+import pytest
+
+from zip_tools import StreamZipWriter, stream_zip
+
+METHODS = [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA]
+
+
+class Pipe:
+    """Write-only, non-seekable sink that takes at most 1000 bytes per write() (a raw pipe)"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data[:1000]
+        return min(len(data), 1000)
+
+
+def make_files(directory):
+    rng = random.Random(2)
+    contents = {'text.txt': b'streamed line\n' * 20000, 'random.bin': rng.randbytes(150_000),
+                'empty.txt': b'', 'naïve.txt': 'ünïcode'.encode()}
+    files = []
+    for name, data in contents.items():
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        files.append((path, name))
+    return files, contents
+
+
+def check(data, contents, method):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == list(contents)
+        for info in archive.infolist():
+            assert info.flag_bits & 0x08 and info.compress_type == method
+            assert archive.read(info) == contents[info.filename]
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_file_members_match_zipfile(tmp_path, method):
+    files, contents = make_files(str(tmp_path))
+    pipe = Pipe()
+    sent = stream_zip(files, pipe, method)
+    assert sent == len(pipe.data)
+    check(bytes(pipe.data), contents, method)
+
+    reference = io.BytesIO()
+    with zipfile.ZipFile(reference, 'w') as archive:
+        for path, name in files:
+            archive.write(path, name)
+    with zipfile.ZipFile(io.BytesIO(bytes(pipe.data))) as ours, zipfile.ZipFile(reference) as theirs:
+        for mine, expected in zip(ours.infolist(), theirs.infolist()):
+            assert (mine.date_time, mine.CRC, mine.external_attr) == (
+                expected.date_time, expected.CRC, expected.external_attr)
+
+
+def test_streams_and_zip64_descriptors():
+    parts = []
+    with StreamZipWriter(parts.append, block_size=100) as archive:
+        archive.write_stream('generated.txt', (b'block %d\n' % index for index in range(5000)), mtime=0)
+        archive.write_stream('small.txt', io.BytesIO(b'file object'), zip64=False)
+        archive.writestr('text.txt', 'zoë')
+    data = b''.join(parts)
+    assert [member.zip64 for member in archive.members] == [True, False, False]
+    assert data.count(b'PK\x07\x08') == 3
+    check(data, {'generated.txt': b''.join(b'block %d\n' % index for index in range(5000)),
+                 'small.txt': b'file object', 'text.txt': 'zoë'.encode()}, zipfile.ZIP_DEFLATED)
+
+
+def test_socket_sink():
+    sender, receiver = socket.socketpair()
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(iter(lambda: receiver.recv(65536), b'')))
+    reader.start()
+    with sender, receiver:
+        with StreamZipWriter(sender) as archive:
+            archive.writestr('a.txt', b'a' * 1_000_000)
+        sender.shutdown(socket.SHUT_WR)
+        reader.join()
+    check(b''.join(received), {'a.txt': b'a' * 1_000_000}, zipfile.ZIP_DEFLATED)
+
+
+def test_errors():
+    with pytest.raises(TypeError):
+        StreamZipWriter(object())
+    archive = StreamZipWriter(io.BytesIO())
+    archive.close()
+    with pytest.raises(ValueError):
+        archive.writestr('late.txt', b'')
+
+    sink = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        with StreamZipWriter(sink) as archive:
+            archive.writestr('a.txt', b'a')
+            raise RuntimeError
+    assert b'PK\x05\x06' not in sink.getvalue()  # No central directory after a failure
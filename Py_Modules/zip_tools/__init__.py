@@ -0,0 +1,21 @@
+"""
+zip_tools - Faster building blocks behind the python_zipfile.py examples
+
+***This is a local package (see modules_importing/) - python_zipfile.py imports it***
+
+python_zipfile.py teaches zipfile.ZipFile one member at a time. The modules
+in this package write the same standard ZIP archives, built for big trees:
+
+- _format      : local headers, data descriptors, central directory and ZIP64 records
+- parallel_zip : members compressed in a process pool, written in a fixed order (byte-identical output)
+- stream_zip   : archive written straight into pipes/sockets (data descriptors, fixed-size blocks)
+- adaptive     : per-file method/level picked from a sample (entropy, test compression) + CPU/bytes report
+- incremental  : manifest of (size, mtime, hash); unchanged members copied raw from the last archive
+- extract      : glob/predicate-selected members decompressed in a process pool (path traversal refused)
+"""
+
+from .parallel_zip import parallel_directory_to_zip, parallel_zip, walk_files
+from .stream_zip import StreamZipWriter, stream_zip
+from .adaptive import CompressionReport, adaptive_directory_to_zip, adaptive_zip, choose_method
+from .incremental import incremental_zip, load_manifest
+from .extract import parallel_extract, select_members
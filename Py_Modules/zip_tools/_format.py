@@ -0,0 +1,223 @@
+"""
+ZIP Records, Byte by Byte
+=========================
+
+zipfile.ZipFile writes an archive itself, one member after the other. The
+faster writers in this package (parallel, streaming, incremental) compress
+members somewhere else and only need the bookkeeping around the data:
+
+    [local header 1][data 1]([descriptor 1]) ... [central directory][end record]
+
+- local header       : name, method, CRC and sizes, in front of each member
+- data descriptor    : CRC and sizes AFTER the data, for writers that cannot
+                       seek back (flag bit 3; sizes are 0 in the local header)
+- central directory  : one entry per member plus its offset, at the very end
+- end record         : where the central directory starts and how many
+                       entries it has. ZIP64 versions take over when a size or
+                       offset passes 4 GB or there are more than 65535 members.
+
+Memory Trick
+============
+local header = "here comes a member"
+central directory = "here is where every member was"
+"""
+
+import bz2
+import lzma
+import struct
+import time
+import zipfile
+import zlib
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+LOCAL_HEADER_SIZE = 30
+
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_END_RECORD64 = struct.Struct('<4sQ2H2L4Q')
+_END_LOCATOR64 = struct.Struct('<4sLQL')
+_DESCRIPTOR = struct.Struct('<4sL2L')
+_DESCRIPTOR64 = struct.Struct('<4sL2Q')
+
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+_FLAG_LZMA_EOS = 0x02
+
+_VERSIONS = {zipfile.ZIP_STORED: 20, zipfile.ZIP_DEFLATED: 20,
+             zipfile.ZIP_BZIP2: 46, zipfile.ZIP_LZMA: 63}
+_ZIP64_VERSION = 45
+_MADE_BY_UNIX = 3
+
+
+def compressor(method, level=None):
+    """Object with compress(data)/flush() producing member data for method"""
+    if method == zipfile.ZIP_STORED:
+        return None
+    if method == zipfile.ZIP_DEFLATED:
+        return zlib.compressobj(-1 if level is None else level, zlib.DEFLATED, -15)
+    if method == zipfile.ZIP_BZIP2:
+        return bz2.BZ2Compressor(9 if level is None else level)
+    if method == zipfile.ZIP_LZMA:
+        return zipfile.LZMACompressor()
+    raise NotImplementedError(f"Compression method {method} is not supported")
+
+
+class LZMADecompressor:
+    """
+    LZMA member data -> file bytes, with decompress(data, max_length) and needs_input like bz2
+
+    zipfile.LZMADecompressor has no max_length, so one call could inflate
+    a whole block, however big the output.
+    """
+
+    def __init__(self):
+        self._engine = None
+        self._header = b''  # 2-byte version, 2-byte size, then the LZMA1 properties
+        self.eof = False
+
+    @property
+    def needs_input(self):
+        return self._engine is None or self._engine.needs_input
+
+    def decompress(self, data, max_length=-1):
+        if self._engine is None:
+            self._header += data
+            if len(self._header) < 4:
+                return b''
+            size, = struct.unpack('<H', self._header[2:4])
+            if len(self._header) < 4 + size or size < 5:
+                return b''
+            properties = self._header[4]
+            pb, properties = divmod(properties, 45)
+            lp, lc = divmod(properties, 9)
+            self._engine = lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=[{
+                'id': lzma.FILTER_LZMA1, 'lc': lc, 'lp': lp, 'pb': pb,
+                'dict_size': int.from_bytes(self._header[5:9], 'little')}])
+            data = self._header[4 + size:]
+            self._header = b''
+        result = self._engine.decompress(data, max_length)
+        self.eof = self._engine.eof
+        return result
+
+
+def decompressor(method):
+    """
+    Object with decompress(data, max_length) turning member data back into file bytes (None = stored)
+
+    zlib returns the input it did not get to as unconsumed_tail; bz2 and
+    LZMA keep it and report needs_input.
+    """
+    if method == zipfile.ZIP_STORED:
+        return None
+    if method == zipfile.ZIP_DEFLATED:
+        return zlib.decompressobj(-15)
+    if method == zipfile.ZIP_BZIP2:
+        return bz2.BZ2Decompressor()
+    if method == zipfile.ZIP_LZMA:
+        return LZMADecompressor()
+    raise NotImplementedError(f"Compression method {method} is not supported")
+
+
+def dos_date_time(timestamp):
+    """(dos time, dos date) of a Unix timestamp in local time, clamped to 1980-2107"""
+    year, month, day, hour, minute, second = time.localtime(timestamp)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    elif year > 2107:
+        year, month, day, hour, minute, second = 2107, 12, 31, 23, 59, 58
+    return hour << 11 | minute << 5 | second // 2, (year - 1980) << 9 | month << 5 | day
+
+
+class Member:
+    """Everything the central directory needs to know about one written member"""
+
+    __slots__ = ('name', 'flags', 'method', 'dos_time', 'dos_date', 'crc',
+                 'compressed_size', 'file_size', 'offset', 'external_attr', 'zip64')
+
+    def __init__(self, name, method, mtime, mode=0o100644, crc=0, compressed_size=0,
+                 file_size=0, offset=0, zip64=False, flags=0):
+        if isinstance(name, str):
+            try:
+                name = name.encode('ascii')
+            except UnicodeEncodeError:
+                name = name.encode('utf-8')
+                flags |= FLAG_UTF8
+        if method == zipfile.ZIP_LZMA:
+            flags |= _FLAG_LZMA_EOS
+        self.name = name
+        self.flags = flags
+        self.method = method
+        self.dos_time, self.dos_date = dos_date_time(mtime)
+        self.crc = crc
+        self.compressed_size = compressed_size
+        self.file_size = file_size
+        self.offset = offset
+        self.external_attr = (mode & 0xFFFF) << 16
+        self.zip64 = zip64
+
+    @property
+    def version(self):
+        version = _VERSIONS[self.method]
+        return max(version, _ZIP64_VERSION) if self.zip64 else version
+
+    def local_header(self):
+        """Local file header; sizes are zero when a data descriptor follows"""
+        if self.flags & FLAG_DATA_DESCRIPTOR:
+            crc = compressed_size = file_size = 0
+        else:
+            crc, compressed_size, file_size = self.crc, self.compressed_size, self.file_size
+        extra = b''
+        if self.zip64:
+            extra = struct.pack('<2H2Q', 1, 16, file_size, compressed_size)
+            compressed_size = file_size = ZIP64_LIMIT
+        return _LOCAL_HEADER.pack(
+            b'PK\x03\x04', self.version, 0, self.flags, self.method, self.dos_time,
+            self.dos_date, crc, compressed_size, file_size, len(self.name), len(extra)
+        ) + self.name + extra
+
+    def data_descriptor(self):
+        if self.zip64:
+            return _DESCRIPTOR64.pack(b'PK\x07\x08', self.crc, self.compressed_size, self.file_size)
+        return _DESCRIPTOR.pack(b'PK\x07\x08', self.crc, self.compressed_size, self.file_size)
+
+    def central_header(self):
+        sizes = [self.file_size, self.compressed_size, self.offset]
+        extra_values = [value for value in sizes if value >= ZIP64_LIMIT]
+        extra = b''
+        if extra_values:
+            extra = struct.pack(f'<2H{len(extra_values)}Q', 1, 8 * len(extra_values), *extra_values)
+            sizes = [min(value, ZIP64_LIMIT) for value in sizes]
+        version = max(self.version, _ZIP64_VERSION) if extra_values else self.version
+        return _CENTRAL_HEADER.pack(
+            b'PK\x01\x02', version, _MADE_BY_UNIX, version, 0, self.flags, self.method,
+            self.dos_time, self.dos_date, self.crc, sizes[1], sizes[0],
+            len(self.name), len(extra), 0, 0, 0, self.external_attr, sizes[2]
+        ) + self.name + extra
+
+
+def data_offset(file, header_offset):
+    """Where a member's data starts: past its local header (read from file)"""
+    file.seek(header_offset)
+    header = file.read(LOCAL_HEADER_SIZE)
+    if len(header) != LOCAL_HEADER_SIZE or header[:4] != b'PK\x03\x04':
+        raise zipfile.BadZipFile(f"No local header at byte {header_offset}")
+    name_length, extra_length = struct.unpack('<2H', header[26:30])
+    return header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+
+
+def central_directory(members, offset):
+    """Central directory + end record(s) for members, starting at byte offset"""
+    directory = b''.join(member.central_header() for member in members)
+    count = len(members)
+    size = len(directory)
+    end = b''
+    if count >= ZIP64_COUNT_LIMIT or size >= ZIP64_LIMIT or offset >= ZIP64_LIMIT:
+        end = _END_RECORD64.pack(b'PK\x06\x06', _END_RECORD64.size - 12, _ZIP64_VERSION,
+                                 _ZIP64_VERSION, 0, 0, count, count, size, offset)
+        end += _END_LOCATOR64.pack(b'PK\x06\x07', 0, offset + size, 1)
+    end += _END_RECORD.pack(b'PK\x05\x06', 0, 0, min(count, ZIP64_COUNT_LIMIT),
+                            min(count, ZIP64_COUNT_LIMIT), min(size, ZIP64_LIMIT),
+                            min(offset, ZIP64_LIMIT), 0)
+    return directory + end
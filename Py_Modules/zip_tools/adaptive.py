@@ -0,0 +1,227 @@
+"""
+Adaptive Per-File Compression
+=============================
+
+create_zip_with_compression_control() and demonstrate_compression_methods()
+use ONE method and level for every member. That is wasted work for files
+that are already compressed (jpg, png, mp4, zip, gz...): deflate level 9
+burns CPU on them and saves almost nothing.
+
+adaptive_zip() looks at the first 64 KB of each file before choosing:
+1. Byte entropy (NumPy histogram): close to 8 bits/byte means random-looking
+   data - already compressed or encrypted -> ZIP_STORED
+2. Otherwise the sample is test-compressed with fast deflate (level 1);
+   if that saves less than 10% -> ZIP_STORED
+3. Compressible files get the method of the chosen goal:
+   - 'speed'    : DEFLATED level 1
+   - 'balanced' : DEFLATED at compresslevel (default 6)
+   - 'size'     : the sample is also tried with deflate 9, BZIP2 and LZMA;
+                  the smallest wins (deflate 9 unless another is >3% smaller)
+
+Every member is timed (CPU seconds of the process that compressed it) and
+the returned CompressionReport shows, per method, CPU time against bytes
+saved.
+
+Files larger than BATCH_BYTES are sampled by the writer, then handled like
+in parallel_zip(): stored/deflated ones are compressed as pieces by the
+workers, bzip2/lzma ones streamed - no member is ever held whole in memory.
+
+Memory Trick
+============
+Fixed method  = same effort for a text file and a JPEG
+Adaptive      = taste the first bite, then decide how hard to chew
+"""
+
+import os
+import time
+import zipfile
+import zlib
+
+import numpy as np
+
+from ._format import compressor
+from .parallel_zip import (BATCH_BYTES, SPLIT_METHODS, WRITE_BUFFER, ZipAssembler, compress_file,
+                           compress_piece, group_files, map_batches, walk_files)
+
+SAMPLE_BYTES = 64 * 1024
+MIN_SAMPLE = 512  # Smaller files: testing would cost as much as compressing
+STORE_ENTROPY = 7.9  # bits per byte
+STORE_RATIO = 0.9  # Test-compressed size / sample size at or above this -> stored
+STRONG_GAIN = 0.97  # bzip2/lzma must beat deflate 9 by 3% on the sample
+GOALS = ('speed', 'balanced', 'size')
+
+
+def byte_entropy(data):
+    """Shannon entropy of data in bits per byte (0.0 - 8.0)"""
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    counts = counts[counts > 0] / len(data)
+    return float(-(counts * np.log2(counts)).sum())
+
+
+def _strong_size(method, sample):
+    engine = compressor(method)
+    return len(engine.compress(sample)) + len(engine.flush())
+
+
+def choose_method(sample, goal='balanced', compresslevel=6):
+    """(method, level) for a file whose first bytes are sample"""
+    if not sample:
+        return zipfile.ZIP_STORED, None
+    if len(sample) < MIN_SAMPLE:
+        return (zipfile.ZIP_DEFLATED, 1) if goal == 'speed' else (zipfile.ZIP_DEFLATED, compresslevel)
+    if byte_entropy(sample) >= STORE_ENTROPY:
+        return zipfile.ZIP_STORED, None
+    if len(zlib.compress(sample, 1)) >= STORE_RATIO * len(sample):
+        return zipfile.ZIP_STORED, None
+    if goal == 'speed':
+        return zipfile.ZIP_DEFLATED, 1
+    if goal == 'balanced':
+        return zipfile.ZIP_DEFLATED, compresslevel
+
+    deflated = len(zlib.compress(sample, 9))
+    best = (deflated * STRONG_GAIN, zipfile.ZIP_DEFLATED, 9)
+    for method in (zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA):
+        best = min(best, (_strong_size(method, sample), method, None))
+    return best[1], best[2]
+
+
+def _sample(path):
+    with open(path, 'rb') as file:
+        return file.read(SAMPLE_BYTES)
+
+
+def split_adaptive(files, goal, compresslevel):
+    """
+    (task, archive_name, size, path, choice) entries for compress_adaptive_batch() and group_files()
+
+    Files up to BATCH_BYTES are one task, sampled by the worker (choice None).
+    Larger ones are sampled here: choice is their (method, level) and the
+    task a (path, start, length, size, method, level) piece, or None when
+    the writer streams the file itself.
+    """
+    for path, archive_name, size in files:
+        if size <= BATCH_BYTES:
+            yield path, archive_name, size, path, None
+            continue
+        method, level = choose_method(_sample(path), goal, compresslevel)
+        if method not in SPLIT_METHODS:
+            yield None, archive_name, size, path, (method, level)
+            continue
+        for start in range(0, size, BATCH_BYTES):
+            length = min(BATCH_BYTES, size - start)
+            yield (path, start, length, size, method, level), archive_name, length, path, (method, level)
+
+
+def compress_adaptive_batch(tasks, goal, compresslevel):
+    """
+    Per task: (method, level, cpu_seconds, crc, file_size, data, mtime, mode); runs in a worker
+
+    A path is sampled and compressed whole; a piece uses the method it carries.
+    """
+    results = []
+    for task in tasks:
+        started = time.process_time()
+        if task is None:
+            results.append(None)
+            continue
+        if isinstance(task, str):
+            method, level = choose_method(_sample(task), goal, compresslevel)
+            result = compress_file(task, method, level)
+        else:
+            method, level = task[4:]
+            result = compress_piece(*task)
+        results.append((method, level, time.process_time() - started) + result)
+    return results
+
+
+class CompressionReport:
+    """Chosen method, sizes and CPU time of every member of an adaptive archive"""
+
+    def __init__(self):
+        self.rows = []  # (archive_name, method, level, file_size, compressed_size, cpu_seconds)
+        self.seconds = 0.0
+
+    def add(self, archive_name, method, level, file_size, compressed_size, cpu_seconds):
+        self.rows.append((archive_name, method, level, file_size, compressed_size, cpu_seconds))
+
+    @property
+    def file_size(self):
+        return sum(row[3] for row in self.rows)
+
+    @property
+    def compressed_size(self):
+        return sum(row[4] for row in self.rows)
+
+    @property
+    def cpu_seconds(self):
+        return sum(row[5] for row in self.rows)
+
+    def by_method(self):
+        """{'deflate-6': {'files', 'file_size', 'compressed_size', 'saved', 'cpu_seconds'}, ...}"""
+        summary = {}
+        for _, method, level, file_size, compressed_size, cpu_seconds in self.rows:
+            name = zipfile.compressor_names.get(method, str(method))
+            if level is not None:
+                name = f"{name}-{level}"
+            entry = summary.setdefault(name, {'files': 0, 'file_size': 0, 'compressed_size': 0,
+                                              'saved': 0, 'cpu_seconds': 0.0})
+            entry['files'] += 1
+            entry['file_size'] += file_size
+            entry['compressed_size'] += compressed_size
+            entry['saved'] += file_size - compressed_size
+            entry['cpu_seconds'] += cpu_seconds
+        return summary
+
+    def print_summary(self):
+        print(f"{len(self.rows)} files, {self.file_size} -> {self.compressed_size} bytes, "
+              f"{self.cpu_seconds:.2f}s CPU, {self.seconds:.2f}s total")
+        for name, entry in self.by_method().items():
+            saved_per_second = entry['saved'] / entry['cpu_seconds'] if entry['cpu_seconds'] else 0.0
+            print(f"  {name:<10} {entry['files']:>6} files  {entry['file_size']:>12} -> "
+                  f"{entry['compressed_size']:>12} bytes  {entry['cpu_seconds']:>7.2f}s CPU  "
+                  f"{saved_per_second / 1e6:>7.1f} MB saved per CPU second")
+
+
+def adaptive_zip(files, zip_filename, goal='balanced', compresslevel=6, workers=1):
+    """
+    Write (path, archive_name, size) entries, choosing the method per file; returns a CompressionReport
+
+    workers > 1 (or None for all CPU cores) samples and compresses in a
+    process pool, like parallel_zip().
+    """
+    if goal not in GOALS:
+        raise ValueError(f"goal must be one of {GOALS}")
+    workers = workers or os.cpu_count() or 1
+    report = CompressionReport()
+    started = time.perf_counter()
+    with open(zip_filename, 'wb', buffering=WRITE_BUFFER) as file:
+        assembler = ZipAssembler(file)
+        entries = group_files(split_adaptive(files, goal, compresslevel))
+        piece_seconds = 0.0
+        for batch, results in map_batches(compress_adaptive_batch, entries, (goal, compresslevel), workers):
+            for (task, archive_name, _, path, choice), result in zip(batch, results):
+                if task is None:
+                    method, level = choice
+                    cpu_started = time.process_time()
+                    member = assembler.stream(archive_name, path, method, level)
+                    cpu_seconds = time.process_time() - cpu_started
+                elif isinstance(task, str):
+                    method, level, cpu_seconds, *result = result
+                    member = assembler.add(archive_name, method, *result)
+                else:
+                    method, level, cpu_seconds, *result = result
+                    member = assembler.add_piece(archive_name, method, *task[1:4], result)
+                    piece_seconds += cpu_seconds
+                    if member is None:
+                        continue
+                    cpu_seconds, piece_seconds = piece_seconds, 0.0
+                report.add(archive_name, method, level, member.file_size,
+                           member.compressed_size, cpu_seconds)
+        assembler.finish()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def adaptive_directory_to_zip(directory_path, zip_filename, goal='balanced', compresslevel=6, workers=1):
+    """Archive every file below directory_path with adaptive_zip()"""
+    return adaptive_zip(walk_files(directory_path), zip_filename, goal, compresslevel, workers)
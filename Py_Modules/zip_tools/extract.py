@@ -0,0 +1,190 @@
+"""
+Parallel, Selective ZIP Extraction
+==================================
+
+extract_zip() calls zipf.extractall(): every member, one after the other,
+on one CPU core. But the central directory at the end of the archive says
+where every member starts - each one can be decompressed on its own, by a
+different process, without reading anything before it.
+
+parallel_extract():
+1. Reads the central directory ONCE (zipfile's infolist())
+2. Keeps the members matching a glob ('*.txt', ['docs/*', '*.md']) or a
+   predicate (lambda info: info.file_size < 10_000_000)
+3. Checks EVERY target path before writing anything: absolute names, drive
+   letters and '..' parts are refused (ValueError), and the resolved path
+   must stay inside extract_path - symlinked folders included (each folder
+   is resolved once; a symlink in place of a file is never written through)
+4. Creates the folders, then sends batches of members to a process pool.
+   Each worker opens the archive itself (its own file handle, its own
+   position), skips the local header, pre-allocates the output file and
+   decompresses in 1 MB blocks, checking CRC-32 and size. Output is
+   capped at the recorded size (a zip bomb stops there), and a member
+   that fails a check is removed again
+5. Reports progress after every batch: progress(done, total, bytes_done, bytes_total)
+
+Like zipf.extractall(), existing files are overwritten and file times are
+not restored. Encrypted members are not supported (NotImplementedError).
+
+Memory Trick
+============
+extractall       = one reader walks the archive front to back
+parallel_extract = the central directory is the map, every worker takes its own stop
+"""
+
+import fnmatch
+import os
+import zipfile
+import zlib
+
+from ._format import data_offset, decompressor
+from .parallel_zip import group_files, map_batches
+
+READ_BLOCK = 1024 * 1024
+_FLAG_ENCRYPTED = 0x01
+_O_NOFOLLOW = getattr(os, 'O_NOFOLLOW', 0)  # Not on Windows
+_O_BINARY = getattr(os, 'O_BINARY', 0)  # Windows only
+
+
+def select_members(members, pattern=None):
+    """
+    Members (ZipInfo) matching pattern
+
+    pattern: None (all), a glob, a list of globs, or a callable taking a ZipInfo
+    """
+    if pattern is None:
+        return list(members)
+    if callable(pattern):
+        return [info for info in members if pattern(info)]
+    patterns = [pattern] if isinstance(pattern, str) else list(pattern)
+    return [info for info in members
+            if any(fnmatch.fnmatchcase(info.filename, glob) for glob in patterns)]
+
+
+def safe_target(root, name, resolved=None):
+    """
+    Path of member name below the real path root; ValueError if it would land outside
+
+    resolved: {folder name: real path} cache, so each folder is resolved once
+    """
+    parts = name.replace('\\', '/').split('/')
+    if name.startswith(('/', '\\')) or ':' in parts[0] or '..' in parts:
+        raise ValueError(f"Refusing to extract {name!r}: absolute path or '..' in name")
+    if resolved is None:
+        resolved = {}
+    folder = '/'.join(parts[:-1])
+    real_folder = resolved.get(folder)
+    if real_folder is None:
+        real_folder = os.path.realpath(os.path.join(root, *parts[:-1]))
+        if os.path.commonpath([root, real_folder]) != root:
+            raise ValueError(f"Refusing to extract {name!r}: resolves outside {root!r}")
+        resolved[folder] = real_folder
+    # A symlink in place of the file itself is refused when it is opened (O_NOFOLLOW)
+    return os.path.join(real_folder, parts[-1]) if parts[-1] else real_folder
+
+
+def _copy_out(source, engine, method, compress_size, file_size, output, target):
+    """Decompress compress_size bytes of source into output; (bytes written, CRC-32)"""
+    written = 0
+    checksum = 0
+    remaining = compress_size
+    while remaining:
+        data = source.read(min(READ_BLOCK, remaining))
+        if not data:
+            raise zipfile.BadZipFile(f"Archive ends inside {target!r}")
+        remaining -= len(data)
+        while True:
+            # Never ask for more than one byte past the recorded size: a zip
+            # bomb (or a lying directory) is caught there, not after inflating
+            # a whole block to a gigabyte
+            limit = min(READ_BLOCK, file_size - written) + 1
+            if engine is None:
+                block, data = data, b''
+            else:
+                block = engine.decompress(data, limit)
+                data = engine.unconsumed_tail if method == zipfile.ZIP_DEFLATED else b''
+            written += len(block)
+            if written > file_size:  # More output than the directory promised: corrupt or a zip bomb
+                raise zipfile.BadZipFile(f"{target!r} is larger than its recorded size")
+            checksum = zlib.crc32(block, checksum)
+            output.write(block)
+            if method in (zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA):
+                if engine.needs_input or engine.eof:  # bz2/lzma keep unread input themselves
+                    break
+            elif not data:
+                break
+    if method == zipfile.ZIP_DEFLATED:  # Only zlib keeps output back until flush()
+        block = engine.flush()
+        written += len(block)
+        checksum = zlib.crc32(block, checksum)
+        output.write(block)
+    return written, checksum
+
+
+def extract_member(source, header_offset, compress_size, method, crc, file_size, target):
+    """Decompress one member of an open archive file into target"""
+    source.seek(data_offset(source, header_offset))
+    engine = decompressor(method)
+    descriptor = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_NOFOLLOW | _O_BINARY)
+    try:
+        with open(descriptor, 'wb') as output:
+            if file_size and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(output.fileno(), 0, file_size)  # One extent, no growth on write
+                except OSError:
+                    pass  # Filesystem without fallocate (tmpfs on some kernels, network mounts)
+            written, checksum = _copy_out(source, engine, method, compress_size, file_size,
+                                          output, target)
+        if written != file_size or checksum != crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 or size for {target!r}")
+    except BaseException:
+        os.remove(target)  # No half-written (or pre-allocated, zero-filled) file stays behind
+        raise
+    return written
+
+
+def extract_batch(tasks, zip_filename):
+    """extract_member() for a batch of tasks; runs inside a worker with its own file handle"""
+    with open(zip_filename, 'rb') as source:
+        return [extract_member(source, *task) for task in tasks]
+
+
+def parallel_extract(zip_filename, extract_path, pattern=None, workers=None, progress=None):
+    """
+    Extract the members of zip_filename matching pattern into extract_path
+
+    workers=None uses every CPU core; workers=1 extracts in this process.
+    progress(done, total, bytes_done, bytes_total) is called after each
+    batch. Returns the number of members extracted.
+    """
+    workers = workers or os.cpu_count() or 1
+    with zipfile.ZipFile(zip_filename) as archive:
+        members = select_members(archive.infolist(), pattern)
+
+    root = os.path.realpath(extract_path)
+    resolved = {}
+    folders = {root}
+    entries = []  # (task, archive_name, file_size) - the shape group_files() batches
+    for info in members:
+        target = safe_target(root, info.filename, resolved)  # Everything is checked before anything is written
+        if info.is_dir():
+            folders.add(target)
+            continue
+        if info.flag_bits & _FLAG_ENCRYPTED:
+            raise NotImplementedError(f"{info.filename!r} is encrypted")
+        decompressor(info.compress_type)  # Unsupported methods fail here, not in a worker
+        folders.add(os.path.dirname(target))
+        entries.append(((info.header_offset, info.compress_size, info.compress_type,
+                         info.CRC, info.file_size, target), info.filename, info.file_size))
+    for folder in sorted(folders):
+        os.makedirs(folder, exist_ok=True)
+
+    total_bytes = sum(entry[2] for entry in entries)
+    done = 0
+    done_bytes = 0
+    for batch, sizes in map_batches(extract_batch, group_files(entries), (zip_filename,), workers):
+        done += len(batch)
+        done_bytes += sum(sizes)
+        if progress is not None:
+            progress(done, len(entries), done_bytes, total_bytes)
+    return len(entries)
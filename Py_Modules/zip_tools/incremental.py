@@ -0,0 +1,263 @@
+"""
+Incremental ZIP Backups
+=======================
+
+Running directory_to_zip('test_files', ...) again compresses every file
+again, even when nothing changed since last night. Compressing is the
+expensive part; copying bytes is cheap.
+
+incremental_zip() keeps a manifest next to the archive
+(backup.zip.manifest.json): archive name -> (size, mtime, content hash) of
+every file in the last run. On the next run, per file:
+1. Same size and mtime as in the manifest   -> unchanged (no read at all)
+2. Same size, other mtime, same content hash -> unchanged (touched only)
+3. Anything else (or new)                    -> compressed again
+
+Unchanged members are COPIED from the previous archive as they are: the
+compressed bytes are read at the offset its central directory points to
+and written behind a fresh local header - no decompression, no
+recompression. New and changed files go through the parallel_zip pool,
+large ones as pieces (or streamed) like in parallel_zip(). Deleted files
+simply are not copied.
+
+The content hash is BLAKE2b over the BLAKE2b digests of the file's
+BATCH_BYTES pieces, so the pieces of a large file can be hashed by the
+workers that compress them. Touched files are hashed in the same process
+pool. The new archive is written next to the old one and replaces it only
+when complete (a failed run leaves no .tmp file behind). A missing or
+mismatching manifest - or one written with another method or
+compresslevel, whose members would be copied with the wrong compression -
+means a full rebuild.
+
+Memory Trick
+============
+Full backup        = compress everything, every night
+Incremental backup = compress what changed, copy what did not
+"""
+
+import hashlib
+import json
+import os
+import time
+import zipfile
+
+from ._format import data_offset
+from .parallel_zip import (BATCH_BYTES, WRITE_BUFFER, ZipAssembler, compress_file, compress_piece,
+                           group_files, map_batches, split_files, walk_files)
+
+COPY_BLOCK = 1024 * 1024
+MANIFEST_VERSION = 2  # 2: content hash over BATCH_BYTES piece digests
+
+
+class ContentHash:
+    """
+    BLAKE2b of the BLAKE2b digests of every BATCH_BYTES piece of a file
+
+    update() takes the file in blocks of any size; the digests of pieces
+    hashed elsewhere can be appended to pieces instead.
+    """
+
+    def __init__(self):
+        self.pieces = []
+        self._piece = hashlib.blake2b()
+        self._filled = 0
+
+    def update(self, data):
+        view = memoryview(data)
+        while len(view):
+            take = min(len(view), BATCH_BYTES - self._filled)
+            self._piece.update(view[:take])
+            self._filled += take
+            view = view[take:]
+            if self._filled == BATCH_BYTES:
+                self.pieces.append(self._piece.digest())
+                self._piece = hashlib.blake2b()
+                self._filled = 0
+
+    def hexdigest(self):
+        pieces = self.pieces
+        if self._filled or not pieces:  # An empty file is one empty piece
+            pieces = pieces + [self._piece.digest()]
+        return hashlib.blake2b(b''.join(pieces)).hexdigest()
+
+
+def file_hash(path):
+    """ContentHash hex digest of a file"""
+    digest = ContentHash()
+    with open(path, 'rb') as file:
+        while block := file.read(COPY_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_batch(paths):
+    """file_hash() per path; runs inside a worker"""
+    return [file_hash(path) for path in paths]
+
+
+def compress_and_hash_batch(tasks, method, level):
+    """
+    compress_file() result + hex digest per path, compress_piece() result + piece digest
+    per (path, start, length, size) piece; runs inside a worker
+    """
+    results = []
+    for task in tasks:
+        if task is None:  # Streamed by the writer
+            results.append(None)
+        elif isinstance(task, str):
+            digest = ContentHash()
+            results.append(compress_file(task, method, level, digest=digest) + (digest.hexdigest(),))
+        else:
+            digest = hashlib.blake2b()
+            results.append(compress_piece(*task, method, level, digest=digest) + (digest.digest(),))
+    return results
+
+
+def write_changed(assembler, archive_name, path, results, method, level):
+    """
+    Write one new/changed file from the (task, result) pairs of compress_and_hash_batch()
+
+    Takes all the pairs of the file from results; returns its content hash.
+    """
+    task, result = next(results)
+    if task is None:
+        digest = ContentHash()
+        assembler.stream(archive_name, path, method, level, digest=digest)
+        return digest.hexdigest()
+    if isinstance(task, str):
+        *result, content = result
+        assembler.add(archive_name, method, *result)
+        return content
+    digest = ContentHash()
+    while True:
+        *result, piece_digest = result
+        digest.pieces.append(piece_digest)
+        if assembler.add_piece(archive_name, method, *task[1:], result) is not None:
+            return digest.hexdigest()
+        task, result = next(results)
+
+
+def manifest_path(zip_filename):
+    return zip_filename + '.manifest.json'
+
+
+def _archive_identity(zip_filename):
+    stat = os.stat(zip_filename)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_manifest(zip_filename, method=zipfile.ZIP_DEFLATED, compresslevel=6):
+    """
+    {archive_name: [size, mtime_ns, hash]} of the last run, or {} if unusable
+
+    Unusable also means written for another method or compresslevel.
+    """
+    try:
+        with open(manifest_path(zip_filename), 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}  # Hashes of another kind
+        if manifest['archive'] != _archive_identity(zip_filename):
+            return {}  # Archive changed (or was replaced) since the manifest was written
+        if [manifest['method'], manifest['compresslevel']] != [method, compresslevel]:
+            return {}  # Copied members would keep the old compression
+        return manifest['files']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def copy_member(source, info, assembler, mtime):
+    """Append a member of an open archive file as raw compressed bytes"""
+    source.seek(data_offset(source, info.header_offset))
+
+    member = assembler.begin(info.filename, info.compress_type, info.CRC, info.file_size,
+                             info.compress_size, mtime, info.external_attr >> 16)
+    remaining = info.compress_size
+    while remaining:
+        block = source.read(min(COPY_BLOCK, remaining))
+        if not block:
+            raise zipfile.BadZipFile(f"Archive ends inside {info.filename!r}")
+        assembler.file.write(block)
+        remaining -= len(block)
+    return member
+
+
+def incremental_zip(directory_path, zip_filename, workers=1,
+                    method=zipfile.ZIP_DEFLATED, compresslevel=6):
+    """
+    Archive directory_path into zip_filename, reusing unchanged members of the previous run
+
+    Returns {'copied', 'compressed', 'removed', 'seconds'}. workers > 1 (or
+    None) compresses new/changed files in a process pool.
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    previous = (load_manifest(zip_filename, method, compresslevel)
+                if os.path.exists(zip_filename) else {})
+    old_members = {}
+    if previous:
+        with zipfile.ZipFile(zip_filename) as old_archive:
+            old_members = {info.filename: info for info in old_archive.infolist()}
+
+    entries = []  # (path, archive_name, size, stat, hash if unchanged else None)
+    touched = []  # (path, archive_name, size) with the old size but a new mtime
+    for path, archive_name, size in walk_files(directory_path):
+        stat = os.stat(path)
+        known = previous.get(archive_name)
+        content = None
+        if known is not None and archive_name in old_members and known[0] == stat.st_size:
+            if known[1] == stat.st_mtime_ns:
+                content = known[2]
+            else:
+                touched.append((path, archive_name, stat.st_size))
+        entries.append((path, archive_name, stat.st_size, stat, content))
+
+    same = set()  # Touched files whose content hash did not change
+    for batch, hashes in map_batches(hash_batch, group_files(touched), (), workers):
+        same.update(archive_name for (_, archive_name, _), digest in zip(batch, hashes)
+                    if digest == previous[archive_name][2])
+    entries = [entry[:4] + (previous[entry[1]][2],) if entry[1] in same else entry
+               for entry in entries]
+
+    changed = [entry[:3] for entry in entries if entry[4] is None]
+    results = ((task, result) for batch, batch_results in map_batches(
+        compress_and_hash_batch, group_files(split_files(changed, method)), (method, compresslevel), workers)
+        for (task, *_), result in zip(batch, batch_results))
+
+    temporary = zip_filename + '.tmp'
+    files = {}
+    source = open(zip_filename, 'rb') if old_members else None
+    try:
+        with open(temporary, 'wb', buffering=WRITE_BUFFER) as file:
+            assembler = ZipAssembler(file)
+            for path, archive_name, size, stat, content in entries:
+                if content is not None:
+                    copy_member(source, old_members[archive_name], assembler, stat.st_mtime)
+                else:
+                    content = write_changed(assembler, archive_name, path, results, method, compresslevel)
+                files[archive_name] = [stat.st_size, stat.st_mtime_ns, content]
+            assembler.finish()
+        if source is not None:
+            source.close()  # Windows cannot replace a file that is still open
+            source = None
+        os.replace(temporary, zip_filename)  # Only a complete archive replaces the old one
+    finally:
+        if source is not None:
+            source.close()
+        if os.path.exists(temporary):  # Failed before the replace
+            os.remove(temporary)
+
+    manifest = {'version': MANIFEST_VERSION, 'archive': _archive_identity(zip_filename), 'method': method,
+                'compresslevel': compresslevel, 'files': files}
+    temporary = manifest_path(zip_filename) + '.tmp'
+    try:
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file)
+        os.replace(temporary, manifest_path(zip_filename))
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+    return {'copied': len(entries) - len(changed), 'compressed': len(changed),
+            'removed': len(set(previous) - set(files)),
+            'seconds': time.perf_counter() - started}
@@ -0,0 +1,352 @@
+"""
+Parallel ZIP Archiver
+=====================
+
+directory_to_zip() calls zipf.write() for one file after the other, so a
+single CPU core deflates the whole tree. But every ZIP member is
+compressed on its own - nothing stops several cores from compressing
+different files at the same time. Only WRITING has to happen in order.
+
+parallel_zip():
+1. Walks the tree in sorted order and groups small files into batches
+   (fewer round trips to the pool for trees of 50k tiny files)
+2. A process pool reads and compresses each batch: raw deflate streams
+   (or bzip2/lzma/stored) plus CRC-32 and sizes
+3. This process takes the results back IN SUBMISSION ORDER, writes each
+   local header and its data, and finally the central directory
+
+Files larger than BATCH_BYTES are never compressed in one piece. DEFLATE
+(and stored) files are cut into BATCH_BYTES pieces the way pigz does it:
+each piece is compressed by a worker with the 32 KB before it as
+dictionary and ends on a sync flush, so the pieces join into one valid
+stream, and their CRC-32s are combined. bzip2 and LZMA streams cannot be
+joined; those files are compressed by the writer itself, block by block.
+Either way the local header is written first and patched with the sizes.
+
+Only a few batches of at most BATCH_BYTES are in flight at once, so memory
+stays bounded however large the files are. The archive depends only on the
+file list, contents and mtimes - never on the worker count or on which
+worker finished first - so the same input gives byte-identical output.
+
+Important (Windows/macOS)
+=========================
+Process pools re-import the calling script; call parallel_zip(...,
+workers > 1) from inside an `if __name__ == "__main__":` block, as
+python_zipfile.py does.
+
+Memory Trick
+============
+zipf.write   = one core compresses, then writes, file by file
+parallel_zip = many cores compress, one writer keeps the order
+"""
+
+import os
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from ._format import ZIP64_LIMIT, Member, central_directory, compressor
+
+BLOCK_SIZE = 1024 * 1024
+BATCH_FILES = 64
+BATCH_BYTES = 8 * 1024 * 1024
+WRITE_BUFFER = 1024 * 1024
+DICTIONARY_BYTES = 32 * 1024  # DEFLATE's window: a piece can refer back this far
+SPLIT_METHODS = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+_CRC_POLYNOMIAL = 0xEDB88320
+
+
+def _multiply_mod(a, b):
+    """a * b modulo the CRC-32 polynomial (bit-reflected, as in zlib)"""
+    product = 0
+    bit = 1 << 31
+    while a:
+        if a & bit:
+            product ^= b
+            a ^= bit
+        bit >>= 1
+        b = (b >> 1) ^ _CRC_POLYNOMIAL if b & 1 else b >> 1
+    return product
+
+
+_POWERS = [1 << 30]  # x^(2^k) modulo the polynomial, k = 0..31
+for _ in range(31):
+    _POWERS.append(_multiply_mod(_POWERS[-1], _POWERS[-1]))
+
+
+def crc32_combine(crc1, crc2, length2):
+    """CRC-32 of A + B from crc32(A), crc32(B) and len(B), like zlib's crc32_combine()"""
+    shift = 1 << 31  # x^(8 * length2): crc1 moved past length2 bytes
+    k = 3
+    while length2:
+        if length2 & 1:
+            shift = _multiply_mod(_POWERS[k & 31], shift)
+        length2 >>= 1
+        k += 1
+    return _multiply_mod(shift, crc1) ^ crc2
+
+
+def walk_files(directory_path):
+    """[(path, archive_name, size)] for every file below directory_path, in sorted order"""
+    files = []
+    for root, dirs, names in os.walk(directory_path):
+        dirs.sort()  # os.walk visits dirs in this (now sorted) order
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            archive_name = os.path.relpath(path, directory_path).replace(os.sep, '/')
+            files.append((path, archive_name, os.path.getsize(path)))
+    return files
+
+
+def compress_file(path, method, level, block_size=BLOCK_SIZE, digest=None):
+    """
+    Read and compress one file: (crc, file_size, data, mtime, mode)
+
+    digest: optional hashlib object, fed the same blocks (content hash in the same read)
+    """
+    stat = os.stat(path)
+    engine = compressor(method, level)
+    crc = 0
+    size = 0
+    parts = []
+    with open(path, 'rb') as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            if digest is not None:
+                digest.update(block)
+            parts.append(engine.compress(block) if engine is not None else block)
+    if engine is not None:
+        parts.append(engine.flush())
+    return crc, size, b''.join(parts), stat.st_mtime, stat.st_mode
+
+
+def compress_piece(path, start, length, size, method, level, digest=None):
+    """
+    Compress bytes start:start + length of a DEFLATE/stored member: (crc, length, data, mtime, mode)
+
+    The piece is one part of the member's stream: it may refer back into
+    the 32 KB before it, and only the piece that ends the file ends the stream.
+    digest (a hashlib object) is updated with the piece's bytes.
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as file:
+        file.seek(max(0, start - DICTIONARY_BYTES))
+        dictionary = file.read(start - file.tell())
+        block = file.read(length)
+    if digest is not None:
+        digest.update(block)
+    crc = zlib.crc32(block)
+    if method == zipfile.ZIP_STORED:
+        return crc, len(block), block, stat.st_mtime, stat.st_mode
+    engine = zlib.compressobj(-1 if level is None else level, zlib.DEFLATED, -15, zdict=dictionary)
+    data = engine.compress(block) + engine.flush(
+        zlib.Z_FINISH if start + length >= size else zlib.Z_SYNC_FLUSH)
+    return crc, len(block), data, stat.st_mtime, stat.st_mode
+
+
+def compress_batch(tasks, method, level):
+    """
+    compress_file() / compress_piece() for a batch of tasks; runs inside a worker process
+
+    A task is a path, a (path, start, length, size) piece, or None for a
+    file the writer compresses itself.
+    """
+    return [compress_file(task, method, level) if isinstance(task, str)
+            else None if task is None else compress_piece(*task, method, level)
+            for task in tasks]
+
+
+def split_files(files, method):
+    """
+    (task, archive_name, size, path) entries for compress_batch() and group_files()
+
+    Files up to BATCH_BYTES are one task; larger ones become BATCH_BYTES
+    pieces, or - for methods whose streams cannot be joined - task None.
+    """
+    for path, archive_name, size in files:
+        if size <= BATCH_BYTES:
+            yield path, archive_name, size, path
+        elif method in SPLIT_METHODS:
+            for start in range(0, size, BATCH_BYTES):
+                length = min(BATCH_BYTES, size - start)
+                yield (path, start, length, size), archive_name, length, path
+        else:
+            yield None, archive_name, size, path
+
+
+def group_files(files):
+    """Group (path, archive_name, size) entries into lists of up to BATCH_FILES / BATCH_BYTES"""
+    batch = []
+    batch_bytes = 0
+    for entry in files:
+        if batch and (len(batch) >= BATCH_FILES or batch_bytes + entry[2] > BATCH_BYTES):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(entry)
+        batch_bytes += entry[2]
+    if batch:
+        yield batch
+
+
+class ZipAssembler:
+    """Writes already-compressed members and the central directory to a file"""
+
+    def __init__(self, file):
+        self.file = file
+        self.offset = 0
+        self.members = []
+        self._piece = None  # [member, crc, file_size, compressed_size] of the member add_piece() is writing
+
+    def begin(self, name, method, crc, file_size, compressed_size, mtime, mode):
+        """Write the local header of a member; the caller writes its compressed_size bytes next"""
+        member = Member(name, method, mtime, mode, crc, compressed_size, file_size, self.offset,
+                        zip64=file_size >= ZIP64_LIMIT or compressed_size >= ZIP64_LIMIT)
+        header = member.local_header()
+        self.file.write(header)
+        self.offset += len(header) + compressed_size
+        self.members.append(member)
+        return member
+
+    def add(self, name, method, crc, file_size, data, mtime, mode):
+        """Local header + compressed data of one member"""
+        member = self.begin(name, method, crc, file_size, len(data), mtime, mode)
+        self.file.write(data)
+        return member
+
+    def open_member(self, name, method, file_size, mtime, mode):
+        """Local header of a member whose data is still to come; write it, then close_member()"""
+        # ZIP64 is decided up front: the header is patched later, not resized.
+        # The margin leaves room for incompressible data growing a little
+        member = Member(name, method, mtime, mode, 0, 0, file_size, self.offset,
+                        zip64=file_size + file_size // 64 + 65536 >= ZIP64_LIMIT)
+        header = member.local_header()
+        self.file.write(header)
+        self.offset += len(header)
+        self.members.append(member)
+        return member
+
+    def close_member(self, member, crc, file_size, compressed_size):
+        """Rewrite the local header of member with its final CRC-32 and sizes"""
+        if not member.zip64 and max(file_size, compressed_size) >= ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(f"{member.name!r} grew past 4 GB while being archived")
+        member.crc = crc
+        member.file_size = file_size
+        member.compressed_size = compressed_size
+        self.offset += compressed_size
+        end = self.file.tell()
+        header = member.local_header()
+        self.file.seek(end - compressed_size - len(header))
+        self.file.write(header)
+        self.file.seek(end)
+
+    def add_piece(self, name, method, start, length, size, result):
+        """
+        Append one compress_piece() result; returns the Member once its last piece is in, else None
+
+        The first piece (start 0) opens the member; pieces must come in order.
+        """
+        crc, piece_size, data, mtime, mode = result
+        if start == 0:
+            self._piece = [self.open_member(name, method, size, mtime, mode), 0, 0, 0]
+        self.file.write(data)
+        self._piece[1] = crc32_combine(self._piece[1], crc, piece_size)
+        self._piece[2] += piece_size
+        self._piece[3] += len(data)
+        if start + length < size:
+            return None
+        member = self._piece[0]
+        self.close_member(*self._piece)
+        self._piece = None
+        return member
+
+    def stream(self, name, path, method, level, digest=None):
+        """Compress path into a member block by block, here in this process; digest sees every block"""
+        stat = os.stat(path)
+        member = self.open_member(name, method, stat.st_size, stat.st_mtime, stat.st_mode)
+        engine = compressor(method, level)
+        crc = 0
+        size = 0
+        compressed = 0
+        with open(path, 'rb') as file:
+            while True:
+                block = file.read(BLOCK_SIZE)
+                if not block:
+                    break
+                if digest is not None:
+                    digest.update(block)
+                crc = zlib.crc32(block, crc)
+                size += len(block)
+                data = engine.compress(block) if engine is not None else block
+                self.file.write(data)
+                compressed += len(data)
+        if engine is not None:
+            data = engine.flush()
+            self.file.write(data)
+            compressed += len(data)
+        self.close_member(member, crc, size, compressed)
+        return member
+
+    def finish(self):
+        self.file.write(central_directory(self.members, self.offset))
+
+
+def map_batches(function, batches, arguments, workers):
+    """
+    Yield (batch, function(paths, *arguments)) for each batch, in batch order
+
+    workers=1 runs in this process; otherwise a process pool works on a
+    bounded window of batches while the results are taken back in order.
+    """
+    batches = iter(batches)
+    if workers == 1:
+        for batch in batches:
+            yield batch, function([entry[0] for entry in batch], *arguments)
+        return
+    window = workers * 2  # Batches in flight: keeps cores busy, bounds memory
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit(batch):
+            return batch, pool.submit(function, [entry[0] for entry in batch], *arguments)
+
+        pending = deque(submit(batch) for batch in islice(batches, window))
+        while pending:
+            batch, future = pending.popleft()
+            next_batch = next(batches, None)  # Refill before writing: workers stay busy
+            if next_batch is not None:
+                pending.append(submit(next_batch))
+            yield batch, future.result()
+
+
+def parallel_zip(files, zip_filename, workers=None, method=zipfile.ZIP_DEFLATED, compresslevel=6):
+    """
+    Write (path, archive_name, size) entries to zip_filename, compressing in a process pool
+
+    workers=None uses every CPU core; workers=1 compresses in this process
+    (same bytes, no pool). Returns the number of members written.
+    """
+    workers = workers or os.cpu_count() or 1
+    with open(zip_filename, 'wb', buffering=WRITE_BUFFER) as file:
+        assembler = ZipAssembler(file)
+        for batch, results in map_batches(compress_batch, group_files(split_files(files, method)),
+                                          (method, compresslevel), workers):
+            for (task, archive_name, _, path), result in zip(batch, results):
+                if task is None:
+                    assembler.stream(archive_name, path, method, compresslevel)
+                elif isinstance(task, str):
+                    assembler.add(archive_name, method, *result)
+                else:
+                    assembler.add_piece(archive_name, method, *task[1:], result)
+        assembler.finish()
+    return len(assembler.members)
+
+
+def parallel_directory_to_zip(directory_path, zip_filename, workers=None,
+                              method=zipfile.ZIP_DEFLATED, compresslevel=6):
+    """Archive every file below directory_path (names relative to it) with parallel_zip()"""
+    return parallel_zip(walk_files(directory_path), zip_filename, workers, method, compresslevel)
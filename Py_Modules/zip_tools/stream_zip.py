@@ -0,0 +1,178 @@
+"""
+Streaming ZIP Writer
+====================
+
+zipfile.ZipFile writes each member's local header BEFORE its data, then
+seeks back to fill in the CRC and sizes once the data is done. Pipes and
+sockets cannot seek, so create_basic_zip() and create_zip_with_progress()
+need a real file on disk, and sending an archive means writing it to disk
+first.
+
+StreamZipWriter never looks back:
+1. The local header goes out with flag bit 3 set and zero CRC/sizes
+2. The source is read in fixed-size blocks (64 KB), each block is
+   compressed and sent on; CRC-32 and sizes are counted along the way
+3. A data descriptor with the real CRC/sizes follows the data
+4. The central directory (which repeats them) comes last
+
+Memory stays constant - one block plus a small send buffer - whatever the
+archive size. Readers (zipfile, unzip, 7-Zip) take the CRC/sizes from the
+central directory.
+
+ZIP64
+=====
+A member needs 8-byte sizes in its descriptor when it reaches 4 GB, and
+that has to be announced in the local header, before the data. Files and
+writestr() data have a known size, so this is decided from it. Iterables
+and file objects of unknown length get ZIP64 descriptors by default (20
+bytes more per member); pass zip64=False for streams known to stay below
+4 GB. Offsets and member counts past the 32-bit limits are handled in the
+central directory as usual.
+
+Memory Trick
+============
+zipfile     = write header, write data, seek back, fix header
+stream zip  = write header, write data, write the fix after it
+"""
+
+import os
+import time
+import zipfile
+import zlib
+
+from ._format import FLAG_DATA_DESCRIPTOR, ZIP64_LIMIT, Member, central_directory, compressor
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _needs_zip64(size):
+    # Deflate can grow incompressible data slightly: leave a margin
+    return size * 1.05 >= ZIP64_LIMIT
+
+
+def _write_all(write):
+    """send(data) for write() methods that may take only part of it (raw pipes)"""
+    def send(data):
+        view = memoryview(data)
+        while view:
+            written = write(view)
+            if written is None:  # Buffered writers take everything
+                return
+            view = view[written:]
+    return send
+
+
+class StreamZipWriter:
+    """
+    Write a ZIP archive to a pipe, socket or any object with write()/sendall()
+
+    with StreamZipWriter(sock) as archive:
+        archive.write('report.pdf')
+        archive.writestr('notes.txt', 'Hello')
+    """
+
+    def __init__(self, sink, method=zipfile.ZIP_DEFLATED, compresslevel=6, block_size=BLOCK_SIZE):
+        if hasattr(sink, 'sendall'):
+            self._send = sink.sendall
+        elif hasattr(sink, 'write'):
+            self._send = _write_all(sink.write)
+        elif callable(sink):
+            self._send = sink
+        else:
+            raise TypeError("sink needs a sendall() or write() method, or must be callable")
+        self.method = method
+        self.compresslevel = compresslevel
+        self.block_size = block_size
+        self.offset = 0
+        self.members = []
+        self._buffer = bytearray()
+        self._closed = False
+
+    def _output(self, data):
+        # Small pieces (headers, descriptors) are gathered into one send
+        self._buffer += data
+        self.offset += len(data)
+        if len(self._buffer) >= self.block_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            self._send(data)
+
+    def write_stream(self, archive_name, blocks, mtime=None, mode=0o100644, zip64=None):
+        """
+        Add a member from an iterable of bytes blocks (or a binary file object)
+
+        zip64=None writes ZIP64 descriptors, as the length is not known up
+        front; zip64=False saves those bytes but fails past 4 GB.
+        """
+        if self._closed:
+            raise ValueError("Archive already closed")
+        if hasattr(blocks, 'read'):
+            source = blocks
+            blocks = iter(lambda: source.read(self.block_size), b'')
+        member = Member(archive_name, self.method, time.time() if mtime is None else mtime, mode,
+                        offset=self.offset, zip64=zip64 is not False, flags=FLAG_DATA_DESCRIPTOR)
+        self._output(member.local_header())
+
+        engine = compressor(self.method, self.compresslevel)
+        crc = 0
+        file_size = 0
+        compressed_size = 0
+        for block in blocks:
+            crc = zlib.crc32(block, crc)
+            file_size += len(block)
+            if engine is not None:
+                block = engine.compress(block)
+            compressed_size += len(block)
+            self._output(block)
+        if engine is not None:
+            tail = engine.flush()
+            compressed_size += len(tail)
+            self._output(tail)
+
+        if not member.zip64 and max(file_size, compressed_size) >= ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(f"{archive_name!r} passed 4 GB with zip64=False")
+        member.crc = crc
+        member.file_size = file_size
+        member.compressed_size = compressed_size
+        self._output(member.data_descriptor())
+        self.members.append(member)
+        return member
+
+    def write(self, path, archive_name=None):
+        """Add a file, read in blocks; archive_name defaults to its base name"""
+        stat = os.stat(path)
+        with open(path, 'rb') as file:
+            return self.write_stream(archive_name or os.path.basename(path), file,
+                                     stat.st_mtime, stat.st_mode, _needs_zip64(stat.st_size))
+
+    def writestr(self, archive_name, data, mtime=None):
+        """Add a member from a str (UTF-8) or bytes"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return self.write_stream(archive_name, [data], mtime, zip64=_needs_zip64(len(data)))
+
+    def close(self):
+        """Send the central directory; the sink itself is left open"""
+        if not self._closed:
+            self._closed = True
+            self._output(central_directory(self.members, self.offset))
+            self._flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+
+
+def stream_zip(files, sink, method=zipfile.ZIP_DEFLATED, compresslevel=6):
+    """Write (path, archive_name) pairs as one ZIP to sink; returns the bytes sent"""
+    with StreamZipWriter(sink, method, compresslevel) as archive:
+        for path, archive_name in files:
+            archive.write(path, archive_name)
+    return archive.offset
@@ -1,5 +1,6 @@
-import json
+from question_bank import QuestionBank  # Next to this file
 FILEPATH = "QUESTIONS/Basic_Quiz_Program/question_for_quiz.json"
+QUESTIONS_PER_QUIZ = 10
 
 def user_input_checker():
     track = False
@@ -16,9 +17,13 @@ def user_input_checker():
                 track = False
 
 score = 0
-with open(FILEPATH, 'r', encoding='utf-8') as file:
-    question_file = json.load(file)
-    for i, questions in enumerate(question_file, 1):  # Type of questions is dict
+total = 0
+with QuestionBank(FILEPATH) as bank:
+    # The bank is indexed in question_for_quiz.db (built on first use): each
+    # random question is one lookup, so the quiz starts instantly however
+    # many questions the JSON file holds
+    for i, questions in enumerate(bank.sample(QUESTIONS_PER_QUIZ), 1):  # Type of questions is dict
+        total += 1
         print(f"\nQuestion {i} -> {questions['question']}") # Type of each question key is string
         for i, options in enumerate(questions['options'], 1):
             print(f"Option {i} -> {options}")
@@ -30,5 +35,5 @@ with open(FILEPATH, 'r', encoding='utf-8') as file:
         else:
              print("Your answer was incorrect.\n")
 
-print(f"{score} out of {len(question_file)} questions are correct.")
+print(f"{score} out of {total} questions are correct.")
         
\ No newline at end of file
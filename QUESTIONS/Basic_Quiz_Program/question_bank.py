@@ -0,0 +1,219 @@
+"""
+Question Bank Store (SQLite)
+============================
+
+basic_quiz.py used to walk question_for_quiz.json from the first question
+to the last. With a bank of millions of questions, a random quiz that way
+means reading (or at least scanning) the whole file every session.
+
+QuestionBank converts the JSON file ONCE into an indexed SQLite file next
+to it (question_for_quiz.db) and then answers from the indexes:
+- get(id)                       : one primary-key lookup (id = position in the JSON list, from 1)
+- sample(k, topic, difficulty)  : k random questions, one index lookup each
+
+Every question also gets a `position` inside its (topic, difficulty)
+group, numbered 0, 1, 2, ... without gaps. Picking a random question of a
+group is then: random number below the group's size -> one lookup on
+(topic, difficulty, position). No scan, no ORDER BY RANDOM(), so a session
+costs the same with 30 questions or 30 million.
+
+Questions without "topic"/"difficulty" keys land in the group ('', '').
+The .db file is rebuilt automatically when the JSON file's size or
+modification time changes.
+
+Memory Trick
+============
+JSON list  = read from the start to reach question N
+SQLite     = jump straight to question N (and to the N-th "easy Python" question)
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+from bisect import bisect_right
+from itertools import islice
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Py_Modules'))
+from json_tools import iter_items  # Local package in Py_Modules/
+
+BATCH_ROWS = 10_000
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    topic NOT NULL,
+    difficulty NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE question_groups (
+    topic NOT NULL,
+    difficulty NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (topic, difficulty)
+);
+"""
+
+
+def _source_identity(json_path):
+    stat = os.stat(json_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _group_value(value):
+    return '' if value is None else value
+
+
+def build_bank(json_path, db_path):
+    """Convert a JSON list of questions into an indexed SQLite file; returns the question count"""
+    temporary = db_path + '.tmp'
+    if os.path.exists(temporary):
+        os.remove(temporary)
+    identity = _source_identity(json_path)
+    connection = sqlite3.connect(temporary)
+    try:
+        # A half-written file is thrown away anyway: no journal, no fsyncs
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(_SCHEMA)
+        sizes = {}  # (topic, difficulty) -> questions so far
+
+        def rows(questions):
+            for question_id, question in enumerate(questions, 1):
+                group = (_group_value(question.get('topic')), _group_value(question.get('difficulty')))
+                position = sizes.get(group, 0)
+                sizes[group] = position + 1
+                yield (question_id, group[0], group[1], position,
+                       json.dumps(question, ensure_ascii=False, separators=(',', ':')))
+
+        with open(json_path, 'rb') as file:
+            pending = rows(iter_items(file))  # Streamed: the bank is never fully in memory
+            while True:
+                batch = list(islice(pending, BATCH_ROWS))
+                if not batch:
+                    break
+                connection.executemany("INSERT INTO questions VALUES (?, ?, ?, ?, ?)", batch)
+
+        # Index built after the inserts: one sort instead of millions of updates
+        connection.execute("CREATE UNIQUE INDEX by_group ON questions (topic, difficulty, position)")
+        connection.executemany("INSERT INTO question_groups VALUES (?, ?, ?)",
+                               [(topic, difficulty, size) for (topic, difficulty), size in sizes.items()])
+        connection.execute("INSERT INTO meta VALUES ('source', ?)", (identity,))
+        connection.commit()
+        count = sum(sizes.values())
+    finally:
+        connection.close()
+    os.replace(temporary, db_path)  # Readers see the old file or the complete new one
+    return count
+
+
+class QuestionBank:
+    """
+    Indexed, read-only view of a JSON question bank
+
+    with QuestionBank('question_for_quiz.json') as bank:
+        for question in bank.sample(10, topic='git'):
+            print(question['question'])
+    """
+
+    def __init__(self, json_path, db_path=None):
+        self.json_path = json_path
+        self.db_path = db_path or os.path.splitext(json_path)[0] + '.db'
+        if not self._is_current():
+            build_bank(json_path, self.db_path)
+        self._connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        self._groups = self._connection.execute(
+            "SELECT topic, difficulty, size FROM question_groups").fetchall()
+        self._size = sum(size for _, _, size in self._groups)
+
+    def _is_current(self):
+        if not os.path.exists(self.db_path):
+            return False
+        connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        except sqlite3.DatabaseError:
+            return False  # Not a bank file (or a damaged one): rebuild it
+        finally:
+            connection.close()
+        return row is not None and row[0] == _source_identity(self.json_path)
+
+    def __len__(self):
+        return self._size
+
+    def topics(self):
+        """{topic: question count}"""
+        counts = {}
+        for topic, _, size in self._groups:
+            counts[topic] = counts.get(topic, 0) + size
+        return counts
+
+    def difficulties(self):
+        """{difficulty: question count}"""
+        counts = {}
+        for _, difficulty, size in self._groups:
+            counts[difficulty] = counts.get(difficulty, 0) + size
+        return counts
+
+    @staticmethod
+    def _question(row):
+        question = json.loads(row[1])
+        question['id'] = row[0]
+        return question
+
+    def get(self, question_id):
+        """Question dict (with its 'id') by id; KeyError if there is none"""
+        row = self._connection.execute(
+            "SELECT id, data FROM questions WHERE id = ?", (question_id,)).fetchone()
+        if row is None:
+            raise KeyError(question_id)
+        return self._question(row)
+
+    def count(self, topic=None, difficulty=None):
+        """Number of questions matching the filter (None = any)"""
+        return sum(size for group_topic, group_difficulty, size in self._groups
+                   if (topic is None or group_topic == topic)
+                   and (difficulty is None or group_difficulty == difficulty))
+
+    def sample(self, k, topic=None, difficulty=None):
+        """
+        k random questions (fewer if the filter matches fewer), no repeats
+
+        topic/difficulty = None means any. Costs one index lookup per
+        question, whatever the size of the bank.
+        """
+        if topic is None and difficulty is None:
+            # ids are 1..len(bank) without gaps
+            ids = random.sample(range(1, self._size + 1), min(k, self._size))
+            return [self.get(question_id) for question_id in ids]
+
+        groups = [(group_topic, group_difficulty, size)
+                  for group_topic, group_difficulty, size in self._groups
+                  if (topic is None or group_topic == topic)
+                  and (difficulty is None or group_difficulty == difficulty)]
+        starts = []  # First combined position of each group
+        total = 0
+        for _, _, size in groups:
+            starts.append(total)
+            total += size
+
+        questions = []
+        for chosen in random.sample(range(total), min(k, total)):
+            index = bisect_right(starts, chosen) - 1
+            group_topic, group_difficulty, _ = groups[index]
+            row = self._connection.execute(
+                "SELECT id, data FROM questions WHERE topic = ? AND difficulty = ? AND position = ?",
+                (group_topic, group_difficulty, chosen - starts[index])).fetchone()
+            questions.append(self._question(row))
+        return questions
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()